@@ -0,0 +1,194 @@
+"""
+Benchmark loading, rendering and directory builds on synthetic packages.
+
+Usage:
+    python benchmarks/bench.py --size medium --output results.json
+    python benchmarks/bench.py --size medium --compare results.json
+
+Each benchmark runs in a fresh interpreter, so that its peak memory and import costs are its own.
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic import SIZES, Size, generate_package, write_configs  # noqa: E402
+
+from haystack_pydoc_tools import cli  # noqa: E402
+from haystack_pydoc_tools.loaders import load_modules  # noqa: E402
+from haystack_pydoc_tools.renderers import render_docusaurus  # noqa: E402
+
+# A benchmark receives the work directory, the module names and the CLI arguments, and returns the time measured
+Benchmark = Callable[[Path, list[str], argparse.Namespace], float]
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(fn: Benchmark) -> Benchmark:
+    """Register a benchmark under its function name."""
+    BENCHMARKS[fn.__name__] = fn
+    return fn
+
+
+@functools.cache
+def _load(search_path: str, module_names: tuple[str, ...]) -> list:
+    return load_modules(search_path, list(module_names))
+
+
+@benchmark
+def load(workdir: Path, module_names: list[str], args: argparse.Namespace) -> float:  # noqa: ARG001
+    """`load_modules` on every module, in the current process."""
+    start = time.perf_counter()
+    load_modules(str(workdir / "src"), module_names)
+    return time.perf_counter() - start
+
+
+@benchmark
+def render(workdir: Path, module_names: list[str], args: argparse.Namespace) -> float:
+    """`render_docusaurus` of every module to a single file. Modules are loaded once, outside the timing."""
+    modules = _load(str(workdir / "src"), tuple(module_names))
+    start = time.perf_counter()
+    render_docusaurus(
+        modules,
+        title="API",
+        doc_id="api",
+        description="Synthetic API.",
+        filename=str(workdir / "out" / "render.md"),
+        signature_formatter=args.signature_formatter,
+    )
+    return time.perf_counter() - start
+
+
+@benchmark
+def directory(workdir: Path, module_names: list[str], args: argparse.Namespace) -> float:  # noqa: ARG001
+    """Directory-mode `cli.main` on every config, with `--jobs`."""
+    argv = ["haystack-pydoc", str(workdir / "configs"), str(workdir / "out")]
+    if args.jobs is not None:
+        argv += ["--jobs", str(args.jobs)]
+    sys.argv = argv
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli.main()
+    return time.perf_counter() - start
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) / scale
+
+
+def run_worker(args: argparse.Namespace) -> None:
+    """Run one benchmark `args.repeat` times and print its best time and peak memory as JSON."""
+    workdir = Path(args.workdir)
+    module_names = json.loads((workdir / "modules.json").read_text())
+    size = SIZES[args.size]
+    best = min(BENCHMARKS[args.worker](workdir, module_names, args) for _ in range(args.repeat))
+    result = {
+        "seconds": best,
+        "modules_per_second": size.modules / best,
+        "classes_per_second": size.classes / best,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    print(json.dumps(result))
+
+
+def _prepare(workdir: Path, size: Size) -> None:
+    module_names = generate_package(workdir / "src", size)
+    write_configs(workdir / "configs", workdir / "src", module_names, size)
+    (workdir / "out").mkdir()
+    (workdir / "modules.json").write_text(json.dumps(module_names))
+
+
+def _run(name: str, workdir: Path, args: argparse.Namespace) -> dict:
+    cmd = [sys.executable, __file__, "--worker", name, "--workdir", str(workdir), "--size", args.size]
+    cmd += ["--repeat", str(args.repeat), "--signature-formatter", args.signature_formatter]
+    if args.jobs is not None:
+        cmd += ["--jobs", str(args.jobs)]
+    output = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _compare(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for metric in ("seconds", "peak_rss_mb"):
+            before, after = baseline[name][metric], result[metric]
+            if after > before * (1 + max_regression):
+                regressions.append(f"{name}: {metric} went from {before:.2f} to {after:.2f}")
+    return regressions
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=SIZES, default="small", help="shape of the synthetic package")
+    parser.add_argument("--benchmark", choices=BENCHMARKS, action="append", help="benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, the best time is kept")
+    parser.add_argument("--jobs", type=int, help="--jobs passed to the directory-mode CLI")
+    parser.add_argument("--signature-formatter", choices=["black", "fast"], default="black")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file from a previous --output")
+    parser.add_argument(
+        "--max-regression", type=float, default=0.2, help="fail when a metric is this much worse than the baseline"
+    )
+    parser.add_argument("--worker", choices=BENCHMARKS, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Generate the synthetic package, run the benchmarks and report the results."""
+    args = _parse_args()
+    if args.worker:
+        run_worker(args)
+        return
+
+    size = SIZES[args.size]
+    print(
+        f"{args.size}: {size.modules} modules, {size.classes} classes, "
+        f"{size.classes_per_module * size.methods_per_class * size.modules} methods"
+    )
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        _prepare(workdir, size)
+        for name in args.benchmark or BENCHMARKS:
+            results[name] = _run(name, workdir, args)
+            result = results[name]
+            print(
+                f"  {name:<10} {result['seconds']:8.2f} s {result['modules_per_second']:8.1f} modules/s "
+                f"{result['classes_per_second']:8.1f} classes/s {result['peak_rss_mb']:8.1f} MB peak"
+            )
+
+    report = {"size": args.size, "signature_formatter": args.signature_formatter, "results": results}
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if baseline.get("size") != args.size:
+            sys.exit(f"Baseline was recorded with --size {baseline.get('size')}")
+        regressions = _compare(results, baseline["results"], args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Compare the dataclass `__init__` synthesis of `DataclassesVisitorExtension` with griffe's walk of the whole module.
+
+Usage:
+    python benchmarks/dataclass_init.py --classes 500
+
+Modules are visited with griffe's DataclassesExtension walking every member of the module (the former
+implementation), and with the extension of `load_modules`, which only handles the classes collected during the
+visit. The time spent in the hooks of each extension is reported, next to the time of the whole visit.
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import griffe  # noqa: E402
+from synthetic import Size, module_source  # noqa: E402
+
+from haystack_pydoc_tools.cache import dump_module  # noqa: E402
+from haystack_pydoc_tools.loaders import DataclassesVisitorExtension  # noqa: E402
+
+# Classes without __init__, which griffe's walk inspects one by one: their bases and annotated attributes
+ERRORS_TEMPLATE = '''
+
+class Error{index}(ValueError):
+    """Error number {index}."""
+
+    code: int = {index}
+    message: str = "error {index}"
+    retryable: bool = False
+'''
+
+
+class FullWalk(griffe.Extension):
+    """The former implementation: griffe's DataclassesExtension on every visited module."""
+
+    def on_module_members(self, *, mod: griffe.Module, **kwargs: Any) -> None:  # noqa: ARG002, D102
+        griffe.DataclassesExtension().on_package(pkg=mod)
+
+
+def shapes(classes: int) -> dict[str, str]:
+    """Return the source of each benchmarked module shape."""
+    components = module_source(
+        0, Size(modules=1, classes_per_module=classes, methods_per_class=2, modules_per_config=1)
+    )
+    # The dataclass of the component module, followed by classes without __init__
+    errors = components.split("\n\nclass Component", 1)[0] + "".join(
+        ERRORS_TEMPLATE.format(index=index) for index in range(classes)
+    )
+    no_dataclass = "".join(ERRORS_TEMPLATE.format(index=index) for index in range(classes))
+    return {"components": components, "errors": errors, "no dataclass": no_dataclass}
+
+
+class Timed(griffe.Extension):
+    """Run the hooks of an extension, adding up the time spent in them."""
+
+    def __init__(self, extension: griffe.Extension) -> None:
+        self.extension = extension
+        self.seconds = 0.0
+
+    def _run(self, hook: str, **kwargs: Any) -> None:
+        start = time.perf_counter()
+        getattr(self.extension, hook)(**kwargs)
+        self.seconds += time.perf_counter() - start
+
+    def on_class_instance(self, **kwargs: Any) -> None:  # noqa: D102
+        self._run("on_class_instance", **kwargs)
+
+    def on_module_members(self, **kwargs: Any) -> None:  # noqa: D102
+        self._run("on_module_members", **kwargs)
+
+
+def visit(code: str, extension: griffe.Extension) -> griffe.Module:
+    """Visit a module with an extension, as `load_modules` does."""
+    return griffe.visit("bench", filepath=Path("bench.py"), code=code, extensions=griffe.Extensions(extension))
+
+
+def _best(code: str, extension: Callable[[], griffe.Extension], repeat: int) -> tuple[float, float]:
+    best_visit = best_hooks = float("inf")
+    for _ in range(repeat):
+        timed = Timed(extension())
+        start = time.perf_counter()
+        visit(code, timed)
+        best_visit = min(best_visit, time.perf_counter() - start)
+        best_hooks = min(best_hooks, timed.seconds)
+    return best_visit, best_hooks
+
+
+def main() -> None:
+    """Visit every module shape with each implementation and print the time spent in the extension."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, default=500, help="classes per module")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per variant, the best time is kept")
+    args = parser.parse_args()
+
+    for name, code in shapes(args.classes).items():
+        if dump_module(visit(code, FullWalk())) != dump_module(visit(code, DataclassesVisitorExtension())):
+            sys.exit(f"{name}: DataclassesVisitorExtension does not produce the same module as the full walk")
+        print(f"{name} ({args.classes} classes)")
+        for label, extension in (("full walk", FullWalk), ("candidates", DataclassesVisitorExtension)):
+            visit_seconds, hook_seconds = _best(code, extension, args.repeat)
+            print(f"  {label:<11} {hook_seconds * 1000:8.2f} ms in hooks, {visit_seconds * 1000:8.1f} ms per visit")
+
+
+if __name__ == "__main__":
+    main()
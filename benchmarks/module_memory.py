@@ -0,0 +1,83 @@
+"""
+Compare the memory held by loaded griffe modules with their compact copy.
+
+Usage:
+    python benchmarks/module_memory.py --modules 20 --classes 50
+
+Synthetic modules are loaded with `load_modules`, then kept either as griffe modules or converted with `compact`,
+as `parse_module` does. The memory allocated by the kept modules is measured with tracemalloc, next to the size of
+their pickles, which is what worker processes send back.
+"""
+
+import argparse
+import gc
+import pickle
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic import Size, module_source  # noqa: E402
+
+from haystack_pydoc_tools.loaders import load_modules  # noqa: E402
+from haystack_pydoc_tools.model import compact  # noqa: E402
+from haystack_pydoc_tools.renderers import GRIFFE2MD_DEFAULT_CONFIG, render_module  # noqa: E402
+
+
+def _allocated(create: Callable[[], Any]) -> tuple[Any, int]:
+    gc.collect()
+    tracemalloc.start()
+    kept = create()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return kept, current
+
+
+def main() -> None:
+    """Load the synthetic modules, keep them in each representation and print the memory they hold."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", type=int, default=20, help="number of modules")
+    parser.add_argument("--classes", type=int, default=50, help="classes per module")
+    args = parser.parse_args()
+
+    size = Size(modules=args.modules, classes_per_module=args.classes, methods_per_class=6, modules_per_config=1)
+    with tempfile.TemporaryDirectory() as root:
+        names = []
+        for index in range(args.modules):
+            Path(root, f"module_{index}.py").write_text(module_source(index, size))
+            names.append(f"module_{index}")
+
+        # Warm up imports and griffe's own caches, so that they are not counted
+        load_modules(root, names[:1])
+        griffe_modules, griffe_bytes = _allocated(lambda: load_modules(root, names))
+        compact_modules, compact_bytes = _allocated(lambda: [compact(module) for module in load_modules(root, names)])
+
+    for griffe_module, compact_module in zip(griffe_modules, compact_modules):
+        if render_module(griffe_module, GRIFFE2MD_DEFAULT_CONFIG) != render_module(
+            compact_module, GRIFFE2MD_DEFAULT_CONFIG
+        ):
+            sys.exit(f"{griffe_module.name}: the compact module does not render the same Markdown")
+
+    start = time.perf_counter()
+    for module in compact_modules:
+        module.to_griffe()
+    thaw_seconds = time.perf_counter() - start
+
+    print(f"{args.modules} modules of {args.classes} classes")
+    for label, modules, allocated in (
+        ("griffe", griffe_modules, griffe_bytes),
+        ("compact", compact_modules, compact_bytes),
+    ):
+        pickled = sum(len(pickle.dumps(module)) for module in modules)
+        print(f"  {label:<8} {allocated / 2**20:8.2f} MiB in memory, {pickled / 2**20:8.2f} MiB pickled")
+    print(f"  rebuilding the griffe modules: {thaw_seconds * 1000 / args.modules:.1f} ms per module")
+
+
+if __name__ == "__main__":
+    main()
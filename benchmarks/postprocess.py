@@ -0,0 +1,86 @@
+"""
+Compare the post-processing pipeline with the former two-pass implementation on multi-megabyte outputs.
+
+Usage:
+    python benchmarks/postprocess.py --megabytes 8
+
+The Markdown of a synthetic module is rendered once, then repeated to reach the requested size. The pipeline
+processes it module by module, as `render_docusaurus` does; the other variants process the whole document.
+"""
+
+import argparse
+import re
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic import SIZES, module_source  # noqa: E402
+
+from haystack_pydoc_tools.loaders import load_modules  # noqa: E402
+from haystack_pydoc_tools.postprocessing import Pipeline  # noqa: E402
+from haystack_pydoc_tools.renderers import GRIFFE2MD_DEFAULT_CONFIG, render_module  # noqa: E402
+
+# The implementation replaced by the pipeline: two regex passes over the whole document
+ANCHOR_LINK_RE = re.compile(r"\[([^\]]+)\]\(#[^)]+\)")
+HEADING_BACKTICKS_RE = re.compile(r"^(#{1,6}) `(.+?)`$", re.MULTILINE)
+
+# All rules fused into a single scan, dispatching each match to its rule
+FUSED_RE = re.compile(r"(?P<heading>^(#{1,6}) `(.+?)`$)|(?P<anchor>\[([^\]]+)\]\(#[^)]+\))", re.MULTILINE)
+
+
+def two_pass(chunks: list[str]) -> str:
+    """Join the document, then run each regex over it."""
+    output = "\n".join(chunks)
+    output = HEADING_BACKTICKS_RE.sub(r"\1 \2", output)
+    return ANCHOR_LINK_RE.sub(r"\1", output)
+
+
+def fused(chunks: list[str]) -> str:
+    """Join the document, then run one regex matching every rule over it."""
+    return FUSED_RE.sub(lambda m: m[5] if m.lastgroup == "anchor" else f"{m[2]} {m[3]}", "\n".join(chunks))
+
+
+def pipeline(chunks: list[str]) -> str:
+    """Run the pipeline on each module's Markdown, as `render_docusaurus` does."""
+    postprocess = Pipeline()
+    return "\n".join(postprocess(chunk) for chunk in chunks)
+
+
+def _best(fn: Callable[[list[str]], str], chunks: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(chunks)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Render the synthetic Markdown and time every variant."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--megabytes", type=float, default=8, help="size of the post-processed document")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per variant, the best time is kept")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "module.py").write_text(module_source(0, SIZES["medium"]))
+        module = load_modules(tmp, ["module"])[0]
+    markdown = render_module(module, GRIFFE2MD_DEFAULT_CONFIG, signature_formatter="fast")
+    chunks = [markdown] * max(1, int(args.megabytes * 1_000_000 / len(markdown)))
+
+    expected = two_pass(chunks)
+    size = len(expected) / 1_000_000
+    print(f"{size:.1f} MB in {len(chunks)} modules")
+    for fn in (two_pass, fused, pipeline):
+        if fn(chunks) != expected:
+            sys.exit(f"{fn.__name__} does not produce the same output as two_pass")
+        seconds = _best(fn, chunks, args.repeat)
+        print(f"  {fn.__name__:<10} {seconds:6.3f} s {size / seconds:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Generate synthetic packages with Sphinx docstrings, shaped like Haystack components, for benchmarks."""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+PACKAGE = "synthpkg"
+
+MODULE_TEMPLATE = '''"""
+Module {module} of the synthetic benchmark package.
+
+It contains {classes} classes and a dataclass.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, Union
+
+
+@dataclass
+class Record{module}:
+    """
+    A record produced by the classes of this module.
+
+    :param content: The content of the record.
+    :param meta: Metadata attached to the record.
+    :param score: Relevance score, if any.
+    """
+
+    content: str
+    meta: dict[str, Any] = field(default_factory=dict)
+    score: Optional[float] = None
+'''
+
+CLASS_TEMPLATE = '''
+
+class Component{module}x{index}:
+    """
+    Component number {index} of module {module}.
+
+    Usage example:
+    ```python
+    component = Component{module}x{index}(model="model-{index}")
+    result = component.run(query="What is the answer?")
+    ```
+    """
+
+    def __init__(
+        self,
+        model: str = "model-{index}",
+        api_base_url: Optional[str] = None,
+        timeout: float = 30.0,
+        generation_kwargs: Optional[dict[str, Any]] = None,
+        streaming_callback: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """
+        Create the component.
+
+        :param model: Name of the model to use.
+        :param api_base_url: Base URL of the API.
+        :param timeout: Timeout of each request, in seconds.
+        :param generation_kwargs: Additional keyword arguments passed to the model.
+        :param streaming_callback: Callback invoked with every streamed token.
+        """
+        self.model = model
+        self.api_base_url = api_base_url
+        self.timeout = timeout
+        self.generation_kwargs = generation_kwargs or {{}}
+        self.streaming_callback = streaming_callback
+'''
+
+METHOD_TEMPLATE = '''
+    def method_{index}(
+        self, query: str, records: list[Record{module}], top_k: int = 10, filters: Union[dict[str, Any], None] = None
+    ) -> dict[str, list[Record{module}]]:
+        """
+        Run step {index} of the component.
+
+        :param query: The query to answer.
+        :param records: The records to consider.
+        :param top_k: Maximum number of records to return.
+        :param filters: Filters applied to the records.
+        :returns: A dictionary with the following key:
+            - `records`: The selected records.
+        :raises ValueError: If `top_k` is not positive.
+        """
+        if top_k <= 0:
+            raise ValueError("top_k must be positive")
+        return {{"records": records[:top_k]}}
+'''
+
+
+@dataclass
+class Size:
+    """Shape of a synthetic package."""
+
+    modules: int
+    classes_per_module: int
+    methods_per_class: int
+    modules_per_config: int
+
+    @property
+    def classes(self) -> int:
+        """Total number of classes, dataclasses included."""
+        return self.modules * (self.classes_per_module + 1)
+
+
+SIZES = {
+    "small": Size(modules=10, classes_per_module=10, methods_per_class=4, modules_per_config=5),
+    "medium": Size(modules=40, classes_per_module=25, methods_per_class=6, modules_per_config=8),
+    "large": Size(modules=120, classes_per_module=30, methods_per_class=8, modules_per_config=10),
+}
+
+
+def module_source(module: int, size: Size) -> str:
+    """Return the source code of a synthetic module."""
+    parts = [MODULE_TEMPLATE.format(module=module, classes=size.classes_per_module)]
+    for index in range(size.classes_per_module):
+        parts.append(CLASS_TEMPLATE.format(module=module, index=index))
+        parts.extend(METHOD_TEMPLATE.format(module=module, index=method) for method in range(size.methods_per_class))
+    return "".join(parts)
+
+
+def generate_package(root: Path, size: Size) -> list[str]:
+    """
+    Write a synthetic package under `root`.
+
+    :param root: Source root, created if missing.
+    :param size: Shape of the package.
+    :returns: The module names, relative to `root`.
+    """
+    package = root / PACKAGE
+    package.mkdir(parents=True, exist_ok=True)
+    (package / "__init__.py").write_text('"""Synthetic benchmark package."""\n')
+    names = []
+    for module in range(size.modules):
+        (package / f"module_{module}.py").write_text(module_source(module, size))
+        names.append(f"{PACKAGE}.module_{module}")
+    return names
+
+
+def write_configs(config_dir: Path, root: Path, module_names: list[str], size: Size) -> list[Path]:
+    """
+    Write YAML configs covering the modules of a synthetic package, `size.modules_per_config` modules each.
+
+    :param config_dir: Directory of the configs, created if missing.
+    :param root: Source root of the package.
+    :param module_names: Module names, as returned by `generate_package`.
+    :param size: Shape of the package.
+    :returns: The config paths.
+    """
+    config_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    step = size.modules_per_config
+    for start in range(0, len(module_names), step):
+        name = f"api_{start // step}"
+        modules = "".join(f"\n      - {module}" for module in module_names[start : start + step])
+        path = config_dir / f"{name}.yml"
+        path.write_text(
+            f"loaders:\n  - search_path: [{root}]\n    modules:{modules}\n"
+            f"renderer:\n  title: {name}\n  id: {name}\n  description: Synthetic API.\n  filename: {name}.md\n"
+        )
+        paths.append(path)
+    return paths
@@ -0,0 +1,159 @@
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import BrokenExecutor, Executor
+from pathlib import Path
+
+from haystack_pydoc_tools.build import ConfigResult, build_directory
+from haystack_pydoc_tools.cache import ModuleCache
+from haystack_pydoc_tools.discovery import module_index
+from haystack_pydoc_tools.workers import create_executor
+
+ConfigPaths = str | Path | Iterable[str | Path]
+
+
+def _config_paths(configs: ConfigPaths) -> list[Path]:
+    targets = [configs] if isinstance(configs, str | Path) else list(configs)
+    paths = []
+    for target in map(Path, targets):
+        paths.extend(sorted(target.glob("*.yml")) if target.is_dir() else [target])
+    return paths
+
+
+class Builder:
+    """
+    Build configs repeatedly from a long-lived process, for services embedding the tool.
+
+    The worker pool is started on the first build and reused by the following ones, so the dependencies are
+    imported and the templates compiled once per worker. Each worker keeps the Markdown it rendered in memory,
+    and the builder keeps the parsed modules, so the next builds only parse and render the modules whose source
+    changed. Builds can run concurrently from several threads and share the pool.
+
+    Close the builder, or use it as a context manager, to stop the workers.
+    """
+
+    def __init__(
+        self,
+        *,
+        jobs: int | None = None,
+        cache: str | Path | None = None,
+        max_tasks_per_child: int | None = None,
+        max_modules: int = 4096,
+    ) -> None:
+        """
+        Create a builder. Worker processes are started by the first build.
+
+        :param jobs: Number of worker processes, one per CPU by default. 0 builds in the calling thread.
+        :param cache: Optional directory where parsed and rendered modules are persisted between processes.
+        :param max_tasks_per_child: Replace each worker process after this many tasks (Python 3.11+).
+        :param max_modules: Maximum number of parsed modules kept in memory between builds.
+        """
+        self.jobs = jobs
+        self.cache_dir = str(cache) if cache else None
+        self.max_tasks_per_child = max_tasks_per_child
+        self.module_cache = ModuleCache(max_modules)
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.jobs == 0:
+                    # Builds render in the calling threads: import black and compile the templates before the
+                    # first render, as worker processes do, rather than lazily from several threads at once
+                    from haystack_pydoc_tools.renderers import warm_up
+
+                    warm_up()
+                self._executor = create_executor(self.jobs, max_tasks_per_child=self.max_tasks_per_child)
+            return self._executor
+
+    def build(  # noqa: PLR0913
+        self,
+        configs: ConfigPaths,
+        output_dir: str | Path | None = None,
+        *,
+        incremental: bool = False,
+        memory_budget: int | None = None,
+        report: Callable[[ConfigResult], None] | None = None,
+        started: Callable[[str], None] | None = None,
+    ) -> list[ConfigResult]:
+        """
+        Build configs. Errors are reported in the results, never raised.
+
+        :param configs: A YAML config file, a directory of config files, or several of them.
+        :param output_dir: Optional directory where output files are written, created if missing.
+        :param incremental: Skip configs whose output was generated from the same inputs.
+        :param memory_budget: Maximum estimated memory of the tasks running at a time, in bytes.
+        :param report: Called with each config's result as soon as it is known.
+        :param started: Called with the path of each config when it starts.
+        :returns: The result of every config, in completion order.
+        """
+        if output_dir is not None:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+        # Picks up modules created since the previous build; unchanged directories are not listed again
+        module_index.cache_clear()
+        executor = self._get_executor()
+        results = build_directory(
+            _config_paths(configs),
+            str(output_dir) if output_dir is not None else None,
+            executor=executor,
+            jobs=self.jobs,
+            cache_dir=self.cache_dir,
+            incremental=incremental,
+            memory_budget=memory_budget,
+            report=report or (lambda _: None),
+            started=started,
+            module_cache=self.module_cache,
+        )
+        if any(isinstance(result.error, BrokenExecutor) for result in results):
+            # A worker process died: the next build starts new ones
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+        return results
+
+    def close(self) -> None:
+        """Stop the worker processes. The next build starts new ones."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def __enter__(self) -> "Builder":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+_builders: dict[tuple[int | None, str | None], Builder] = {}
+_builders_lock = threading.Lock()
+
+
+def build(
+    configs: ConfigPaths,
+    output_dir: str | Path | None = None,
+    *,
+    jobs: int | None = None,
+    cache: str | Path | None = None,
+    incremental: bool = False,
+) -> list[ConfigResult]:
+    """
+    Build configs in the current process, without spawning the CLI.
+
+    Calls with the same `jobs` and `cache` share a `Builder`, and so its worker pool and in-memory caches,
+    for the life of the process. Create a `Builder` to control when the workers stop.
+
+    :param configs: A YAML config file, a directory of config files, or several of them.
+    :param output_dir: Optional directory where output files are written, created if missing.
+    :param jobs: Number of worker processes, one per CPU by default. 0 builds in the calling thread.
+    :param cache: Optional directory where parsed and rendered modules are persisted between processes.
+    :param incremental: Skip configs whose output was generated from the same inputs.
+    :returns: The result of every config, in completion order: check `status` and `error`.
+    """
+    key = (jobs, str(cache) if cache else None)
+    with _builders_lock:
+        if key not in _builders:
+            _builders[key] = Builder(jobs=jobs, cache=cache)
+        builder = _builders[key]
+    return builder.build(configs, output_dir, incremental=incremental)
@@ -0,0 +1,410 @@
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from haystack_pydoc_tools import profiling
+from haystack_pydoc_tools.config import DocsConfig, load_config
+from haystack_pydoc_tools.config import module_keys as module_keys
+from haystack_pydoc_tools.discovery import ModuleKey as ModuleKey
+from haystack_pydoc_tools.discovery import module_filepath
+from haystack_pydoc_tools.manifest import build_manifest, is_up_to_date, write_manifest
+from haystack_pydoc_tools.memory import measured
+from haystack_pydoc_tools.scheduler import MODULE_OVERHEAD, Scheduler, estimate_cost, estimate_memory, source_size
+from haystack_pydoc_tools.utils import Stamp, file_stamp
+from haystack_pydoc_tools.workers import picklable_errors
+
+# griffe, griffe2md, black and jinja2 are imported by the tasks that need them, see `cli`
+if TYPE_CHECKING:
+    from griffe import Module
+
+    from haystack_pydoc_tools.cache import ModuleCache, RenderCache
+    from haystack_pydoc_tools.model import DocModule
+
+
+@dataclass
+class ConfigResult:
+    """Outcome of building a single config."""
+
+    config: str
+    status: str  # "ok", "skipped" or "failed"
+    error: BaseException | None = None
+    # Peak resident memory in bytes of the worker processes parsing and rendering the config, when measured
+    peak_rss: int | None = None
+    # Time from the start of the config's first task to its result
+    seconds: float | None = None
+    modules: int | None = None
+    source_bytes: int | None = None
+    output_bytes: int | None = None
+    # Modules whose Markdown was taken from the render cache
+    cache_hits: int | None = None
+
+    @property
+    def cache(self) -> str | None:
+        """
+        Summarize how much of the config was served from caches.
+
+        :returns: "hit" if the output was up to date or every module came from the render cache, "partial" if some
+            did, "miss" if none did, or None if unknown.
+        """
+        if self.status == "skipped":
+            return "hit"
+        if self.cache_hits is None or self.modules is None:
+            return None
+        if self.cache_hits == 0:
+            return "miss"
+        return "hit" if self.cache_hits >= self.modules else "partial"
+
+
+@picklable_errors
+@profiling.profiled
+def parse_module(
+    search_path: str, module_name: str, cache_dir: str | None = None, documented_only: bool = False
+) -> "DocModule":
+    """
+    Parse a single module. Runs in a worker process.
+
+    The module is returned in the compact documentation model, which is smaller to send back from the worker
+    and to keep in memory until every config using it is rendered.
+
+    :param search_path: Resolved source root.
+    :param module_name: Module name relative to search_path.
+    :param cache_dir: Optional parse cache directory.
+    :param documented_only: Prune undocumented members, when every config rendering the module hides them.
+    :returns: The parsed module.
+    """
+    from haystack_pydoc_tools.cache import ParseCache
+    from haystack_pydoc_tools.loaders import load_modules
+    from haystack_pydoc_tools.model import compact
+
+    cache = ParseCache(cache_dir) if cache_dir else None
+    return compact(load_modules(search_path, [module_name], cache=cache, documented_only=documented_only)[0])
+
+
+@lru_cache(maxsize=None)
+def render_cache(cache_dir: str | None = None) -> "RenderCache":
+    """
+    Return the render cache of the current process.
+
+    The same instance is returned on every call, so configs rendered by the same process share
+    their in-memory entries. Entries are also persisted under `<cache_dir>/render` when given.
+
+    :param cache_dir: Optional cache directory.
+    :returns: The process-wide render cache.
+    """
+    from haystack_pydoc_tools.cache import RenderCache
+
+    return RenderCache(Path(cache_dir) / "render" if cache_dir else None)
+
+
+@picklable_errors
+@profiling.profiled
+def render_config(
+    config: DocsConfig,
+    modules: list["Module | DocModule"],
+    manifest: dict[str, Any] | None = None,
+    cache_dir: str | None = None,
+) -> int:
+    """
+    Render parsed modules to the config's output file. Runs in a worker process.
+
+    :param config: The resolved config.
+    :param modules: Parsed modules, in rendering order.
+    :param manifest: Manifest of the config's inputs, recorded next to the output when given.
+    :param cache_dir: Optional cache directory, where rendered modules are persisted.
+    :returns: The number of modules whose Markdown was taken from the render cache.
+    """
+    from haystack_pydoc_tools.renderers import render_docusaurus
+
+    cache = render_cache(cache_dir)
+    hits = cache.hits
+    with profiling.labels(config=config.path):
+        render_docusaurus(modules, filename=config.filename, render_cache=cache, **config.renderer_settings())
+    if manifest:
+        write_manifest(config.filename, manifest)
+    return cache.hits - hits
+
+
+@picklable_errors
+@profiling.profiled
+def render_markdown(config: DocsConfig, modules: list["Module | DocModule"], cache_dir: str | None = None) -> str:
+    """
+    Render parsed modules to the config's Markdown, without writing the output file. Runs in a worker process.
+
+    :param config: The resolved config.
+    :param modules: Parsed modules, in rendering order.
+    :param cache_dir: Optional cache directory, where rendered modules are persisted.
+    :returns: The Markdown that `render_config` would write.
+    """
+    from haystack_pydoc_tools.renderers import iter_docusaurus
+
+    with profiling.labels(config=config.path):
+        return "".join(iter_docusaurus(modules, render_cache=render_cache(cache_dir), **config.renderer_settings()))
+
+
+@dataclass
+class _PlannedConfig:
+    config: DocsConfig
+    manifest: dict[str, Any] | None
+    keys: list[ModuleKey]
+    cost: int
+    source_bytes: int
+
+
+def _plan(
+    config_paths: list[Path], output_dir: str | None, *, incremental: bool, report: Callable[[ConfigResult], None]
+) -> list[_PlannedConfig]:
+    planned = []
+    for path in config_paths:
+        try:
+            config = load_config(str(path), output_dir)
+            manifest = build_manifest(config) if incremental else None
+            keys = module_keys(config)
+            if manifest and is_up_to_date(config.filename, manifest):
+                report(ConfigResult(str(path), "skipped", modules=len(keys)))
+                continue
+            item = _PlannedConfig(config, manifest, keys, estimate_cost(config), sum(source_size(*key) for key in keys))
+        except Exception as exc:  # noqa: BLE001
+            # Such as a config without search path, whose modules can't be found
+            report(ConfigResult(str(path), "failed", exc))
+            continue
+        planned.append(item)
+    return planned
+
+
+class _ParsedModules:
+    """Track parsed modules and release them once every config using them has taken them."""
+
+    def __init__(self, planned: list[_PlannedConfig]) -> None:
+        self.dependents: dict[ModuleKey, list[_PlannedConfig]] = {}
+        for item in planned:
+            for key in item.keys:
+                self.dependents.setdefault(key, []).append(item)
+        self.modules: dict[ModuleKey, DocModule] = {}
+        self.errors: dict[ModuleKey, BaseException] = {}
+        self.ready: set[int] = set()
+        self.taken: set[int] = set()
+
+    def add(self, key: ModuleKey, module: "DocModule | None", error: BaseException | None) -> list[_PlannedConfig]:
+        """Record a parse result and return the configs that now have all their modules available."""
+        if error is None:
+            self.modules[key] = module
+        else:
+            self.errors[key] = error
+        ready = []
+        for item in self.dependents[key]:
+            if id(item) not in self.ready and all(k in self.modules or k in self.errors for k in item.keys):
+                self.ready.add(id(item))
+                ready.append(item)
+        return ready
+
+    def take(self, item: _PlannedConfig) -> list["DocModule"]:
+        """
+        Return the modules of a ready config, dropping those no other config is waiting for.
+
+        :raises BaseException: The parse error of the first module that could not be parsed.
+        """
+        self.taken.add(id(item))
+        modules = [self.modules.get(k) for k in item.keys]
+        for key in item.keys:
+            if all(id(other) in self.taken for other in self.dependents[key]):
+                self.modules.pop(key, None)
+        for key in item.keys:
+            if key in self.errors:
+                raise self.errors[key]
+        return modules
+
+
+def _submit_render(
+    scheduler: Scheduler, item: _PlannedConfig, modules: list["DocModule"], cache_dir: str | None
+) -> None:
+    scheduler.submit(
+        item.cost,
+        ("render", item),
+        measured,
+        render_config,
+        item.config,
+        modules,
+        item.manifest,
+        cache_dir,
+        memory=estimate_memory(item.cost),
+    )
+
+
+def _submit_initial(
+    scheduler: Scheduler,
+    planned: list[_PlannedConfig],
+    parsed: _ParsedModules,
+    cache_dir: str | None,
+    module_cache: "ModuleCache | None",
+) -> dict[ModuleKey, Stamp]:
+    """
+    Queue a parse task for every module not found in the module cache, and render the configs already ready.
+
+    :returns: The stamp of each module taken before parsing it, when there is a module cache.
+    """
+    stamps: dict[ModuleKey, Stamp] = {}
+    cached = []
+    for key, dependents in parsed.dependents.items():
+        documented_only = not any(item.config.show_if_no_docstring for item in dependents)
+        if module_cache is not None:
+            from haystack_pydoc_tools.loaders import can_render
+
+            # Taken before parsing, so that a file saved again while parsing is parsed again by the next build
+            stamps[key] = file_stamp(module_filepath(Path(key[0]), key[1]))
+            module = module_cache.get(key, stamps[key])
+            if module is not None and can_render(module, documented_only=documented_only):
+                cached.append((key, module))
+                continue
+        scheduler.submit(
+            max(item.cost for item in dependents),
+            ("parse", key),
+            measured,
+            parse_module,
+            *key,
+            cache_dir,
+            documented_only,
+            memory=estimate_memory(source_size(*key) + MODULE_OVERHEAD),
+        )
+
+    # Configs without modules, or whose modules are all cached, have nothing to wait for
+    for item in planned:
+        if not item.keys:
+            _submit_render(scheduler, item, [], cache_dir)
+    for key, module in cached:
+        for item in parsed.add(key, module, None):
+            _submit_render(scheduler, item, parsed.take(item), cache_dir)
+    return stamps
+
+
+def _max_rss(values: list[int | None]) -> int | None:
+    measured_values = [value for value in values if value is not None]
+    return max(measured_values) if measured_values else None
+
+
+def _output_size(filename: str) -> int | None:
+    try:
+        return os.path.getsize(filename)
+    except OSError:
+        return None
+
+
+def _render_result(
+    item: _PlannedConfig, error: BaseException | None, cache_hits: int | None, peak_rss: int | None
+) -> ConfigResult:
+    return ConfigResult(
+        item.config.path,
+        "failed" if error else "ok",
+        error,
+        peak_rss=peak_rss,
+        modules=len(item.keys),
+        source_bytes=item.source_bytes,
+        output_bytes=None if error else _output_size(item.config.filename),
+        cache_hits=cache_hits,
+    )
+
+
+class _Progress:
+    """Record when each config starts, and complete its result with the time elapsed since then."""
+
+    def __init__(self, report: Callable[[ConfigResult], None], started: Callable[[str], None] | None) -> None:
+        self.results: list[ConfigResult] = []
+        self._report = report
+        self._started = started
+        self._start_times: dict[str, float] = {}
+
+    def start(self, config: str) -> None:
+        if config not in self._start_times:
+            self._start_times[config] = time.perf_counter()
+            if self._started:
+                self._started(config)
+
+    def report(self, result: ConfigResult) -> None:
+        self.start(result.config)
+        result.seconds = time.perf_counter() - self._start_times[result.config]
+        self.results.append(result)
+        self._report(result)
+
+
+def build_directory(  # noqa: PLR0913
+    config_paths: list[Path],
+    output_dir: str | None,
+    *,
+    executor: Executor,
+    jobs: int | None = None,
+    cache_dir: str | None = None,
+    incremental: bool = False,
+    memory_budget: int | None = None,
+    report: Callable[[ConfigResult], None],
+    started: Callable[[str], None] | None = None,
+    module_cache: "ModuleCache | None" = None,
+) -> list[ConfigResult]:
+    """
+    Build several configs, parsing every module they share only once.
+
+    Rendered modules are kept in a per-process render cache, so a module shared by configs
+    with the same renderer settings is usually rendered once too.
+
+    The union of (search_path, module) pairs across all configs is parsed first, one task per pair.
+    Undocumented members are pruned from a module when none of the configs using it shows them.
+    As soon as all the modules of a config are parsed, the config is queued for rendering.
+    Parse and render tasks share the same executor and run longest first: each config's cost is
+    estimated from its source size and module count, and modules inherit the cost of the largest
+    config using them, so that big configs don't start last and hold up the end of the build.
+
+    Every task records the peak memory of the process running it, and each config reports the highest
+    peak of its parse and render tasks. With a memory budget, fewer tasks run at once when their
+    estimated memory, derived from the same cost, would exceed it.
+
+    A config starts when its first parse or render task is handed to the executor, or when it is skipped
+    or fails before that. Results record the time since then, the module count, the source and output
+    sizes, and how many modules were rendered from the cache.
+
+    :param config_paths: YAML config files.
+    :param output_dir: Optional directory where output files are written.
+    :param executor: Executor running the parse and render tasks.
+    :param jobs: Number of tasks handed to the executor at a time, one per CPU by default.
+    :param cache_dir: Optional directory where parsed and rendered modules are cached.
+    :param incremental: Skip configs whose output was generated from the same inputs.
+    :param memory_budget: Maximum estimated memory of the tasks running at a time, in bytes. Unlimited by default.
+    :param report: Called with each config's result as soon as it is known.
+    :param started: Called with the path of each config when it starts, before its result is reported.
+    :param module_cache: Optional in-memory cache of parsed modules, shared by successive builds of the process.
+    :returns: The result of every config, in completion order.
+    """
+    progress = _Progress(report, started)
+    planned = _plan(config_paths, output_dir, incremental=incremental, report=progress.report)
+    parsed = _ParsedModules(planned)
+
+    def _task_started(tag: tuple[str, Any]) -> None:
+        phase, key = tag
+        for item in parsed.dependents[key] if phase == "parse" else [key]:
+            progress.start(item.config.path)
+
+    scheduler = Scheduler(executor, jobs or os.cpu_count() or 1, memory_budget, on_start=_task_started)
+    stamps = _submit_initial(scheduler, planned, parsed, cache_dir, module_cache)
+    parse_rss: dict[ModuleKey, int | None] = {}
+
+    for (phase, tag), future in scheduler.completed():
+        error = future.exception()
+        result, rss = (None, None) if error else future.result()
+        if phase == "render":
+            progress.report(_render_result(tag, error, result, _max_rss([rss, *map(parse_rss.get, tag.keys)])))
+            continue
+        parse_rss[tag] = rss
+        if module_cache is not None and error is None:
+            module_cache.put(tag, stamps[tag], result)
+        for item in parsed.add(tag, result, error):
+            try:
+                modules = parsed.take(item)
+            except Exception as exc:  # noqa: BLE001
+                peak = _max_rss([parse_rss.get(k) for k in item.keys])
+                progress.report(ConfigResult(item.config.path, "failed", exc, peak, modules=len(item.keys)))
+                continue
+            _submit_render(scheduler, item, modules, cache_dir)
+
+    return progress.results
@@ -0,0 +1,395 @@
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from griffe import Expr, ExprName, JSONEncoder, Module, ModulesCollection, Object, Parser, json_decoder
+
+from haystack_pydoc_tools.__about__ import __version__
+from haystack_pydoc_tools.discovery import ModuleKey
+from haystack_pydoc_tools.model import DocModule
+from haystack_pydoc_tools.utils import Stamp, package_version
+
+# Bump when the on-disk layout or the serialized payload changes in an incompatible way.
+CACHE_FORMAT_VERSION = 2
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+
+def _attach_parent(expr: Any, scope: Object | None) -> None:
+    if isinstance(expr, Expr):
+        for elem in expr.iterate(flat=True):
+            if isinstance(elem, ExprName):
+                elem.parent = scope
+
+
+def _restore_object(obj: Object, docstring_parser: Parser) -> None:
+    # griffe's JSON decoder only re-attaches the first layer of each expression and does not restore
+    # docstring parents and parsers, which changes how annotations are resolved and rendered.
+    if obj.docstring is not None:
+        obj.docstring.parent = obj
+        obj.docstring.parser = docstring_parser
+    scope = obj.parent
+    if obj.is_class:
+        for base in obj.bases:
+            _attach_parent(base, scope)
+    elif obj.is_function:
+        for parameter in obj.parameters:
+            _attach_parent(parameter.annotation, scope)
+            _attach_parent(parameter.default, scope)
+        _attach_parent(obj.returns, scope)
+    elif obj.is_attribute:
+        _attach_parent(obj.annotation, scope)
+        _attach_parent(obj.value, scope)
+    for member in obj.members.values():
+        if not member.is_alias:
+            _restore_object(member, docstring_parser)
+
+
+def dump_module(module: Module | DocModule) -> str:
+    """Serialize a griffe Module, or a module in the compact documentation model, to griffe JSON."""
+    if isinstance(module, DocModule):
+        module = module.to_griffe()
+    return json.dumps(module, cls=JSONEncoder)
+
+
+def load_module(data: str, docstring_parser: Parser = Parser.sphinx) -> Module:
+    """
+    Deserialize a griffe Module produced by `dump_module`.
+
+    :param data: JSON payload.
+    :param docstring_parser: Docstring parser to attach to every docstring of the module.
+    :returns: The griffe Module, ready to be rendered.
+    """
+    module = json.loads(data, object_hook=json_decoder)
+    # Alias members (imports) need a modules collection to attempt resolution when rendering.
+    module._modules_collection = ModulesCollection()
+    _restore_object(module, docstring_parser)
+    return module
+
+
+class _DiskStore:
+    """
+    Text entries stored as one file per key, evicted least recently used first.
+
+    The size of the store is counted in memory: the directory is only scanned again when the writes of this
+    process take it over `max_size`, or add up to a sixteenth of it, which bounds how far the writes of other
+    processes sharing the store can take it over.
+    """
+
+    suffix = ".json"
+
+    def __init__(self, directory: str | Path, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Size of the entries found by the last scan, and bytes written by this process since
+        self._scanned_size: int | None = None
+        self._written = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def read(self, key: str) -> str | None:
+        """Return the entry stored for `key` and mark it as recently used, or None on a miss."""
+        try:
+            data = self._path(key).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(self._path(key))
+        return data
+
+    def write(self, key: str, data: str) -> None:
+        """Atomically store an entry, then evict old entries if the store is over its size cap."""
+        payload = data.encode("utf-8")
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        # Replacing an entry counts its size twice, which only scans the directory earlier
+        self._written += len(payload)
+        if (
+            self._scanned_size is None
+            or self._scanned_size + self._written > self.max_size
+            or self._written > self.max_size // 16
+        ):
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits in `max_size`."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(self.suffix):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        if total > self.max_size:
+            for _, size, path in sorted(entries):
+                Path(path).unlink(missing_ok=True)
+                total -= size
+                if total <= self.max_size:
+                    break
+        self._scanned_size = total
+        self._written = 0
+
+
+class ParseCache(_DiskStore):
+    """
+    On-disk cache of parsed griffe modules, keyed by source content.
+
+    Entries are griffe JSON dumps stored as one file per key. Every hit refreshes the entry's mtime,
+    and the least recently used entries are evicted when the cache grows above `max_size` bytes.
+    The cache can be shared by several processes: writes are atomic and eviction tolerates
+    entries removed concurrently.
+    """
+
+    def __init__(self, directory: str | Path, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """
+        Create a parse cache.
+
+        :param directory: Directory where cache entries are stored. Created if missing.
+        :param max_size: Maximum total size of the cache entries, in bytes.
+        """
+        super().__init__(directory, max_size)
+
+    def key(
+        self,
+        module_name: str,
+        code: str,
+        *,
+        parent: str | None = None,
+        docstring_parser: str = "sphinx",
+        documented_only: bool = False,
+    ) -> str:
+        """
+        Compute the cache key of a module.
+
+        :param module_name: Name the module is loaded under.
+        :param code: Source code of the module.
+        :param parent: Name of the parent package the module is visited in, if any.
+        :param docstring_parser: Docstring parser used to parse the module.
+        :param documented_only: Whether undocumented members are pruned from the module.
+        :returns: A hex digest identifying the parsed module.
+        """
+        digest = hashlib.sha256()
+        header = [
+            CACHE_FORMAT_VERSION,
+            package_version("griffe"),
+            docstring_parser,
+            module_name,
+            parent,
+            documented_only,
+        ]
+        digest.update(json.dumps(header).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(code.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str, docstring_parser: Parser = Parser.sphinx) -> Module | None:
+        """
+        Return the cached module for `key`, or None on a miss.
+
+        :param key: Cache key, as returned by `key`.
+        :param docstring_parser: Docstring parser to attach to the loaded module.
+        :returns: The cached griffe Module, or None.
+        """
+        data = self.read(key)
+        if data is None:
+            return None
+        try:
+            return load_module(data, docstring_parser)
+        except (ValueError, KeyError, TypeError):
+            # Corrupted or incompatible entry: drop it and parse again
+            self._path(key).unlink(missing_ok=True)
+            return None
+
+    def put(self, key: str, module: Module) -> None:
+        """
+        Store a parsed module and evict old entries if the cache is over its size cap.
+
+        :param key: Cache key, as returned by `key`.
+        :param module: Parsed griffe Module.
+        """
+        self.write(key, dump_module(module))
+
+
+class _MarkdownStore(_DiskStore):
+    suffix = ".md"
+
+
+def source_hash(module: Module | DocModule) -> str | None:
+    """Return the hash of the source a module was loaded from, as recorded by `load_modules`."""
+    return module.extra.get("haystack_pydoc", {}).get("source_hash")
+
+
+@lru_cache(maxsize=None)
+def _renderer_versions() -> tuple[str, ...]:
+    # Packages shaping the Markdown: griffe2md renders it, black formats signatures and mdformat the whole page.
+    # Looked up once per process, reading package metadata is slow.
+    return tuple(package_version(name) for name in ("griffe2md", "black", "mdformat"))
+
+
+class RenderCache:
+    """
+    Cache of rendered Markdown, keyed by module path, source hash, renderer config and the versions of the renderers.
+
+    Entries are kept in memory (the most recently used `max_entries`) and, when a directory is given,
+    on disk so that they are shared between processes and runs. A module's Markdown only depends on
+    its own source, since modules are loaded detached from each other, so a module listed in several
+    configs rendered with the same settings is rendered once. Safe to share between threads.
+    """
+
+    def __init__(
+        self, directory: str | Path | None = None, max_size: int = DEFAULT_MAX_SIZE, max_entries: int = 1024
+    ) -> None:
+        """
+        Create a render cache.
+
+        :param directory: Optional directory where entries are persisted. Created if missing.
+        :param max_size: Maximum total size of the entries on disk, in bytes.
+        :param max_entries: Maximum number of entries kept in memory.
+        """
+        self.max_entries = max_entries
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._disk = _MarkdownStore(directory, max_size) if directory else None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def hits(self) -> int:
+        """Lookups of the calling thread answered from memory or disk, since the cache was created."""
+        # Per thread, so that builds rendering concurrently in one process each count their own hits
+        return getattr(self._local, "hits", 0)
+
+    def key(self, module: Module | DocModule, config: dict[str, Any], signature_formatter: str) -> str | None:
+        """
+        Compute the cache key of a rendered module.
+
+        :param module: The module to render.
+        :param config: Effective griffe2md config.
+        :param signature_formatter: Signature formatter used to render.
+        :returns: A hex digest, or None if the module's source hash is unknown and it can't be cached.
+        """
+        digest = source_hash(module)
+        if digest is None:
+            return None
+        header = [
+            CACHE_FORMAT_VERSION,
+            __version__,
+            *_renderer_versions(),
+            module.path,
+            digest,
+            config,
+            signature_formatter,
+        ]
+        return hashlib.sha256(json.dumps(header, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """
+        Return the Markdown cached for `key`, or None on a miss.
+
+        :param key: Cache key, as returned by `key`.
+        :returns: The rendered Markdown, or None.
+        """
+        with self._lock:
+            rendered = self._memory.get(key)
+            if rendered is not None:
+                self._memory.move_to_end(key)
+        if rendered is None and self._disk is not None:
+            rendered = self._disk.read(key)
+            if rendered is not None:
+                self._remember(key, rendered)
+        if rendered is not None:
+            self._local.hits = self.hits + 1
+        return rendered
+
+    def put(self, key: str, rendered: str) -> None:
+        """
+        Store rendered Markdown.
+
+        :param key: Cache key, as returned by `key`.
+        :param rendered: The rendered Markdown.
+        """
+        self._remember(key, rendered)
+        if self._disk is not None:
+            self._disk.write(key, rendered)
+
+    def _remember(self, key: str, rendered: str) -> None:
+        with self._lock:
+            self._memory[key] = rendered
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+
+class ModuleCache:
+    """
+    In-memory cache of parsed modules, in the compact documentation model, for processes running many builds.
+
+    Entries are validated against the stamp (mtime and size) of the module's source file taken before
+    parsing it, so an unchanged module is not parsed again by the next build. The most recently used
+    `max_entries` modules are kept. Safe to share between threads.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        """
+        Create a module cache.
+
+        :param max_entries: Maximum number of modules kept in memory.
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[ModuleKey, tuple[Stamp, DocModule]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: ModuleKey, stamp: Stamp) -> DocModule | None:
+        """
+        Return a parsed module, or None if it is missing or its source changed.
+
+        :param key: The (resolved search path, module name) of the module.
+        :param stamp: Current stamp of the module's source file, as returned by `file_stamp`.
+        :returns: The parsed module, or None.
+        """
+        if stamp is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != stamp:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: ModuleKey, stamp: Stamp, module: DocModule) -> None:
+        """
+        Store a parsed module.
+
+        :param key: The (resolved search path, module name) of the module.
+        :param stamp: Stamp of the module's source file taken before parsing it.
+        :param module: The parsed module.
+        """
+        if stamp is None:
+            return
+        with self._lock:
+            self._entries[key] = (stamp, module)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
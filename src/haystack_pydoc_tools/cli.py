@@ -1,89 +1,419 @@
+import argparse
 import sys
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import yaml
-
-from haystack_pydoc_tools.loaders import load_modules
-from haystack_pydoc_tools.renderers import render_docusaurus
-
-
-def process_config(config_path: str, output_dir: str | None = None) -> None:
-    """Process a single YAML config file and generate Markdown API references."""
-    with open(config_path, encoding="utf-8") as f:
-        config = yaml.safe_load(f)
-
-    # Resolve search_path relative to the config file's directory
-    config_dir = Path(config_path).resolve().parent
-    loader_config = config["loaders"][0]
-    search_path = str((config_dir / loader_config["search_path"][0]).resolve())
-
-    modules = load_modules(search_path, loader_config["modules"])
-
-    # Extract renderer config
-    renderer_config = config["renderer"]
-    filename = renderer_config.get("filename") or renderer_config["markdown"]["filename"]
-
-    if output_dir:
-        filename = str(Path(output_dir) / Path(filename).name)
-
-    # Extract processor settings
-    show_if_no_docstring = False
-    skip_empty_modules = True
-    for proc in config.get("processors", []):
-        if proc.get("type", "filter") == "filter":
-            if "documented_only" in proc:
-                show_if_no_docstring = not proc["documented_only"]
-            if "skip_empty_modules" in proc:
-                skip_empty_modules = proc["skip_empty_modules"]
-
-    render_docusaurus(
-        modules,
-        title=renderer_config["title"],
-        doc_id=renderer_config["id"],
-        description=renderer_config["description"],
-        filename=filename,
-        show_if_no_docstring=show_if_no_docstring,
-        skip_empty_modules=skip_empty_modules,
+# Only the standard library is imported at startup, so that `--help`, usage errors and up-to-date
+# configs return quickly. The build modules, and the heavy dependencies (griffe, griffe2md, black,
+# jinja2, yaml) they pull in, are imported when a command needs them.
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from haystack_pydoc_tools.build import ConfigResult
+
+
+def process_config(  # noqa: PLR0913
+    config_path: str,
+    output_dir: str | None = None,
+    cache_dir: str | None = None,
+    *,
+    incremental: bool = False,
+    workers: int | None = None,
+    executor: "Executor | None" = None,
+) -> bool:
+    """
+    Process a single YAML config file and generate Markdown API references.
+
+    :param config_path: Path to the YAML config file.
+    :param output_dir: Optional directory where the output file is written.
+    :param cache_dir: Optional directory where parsed and rendered modules are cached.
+    :param incremental: Skip the config if its output was generated from the same inputs.
+    :param workers: Number of processes parsing modules in parallel, one per CPU by default.
+    :param executor: Executor parsing the modules, instead of a pool of `workers` processes.
+    :returns: True if the output was written, False if it was up to date and skipped.
+    """
+    from haystack_pydoc_tools import profiling
+    from haystack_pydoc_tools.config import load_config, module_keys
+    from haystack_pydoc_tools.manifest import build_manifest, is_up_to_date, write_manifest
+
+    with profiling.labels(config=config_path):
+        config = load_config(config_path, output_dir)
+
+        manifest = build_manifest(config) if incremental else None
+        if manifest and is_up_to_date(config.filename, manifest):
+            return False
+
+        from haystack_pydoc_tools.build import render_cache
+        from haystack_pydoc_tools.cache import ParseCache
+        from haystack_pydoc_tools.loaders import load_module_keys
+        from haystack_pydoc_tools.renderers import render_docusaurus
+
+        cache = ParseCache(cache_dir) if cache_dir else None
+        modules = load_module_keys(
+            module_keys(config),
+            cache=cache,
+            workers=workers,
+            executor=executor,
+            documented_only=not config.show_if_no_docstring,
+        )
+
+        render_docusaurus(
+            modules, filename=config.filename, render_cache=render_cache(cache_dir), **config.renderer_settings()
+        )
+
+        if manifest:
+            write_manifest(config.filename, manifest)
+    return True
+
+
+def _print_result(result: "ConfigResult") -> None:
+    name = Path(result.config).name
+    if result.status == "ok":
+        memory = f" (peak RSS {result.peak_rss / 1024**2:.0f} MB)" if result.peak_rss else ""
+        print(f"  OK: {name}{memory}")
+    elif result.status == "skipped":
+        print(f"  SKIP: {name} (up to date)")
+    else:
+        print(f"  FAIL: {name}: {result.error}", file=sys.stderr)
+
+
+def _emit(event: dict) -> None:
+    import json
+
+    print(json.dumps(event), flush=True)
+
+
+def _emit_start(config: str) -> None:
+    _emit({"event": "start", "config": config, "time": time.time()})
+
+
+def _emit_result(result: "ConfigResult") -> None:
+    _emit(
+        {
+            "event": "finish",
+            "config": result.config,
+            "status": result.status,
+            "time": time.time(),
+            "seconds": result.seconds,
+            "modules": result.modules,
+            "source_bytes": result.source_bytes,
+            "output_bytes": result.output_bytes,
+            "cache": result.cache,
+            "cache_hits": result.cache_hits,
+            "peak_rss": result.peak_rss,
+            "error": None if result.error is None else f"{type(result.error).__name__}: {result.error}",
+        }
     )
 
 
+def _emit_summary(results: list["ConfigResult"], seconds: float) -> None:
+    statuses = [result.status for result in results]
+    _emit(
+        {
+            "event": "summary",
+            "configs": len(results),
+            "ok": statuses.count("ok"),
+            "skipped": statuses.count("skipped"),
+            "failed": statuses.count("failed"),
+            "seconds": seconds,
+            "source_bytes": sum(result.source_bytes or 0 for result in results),
+            "output_bytes": sum(result.output_bytes or 0 for result in results),
+        }
+    )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="haystack-pydoc",
+        description="Generate Docusaurus-compatible Markdown API references.",
+        epilog="To parse and render in separate steps, see `haystack-pydoc parse --help` "
+        "and `haystack-pydoc render --help`. To render pages on request, see `haystack-pydoc serve --help`.",
+    )
+    parser.add_argument("target", help="YAML config file or directory of config files")
+    parser.add_argument("output_dir", nargs="?", help="directory where Markdown files are written")
+    parser.add_argument(
+        "--cache-dir", help="directory where parsed and rendered modules are cached between runs (disabled by default)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="skip configs whose output was generated from the same inputs (recorded in a manifest next to it)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=_non_negative_int,
+        help="number of worker processes (default: one per CPU, or none with a single config file); "
+        "0 builds everything in the current process",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=_size,
+        metavar="SIZE",
+        help="with a directory of configs, run fewer tasks at once when their estimated memory would exceed SIZE "
+        "(e.g. 2G or 512M)",
+    )
+    parser.add_argument(
+        "--max-tasks-per-child",
+        type=_positive_int,
+        metavar="N",
+        help="replace each worker process after N tasks, releasing the memory it accumulated (Python 3.11+)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="json prints one JSON event per line on stdout: the start and finish of each config, then a summary",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and rebuild configs when their YAML file or source files change",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        help="record the time spent in each build stage, per config and per module, in DIR/profile.json",
+    )
+    parser.add_argument(
+        "--cprofile", action="store_true", help="with --profile, also write a cProfile dump per worker process in DIR"
+    )
+    args = parser.parse_args()
+    # Reject the options a mode would silently ignore
+    if args.watch:
+        options = {
+            "--incremental": args.incremental,
+            "--memory-budget": args.memory_budget,
+            "--max-tasks-per-child": args.max_tasks_per_child,
+            "--profile": args.profile,
+        }
+        ignored = [option for option, value in options.items() if value]
+        if ignored:
+            parser.error(f"{', '.join(ignored)} cannot be used with --watch")
+    elif args.memory_budget and _single_config(args):
+        parser.error("--memory-budget only applies to a directory of configs or to --format json")
+    return args
+
+
+def _non_negative_int(value: str) -> int:
+    jobs = int(value)
+    if jobs < 0:
+        msg = f"expected a non-negative integer, got {value}"
+        raise argparse.ArgumentTypeError(msg)
+    return jobs
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        msg = f"expected a positive integer, got {value}"
+        raise argparse.ArgumentTypeError(msg)
+    return number
+
+
+def _size(value: str) -> int:
+    from haystack_pydoc_tools.memory import parse_size
+
+    try:
+        return parse_size(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+
+
+def _watch(target: Path, output_dir: str | None, cache_dir: str | None, jobs: int | None, *, events: bool) -> None:
+    def ready() -> None:
+        # Keeps stdout to events with --format json
+        print(f"Watching {target} for changes. Press Ctrl+C to stop.", file=sys.stderr if events else sys.stdout)
+
+    import contextlib
+
+    from haystack_pydoc_tools.watch import watch
+    from haystack_pydoc_tools.workers import create_executor
+
+    # Parsed modules are kept in this process, the pool only parses the modules that changed
+    with create_executor(jobs) as executor, contextlib.suppress(KeyboardInterrupt):
+        report = _emit_result if events else _print_result
+        watch(target, output_dir, executor=executor, cache_dir=cache_dir, report=report, ready=ready)
+
+
+def _parse_ir_args(command: str, argv: list[str]) -> argparse.Namespace:
+    if command == "parse":
+        description = "Parse the modules of configs once and write them to an intermediate representation (IR) file."
+    else:
+        description = "Generate Markdown API references from an IR file written by `haystack-pydoc parse`."
+    parser = argparse.ArgumentParser(prog=f"haystack-pydoc {command}", description=description)
+    parser.add_argument("target", help="YAML config file or directory of config files")
+    parser.add_argument("ir", help="IR file, gzip-compressed if its name ends in .gz")
+    if command == "parse":
+        parser.add_argument("--cache-dir", help="directory where parsed modules are cached between runs")
+        parser.add_argument(
+            "--jobs",
+            type=_non_negative_int,
+            help="number of worker processes (default: one per CPU); 0 parses everything in the current process",
+        )
+    else:
+        parser.add_argument("output_dir", nargs="?", help="directory where Markdown files are written")
+        parser.add_argument("--cache-dir", help="directory where rendered modules are cached between runs")
+    return parser.parse_args(argv)
+
+
+def _config_paths(target: Path) -> list[Path]:
+    if not target.is_dir():
+        return [target]
+    configs = sorted(target.glob("*.yml"))
+    if not configs:
+        print(f"No .yml files found in {target}", file=sys.stderr)
+        sys.exit(1)
+    return configs
+
+
+def _exit_on_failures(results: list["ConfigResult"]) -> None:
+    failed = [result for result in results if result.status == "failed"]
+    if failed:
+        print(f"\n{len(failed)} config(s) failed.", file=sys.stderr)
+        sys.exit(1)
+
+
+def _ir_command(command: str, argv: list[str]) -> None:
+    args = _parse_ir_args(command, argv)
+    configs = _config_paths(Path(args.target))
+    if command == "parse":
+        from haystack_pydoc_tools.ir import parse_to_ir
+        from haystack_pydoc_tools.workers import create_executor
+
+        Path(args.ir).parent.mkdir(parents=True, exist_ok=True)
+        with create_executor(args.jobs) as executor:
+            count = parse_to_ir(configs, args.ir, executor=executor, cache_dir=args.cache_dir)
+        print(f"Parsed {count} module(s) to {args.ir}")
+        return
+
+    from haystack_pydoc_tools.ir import render_from_ir
+
+    if args.output_dir:
+        Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    _exit_on_failures(render_from_ir(configs, args.ir, args.output_dir, cache_dir=args.cache_dir, report=_print_result))
+
+
+def _serve(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="haystack-pydoc serve",
+        description="Serve the Markdown of configs over HTTP, rendered on request and kept in memory. "
+        "GET / lists the pages, GET /<name> renders <name>.yml.",
+    )
+    parser.add_argument("target", help="YAML config file or directory of config files")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=_non_negative_int, default=8000, help="port to listen on (default: %(default)s)")
+    parser.add_argument("--cache-dir", help="directory where parsed and rendered modules are cached between runs")
+    parser.add_argument(
+        "--jobs",
+        type=_non_negative_int,
+        help="number of worker processes (default: one per CPU); 0 renders in the server process",
+    )
+    args = parser.parse_args(argv)
+
+    import asyncio
+    import contextlib
+
+    from haystack_pydoc_tools.serve import DocsServer, serve
+    from haystack_pydoc_tools.workers import create_executor
+
+    if args.jobs == 0:
+        # Pages render in threads of the server process: load black before requests render concurrently
+        from haystack_pydoc_tools.renderers import warm_up
+
+        warm_up()
+
+    def ready(host: str, port: int) -> None:
+        print(f"Serving {args.target} on http://{host}:{port}/. Press Ctrl+C to stop.", flush=True)
+
+    with create_executor(args.jobs) as executor, contextlib.suppress(KeyboardInterrupt):
+        server = DocsServer(
+            Path(args.target),
+            executor=executor,
+            new_executor=lambda: create_executor(args.jobs),
+            cache_dir=args.cache_dir,
+        )
+        try:
+            asyncio.run(serve(server, args.host, args.port, ready=ready))
+        finally:
+            # The executor replacing a broken one, if any
+            server.executor.shutdown()
+
+
+def _single_config(args: argparse.Namespace) -> bool:
+    # Built by `process_config`, without the per-config reports of directory builds
+    return not Path(args.target).is_dir() and args.format != "json"
+
+
+def _build(args: argparse.Namespace, executor: "Executor") -> None:
+    target = Path(args.target)
+    events = args.format == "json"
+    if _single_config(args):
+        process_config(str(target), args.output_dir, args.cache_dir, incremental=args.incremental, executor=executor)
+        return
+
+    configs = _config_paths(target)
+
+    from haystack_pydoc_tools.build import build_directory
+
+    start = time.perf_counter()
+    results = build_directory(
+        configs,
+        args.output_dir,
+        executor=executor,
+        jobs=args.jobs,
+        cache_dir=args.cache_dir,
+        incremental=args.incremental,
+        memory_budget=args.memory_budget,
+        report=_emit_result if events else _print_result,
+        started=_emit_start if events else None,
+    )
+    if events:
+        _emit_summary(results, time.perf_counter() - start)
+    _exit_on_failures(results)
+
+
 def main() -> None:
     """CLI entry point: reads a YAML config (or directory of configs) and generates Markdown API docs."""
+    if sys.argv[1:2] in (["parse"], ["render"]):
+        _ir_command(sys.argv[1], sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["serve"]:
+        _serve(sys.argv[2:])
+        return
 
-    if len(sys.argv) < 2:  # noqa: PLR2004
-        print("Usage: haystack-pydoc <config.yml | config-directory> [output-directory]", file=sys.stderr)
-        sys.exit(1)
+    args = _parse_args()
 
-    target = Path(sys.argv[1])
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None  # noqa: PLR2004
-
-    if output_dir:
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
-
-    if target.is_dir():
-        configs = sorted(target.glob("*.yml"))
-        if not configs:
-            print(f"No .yml files found in {target}", file=sys.stderr)
-            sys.exit(1)
-
-        errors: list[tuple[str, Exception]] = []
-        with ProcessPoolExecutor() as executor:
-            futures = {executor.submit(process_config, str(cfg), output_dir): cfg for cfg in configs}
-            for future in as_completed(futures):
-                cfg = futures[future]
-                try:
-                    future.result()
-                    print(f"  OK: {cfg.name}")
-                except Exception as exc:  # noqa: BLE001
-                    errors.append((cfg.name, exc))
-                    print(f"  FAIL: {cfg.name}: {exc}", file=sys.stderr)
-
-        if errors:
-            print(f"\n{len(errors)} config(s) failed.", file=sys.stderr)
-            sys.exit(1)
-    else:
-        process_config(str(target), output_dir)
+    if args.output_dir:
+        Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+
+    if args.watch:
+        _watch(Path(args.target), args.output_dir, args.cache_dir, args.jobs, events=args.format == "json")
+        return
+
+    from haystack_pydoc_tools import profiling
+    from haystack_pydoc_tools.workers import create_executor
+
+    jobs = args.jobs
+    if jobs is None and _single_config(args):
+        # Starting worker processes costs more than parsing the modules of one config in parallel saves
+        jobs = 0
+    max_tasks_per_child = args.max_tasks_per_child
+    if max_tasks_per_child and sys.version_info < (3, 11):
+        print("--max-tasks-per-child requires Python 3.11 or later, ignoring it", file=sys.stderr)
+        max_tasks_per_child = None
+    if args.profile:
+        profiling.start(args.profile, cprofile=args.cprofile)
+    start = time.perf_counter()
+    try:
+        with create_executor(
+            jobs, args.profile, cprofile=args.cprofile, max_tasks_per_child=max_tasks_per_child
+        ) as executor:
+            _build(args, executor)
+    finally:
+        if args.profile:
+            report = profiling.write_report(args.profile, time.perf_counter() - start)
+            print(f"Profile written to {report}", file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,191 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from haystack_pydoc_tools import profiling
+from haystack_pydoc_tools.discovery import ModuleIndex, ModuleKey, discover_modules, find_root, is_pattern, module_index
+from haystack_pydoc_tools.postprocessing import Rule
+
+GRIFFE2MD_DEFAULT_CONFIG = {
+    # Heading structure
+    "heading_level": 2,
+    "show_root_heading": True,
+    "show_root_full_path": True,
+    "show_root_members_full_path": False,
+    "show_object_full_path": False,
+    # Signatures
+    "separate_signature": True,
+    "show_signature": True,
+    "show_signature_annotations": True,
+    "signature_crossrefs": False,
+    "line_length": 80,
+    # Members
+    "merge_init_into_class": False,
+    "inherited_members": True,
+    "filters": ["!^_", "^__init__$"],
+    "members": None,
+    "members_order": "source",
+    "group_by_category": False,
+    "show_submodules": False,
+    "show_bases": True,
+    "show_category_heading": False,
+    # Docstring rendering
+    "docstring_section_style": "list",
+    "show_docstring_attributes": True,
+    "show_docstring_description": True,
+    "show_docstring_examples": True,
+    "show_docstring_other_parameters": True,
+    "show_docstring_parameters": True,
+    "show_docstring_raises": True,
+    "show_docstring_receives": True,
+    "show_docstring_returns": True,
+    "show_docstring_warns": True,
+    "show_docstring_yields": True,
+    "show_docstring_classes": True,
+    "show_docstring_functions": True,
+    "show_docstring_modules": True,
+    # Display
+    "show_if_no_docstring": False,
+    "summary": False,
+    "annotations_path": "brief",
+}
+
+
+@dataclass
+class LoaderConfig:
+    """A loader of a YAML config: modules looked up in one or more source roots."""
+
+    # Resolved source roots, in lookup order
+    search_paths: list[str]
+    # Module names, or patterns such as `haystack.components.**`
+    modules: list[str]
+    # Segment names excluded from the modules matched by patterns
+    ignore_when_discovered: list[str] = field(default_factory=list)
+
+    def module_names(self, index: ModuleIndex = module_index) -> list[str]:
+        """
+        Return the modules of the loader, with patterns expanded, in alphabetical order.
+
+        :param index: Modules of each source root, the source files found on disk by default.
+        :returns: The module names.
+        """
+        names = set()
+        for module_name in self.modules:
+            if is_pattern(module_name):
+                names.update(discover_modules(self.search_paths, module_name, self.ignore_when_discovered, index))
+            else:
+                names.add(module_name)
+        return sorted(names)
+
+
+@dataclass
+class DocsConfig:
+    """A YAML config file, resolved to the settings needed to load and render it."""
+
+    path: str
+    loaders: list[LoaderConfig]
+    filename: str
+    title: str
+    doc_id: str
+    description: str
+    show_if_no_docstring: bool = False
+    skip_empty_modules: bool = True
+    signature_formatter: str = "black"
+    # Extra post-processing rules, as dicts of haystack_pydoc_tools.postprocessing.Rule fields
+    postprocess_rules: list[dict[str, str]] = field(default_factory=list)
+
+    def renderer_settings(self) -> dict[str, Any]:
+        """Return the settings passed to the renderer, as a JSON-serializable dict."""
+        return {
+            "title": self.title,
+            "doc_id": self.doc_id,
+            "description": self.description,
+            "show_if_no_docstring": self.show_if_no_docstring,
+            "skip_empty_modules": self.skip_empty_modules,
+            "signature_formatter": self.signature_formatter,
+            "postprocess_rules": self.postprocess_rules,
+        }
+
+
+def load_config(config_path: str, output_dir: str | None = None) -> DocsConfig:
+    """
+    Read a YAML config file and resolve its paths.
+
+    :param config_path: Path to the YAML config file.
+    :param output_dir: Optional directory where the output file is written.
+    :returns: The resolved config.
+    """
+    with profiling.timed("yaml", config=config_path), open(config_path, encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+
+    # Resolve search paths relative to the config file's directory
+    config_dir = Path(config_path).resolve().parent
+    loaders = [
+        LoaderConfig(
+            search_paths=[str((config_dir / search_path).resolve()) for search_path in loader["search_path"]],
+            modules=loader["modules"],
+            ignore_when_discovered=loader.get("ignore_when_discovered", []),
+        )
+        for loader in config["loaders"]
+    ]
+
+    # Extract renderer config
+    renderer_config = config["renderer"]
+    filename = renderer_config.get("filename") or renderer_config["markdown"]["filename"]
+
+    if output_dir:
+        filename = str(Path(output_dir) / Path(filename).name)
+
+    # Extract processor settings
+    show_if_no_docstring = False
+    skip_empty_modules = True
+    postprocess_rules = []
+    for proc in config.get("processors", []):
+        proc_type = proc.get("type", "filter")
+        if proc_type == "filter":
+            if "documented_only" in proc:
+                show_if_no_docstring = not proc["documented_only"]
+            if "skip_empty_modules" in proc:
+                skip_empty_modules = proc["skip_empty_modules"]
+        elif proc_type == "replace":
+            rule = {"pattern": proc["pattern"], "replacement": proc.get("replacement", "")}
+            if "trigger" in proc:
+                rule["trigger"] = proc["trigger"]
+            # Fail on invalid patterns when loading the config rather than when rendering
+            Rule(**rule)
+            postprocess_rules.append(rule)
+
+    return DocsConfig(
+        path=config_path,
+        loaders=loaders,
+        filename=filename,
+        title=renderer_config["title"],
+        doc_id=renderer_config["id"],
+        description=renderer_config["description"],
+        show_if_no_docstring=show_if_no_docstring,
+        skip_empty_modules=skip_empty_modules,
+        signature_formatter=renderer_config.get("signature_formatter", "black"),
+        postprocess_rules=postprocess_rules,
+    )
+
+
+def module_keys(config: DocsConfig, index: ModuleIndex = module_index) -> list[ModuleKey]:
+    """
+    Return the modules of a config, in rendering order.
+
+    The modules of each loader come in alphabetical order, after those of the previous loaders. Patterns are
+    expanded against the modules currently found in the loader's search paths. Each module is looked up in its
+    loader's search paths in order, and a module listed more than once is only rendered once.
+
+    :param config: The resolved config.
+    :param index: Modules of each source root, the source files found on disk by default.
+    :returns: The (search path, module name) of each module.
+    """
+    keys = [
+        (find_root(loader.search_paths, module_name, index), module_name)
+        for loader in config.loaders
+        for module_name in loader.module_names(index)
+    ]
+    return list(dict.fromkeys(keys))
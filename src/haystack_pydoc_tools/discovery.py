@@ -0,0 +1,157 @@
+import os
+import re
+import time
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from pathlib import Path
+
+# A module to parse: (resolved search_path, module name as written in the config)
+ModuleKey = tuple[str, str]
+
+# Returns the modules under a source root, by slash-separated name: `module_index`, or an index of parsed modules
+ModuleIndex = Callable[[Path], dict[str, Path]]
+
+# Directories never scanned for modules
+SKIPPED_DIRECTORIES = ("__pycache__",)
+
+# Listing of every scanned directory: (mtime in ns, subdirectories as (name, is_symlink), Python files).
+# A directory's mtime changes when an entry is added, removed or renamed in it, so a listing is reused
+# as long as the mtime matches, and a scan of an unchanged tree costs one stat call per directory.
+_listings: dict[str, tuple[int, list[tuple[str, bool]], list[str]]] = {}
+
+# Listings of directories modified this recently are not reused: filesystem timestamps are coarse, so an entry
+# added right after the listing may not change the mtime
+_RACY_NS = 1_000_000_000
+
+
+def _listing(directory: str) -> tuple[list[tuple[str, bool]], list[str]]:
+    mtime = os.stat(directory).st_mtime_ns
+    cached = _listings.get(directory)
+    if cached is not None and cached[0] == mtime:
+        return cached[1], cached[2]
+    directories, files = [], []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                if not entry.name.startswith(".") and entry.name not in SKIPPED_DIRECTORIES:
+                    directories.append((entry.name, entry.is_symlink()))
+            elif entry.name.endswith(".py"):
+                files.append(entry.name)
+    if time.time_ns() - mtime > _RACY_NS:
+        _listings[directory] = (mtime, directories, files)
+    return directories, files
+
+
+def _scan(directory: str, prefix: str, index: dict[str, Path], seen: set[str]) -> None:
+    directories, files = _listing(directory)
+    for name in files:
+        if name == "__init__.py":
+            if prefix:
+                index[prefix[:-1]] = Path(directory, name)
+        else:
+            # A package takes precedence over a module of the same name
+            index.setdefault(prefix + name[:-3], Path(directory, name))
+    for name, is_symlink in directories:
+        path = os.path.join(directory, name)
+        # Symlinked directories are followed, once each
+        if is_symlink:
+            real = os.path.realpath(path)
+            if real in seen:
+                continue
+            seen.add(real)
+        _scan(path, f"{prefix}{name}/", index, seen)
+
+
+@lru_cache(maxsize=None)
+def module_index(root: Path) -> dict[str, Path]:
+    """
+    Index the source files under a source root by slash-separated module name.
+
+    The index is built once per root and process, so that resolving the modules of many configs does not probe
+    the filesystem for each of them. Call `module_index.cache_clear()` to pick up files created since: only the
+    directories whose mtime changed are listed again.
+
+    :param root: Resolved source root.
+    :returns: Path of each module's `.py` file, or of each package's `__init__.py`, by module name.
+    """
+    index: dict[str, Path] = {}
+    if root.is_dir():
+        _scan(str(root), "", index, {os.path.realpath(root)})
+    return index
+
+
+def module_filepath(root: Path, module_name: str) -> Path:
+    """
+    Return the source file of a module.
+
+    :param root: Resolved source root.
+    :param module_name: Module name (dotted or slash-separated) relative to root.
+    :returns: Path to the package's `__init__.py`, or to the module's `.py` file (which may not exist).
+    """
+    name = module_name.replace(".", "/")
+    return module_index(root).get(name) or (root / name).with_suffix(".py")
+
+
+def find_root(search_paths: list[str], module_name: str, index: ModuleIndex = module_index) -> str:
+    """
+    Return the first search path containing a module.
+
+    :param search_paths: Resolved source roots, in lookup order.
+    :param module_name: Module name (dotted or slash-separated).
+    :param index: Modules of each source root.
+    :returns: The first root containing the module, or the first root if none does, so that loading it reports
+        the missing file.
+    """
+    name = module_name.replace(".", "/")
+    for search_path in search_paths:
+        if name in index(Path(search_path)):
+            return search_path
+    return search_paths[0]
+
+
+def is_pattern(module_name: str) -> bool:
+    """Return whether a module name from a config is a pattern selecting several modules."""
+    return "*" in module_name or "?" in module_name
+
+
+@lru_cache(maxsize=256)
+def _pattern_regex(pattern: str) -> re.Pattern:
+    # Matched against a slash-separated module name followed by a slash
+    parts = []
+    for segment in pattern.replace(".", "/").split("/"):
+        if segment == "**":
+            parts.append("(?:[^/]+/)*")
+        else:
+            parts.append(re.escape(segment).replace(r"\*", "[^/]*").replace(r"\?", "[^/]") + "/")
+    return re.compile("".join(parts))
+
+
+def discover_modules(
+    search_paths: list[str], pattern: str, ignore: Iterable[str] = (), index: ModuleIndex = module_index
+) -> list[str]:
+    """
+    Return the modules matching a pattern in any of the search paths.
+
+    In patterns, `*` and `?` match any characters and any single character of a module name segment, and a `**`
+    segment matches any number of segments: `haystack.components.**` selects the `haystack.components` package
+    and every module below it.
+
+    :param search_paths: Resolved source roots.
+    :param pattern: Pattern of module names, dotted or slash-separated. Matches are returned in the same form.
+    :param ignore: Segment names excluded with everything below them. `__init__` excludes packages, keeping their
+        modules.
+    :param index: Modules of each source root.
+    :returns: The matching module names, in alphabetical order.
+    """
+    regex = _pattern_regex(pattern)
+    separator = "/" if "/" in pattern else "."
+    ignored = set(ignore)
+    found = set()
+    for search_path in search_paths:
+        for name, path in index(Path(search_path)).items():
+            if not regex.fullmatch(name + "/"):
+                continue
+            if ignored.intersection(name.split("/")) or ("__init__" in ignored and path.name == "__init__.py"):
+                continue
+            found.add(name.replace("/", separator))
+    return sorted(found)
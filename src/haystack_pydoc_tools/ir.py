@@ -0,0 +1,219 @@
+import contextlib
+import gzip
+import io
+import json
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor
+from itertools import repeat
+from pathlib import Path
+from typing import IO, Any
+
+from griffe import Module
+
+from haystack_pydoc_tools.__about__ import __version__
+from haystack_pydoc_tools.build import ConfigResult, parse_module, render_config
+from haystack_pydoc_tools.cache import dump_module, load_module, source_hash
+from haystack_pydoc_tools.config import load_config, module_keys
+from haystack_pydoc_tools.discovery import ModuleKey
+from haystack_pydoc_tools.model import DocModule
+from haystack_pydoc_tools.utils import package_version, replace_if_changed, temp_path
+
+IR_FORMAT = "haystack-pydoc-ir"
+
+# Bump when the layout of IR files changes.
+IR_VERSION = 1
+
+
+def _header() -> dict[str, Any]:
+    return {"format": IR_FORMAT, "version": IR_VERSION, "tool": __version__, "griffe": package_version("griffe")}
+
+
+@contextlib.contextmanager
+def _create(path: Path, *, compress: bool) -> Iterator[IO[str]]:
+    if not compress:
+        with open(path, "x", encoding="utf-8") as f:
+            yield f
+        return
+    # No file name nor timestamp in the gzip header, so that parsing unchanged sources gives an identical file
+    with (
+        open(path, "xb") as raw,
+        gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as compressed,
+        io.TextIOWrapper(compressed, encoding="utf-8") as f,
+    ):
+        yield f
+
+
+def _open(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def _relative(path: str | Path, start: Path) -> str:
+    try:
+        return os.path.relpath(path, start)
+    except ValueError:
+        # On another drive (Windows)
+        return str(path)
+
+
+def write_ir(path: str | Path, modules: dict[ModuleKey, Module | DocModule]) -> bool:
+    """
+    Write parsed modules to an IR file.
+
+    IR files are JSON Lines: a header with the format version, then two lines per module, its location and its
+    griffe JSON dump. Source roots are stored relative to the IR file, so that an IR can be rendered from another
+    checkout of the same repository. Files whose name ends in `.gz` are gzip-compressed.
+
+    :param path: Path of the IR file.
+    :param modules: Parsed modules, as returned by `load_modules` or `parse_module`, by (resolved search path,
+        module name).
+    :returns: True if the file was written, False if it already had the same content.
+    """
+    path = Path(path)
+    base = path.resolve().parent
+    tmp = temp_path(path)
+    try:
+        with _create(tmp, compress=path.suffix == ".gz") as f:
+            f.write(json.dumps(_header()) + "\n")
+            for (root, name), module in sorted(modules.items()):
+                entry = {
+                    "root": _relative(root, base),
+                    "name": name,
+                    "path": _relative(module.filepath, Path(root)),
+                    "source_hash": source_hash(module),
+                }
+                f.write(json.dumps(entry) + "\n")
+                f.write(dump_module(module) + "\n")
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return replace_if_changed(tmp, path)
+
+
+class IR:
+    """Parsed modules read from an IR file. Modules are deserialized when first requested."""
+
+    def __init__(self, path: str | Path) -> None:
+        """
+        Read an IR file written by `write_ir`.
+
+        :param path: Path of the IR file.
+        :raises ValueError: If the file is not an IR file, or was written by an incompatible version.
+        """
+        self.path = Path(path)
+        self._entries: dict[ModuleKey, tuple[str | None, str]] = {}
+        self._modules: dict[ModuleKey, Module] = {}
+        self._index: dict[str, dict[str, Path]] = {}
+        base = self.path.resolve().parent
+        with _open(self.path) as f:
+            self._check(f.readline())
+            for line in f:
+                entry = json.loads(line)
+                root = str((base / entry["root"]).resolve())
+                self._entries[root, entry["name"]] = (entry["source_hash"], next(f))
+                self._index.setdefault(root, {})[entry["name"].replace(".", "/")] = Path(root, entry["path"])
+
+    def _check(self, line: str) -> None:
+        try:
+            header = json.loads(line)
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("format") != IR_FORMAT:
+            msg = f"{self.path} is not a haystack-pydoc IR file"
+            raise ValueError(msg)
+        if header.get("version") != IR_VERSION:
+            msg = f"{self.path} has IR version {header.get('version')}, expected {IR_VERSION}: parse the sources again"
+            raise ValueError(msg)
+        griffe = package_version("griffe")
+        if header.get("griffe") != griffe:
+            msg = f"{self.path} was parsed with griffe {header.get('griffe')}, not {griffe}: parse the sources again"
+            raise ValueError(msg)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def index(self, root: Path) -> dict[str, Path]:
+        """
+        Return the modules of a source root found in the IR, to resolve the modules of configs with `module_keys`.
+
+        :param root: Resolved source root.
+        :returns: Source file of each module, by slash-separated module name.
+        """
+        return self._index.get(str(root), {})
+
+    def module(self, key: ModuleKey) -> Module:
+        """
+        Return a parsed module.
+
+        :param key: The (resolved search path, module name) of the module.
+        :returns: The griffe Module.
+        :raises ValueError: If the module is not in the IR.
+        """
+        if key not in self._modules:
+            try:
+                digest, data = self._entries[key]
+            except KeyError:
+                msg = f"Module '{key[1]}' of {key[0]} is not in {self.path}: parse it again"
+                raise ValueError(msg) from None
+            module = load_module(data)
+            # Identifies the source of the module for the render cache, as when loading it from source
+            module.extra["haystack_pydoc"]["source_hash"] = digest
+            self._modules[key] = module
+        return self._modules[key]
+
+
+def parse_to_ir(
+    config_paths: list[Path], ir_path: str | Path, *, executor: Executor, cache_dir: str | None = None
+) -> int:
+    """
+    Parse the modules of configs and write them to an IR file, to be rendered later by `render_from_ir`.
+
+    :param config_paths: YAML config files.
+    :param ir_path: Path of the IR file.
+    :param executor: Executor parsing the modules.
+    :param cache_dir: Optional parse cache directory.
+    :returns: The number of modules written.
+    """
+    keys = list(dict.fromkeys(key for path in config_paths for key in module_keys(load_config(str(path)))))
+    search_paths = [search_path for search_path, _ in keys]
+    module_names = [module_name for _, module_name in keys]
+    modules = executor.map(parse_module, search_paths, module_names, repeat(cache_dir))
+    write_ir(ir_path, dict(zip(keys, modules)))
+    return len(keys)
+
+
+def render_from_ir(
+    config_paths: list[Path],
+    ir_path: str | Path,
+    output_dir: str | None = None,
+    *,
+    cache_dir: str | None = None,
+    report: Callable[[ConfigResult], None],
+) -> list[ConfigResult]:
+    """
+    Render configs from the modules of an IR file, without reading their sources.
+
+    Modules and patterns of the configs are resolved against the modules in the IR, so configs can select fewer
+    modules than were parsed, or render them differently, but not add modules.
+
+    :param config_paths: YAML config files.
+    :param ir_path: Path of an IR file written by `parse_to_ir`.
+    :param output_dir: Optional directory where output files are written.
+    :param cache_dir: Optional cache directory, where rendered modules are persisted.
+    :param report: Called with the result of each config as soon as it is known.
+    :returns: The result of every config.
+    """
+    ir = IR(ir_path)
+    results = []
+    for path in config_paths:
+        try:
+            config = load_config(str(path), output_dir)
+            render_config(config, [ir.module(key) for key in module_keys(config, ir.index)], cache_dir=cache_dir)
+            result = ConfigResult(str(path), "ok")
+        except Exception as exc:  # noqa: BLE001
+            result = ConfigResult(str(path), "failed", exc)
+        report(result)
+        results.append(result)
+    return results
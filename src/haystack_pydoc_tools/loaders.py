@@ -1,7 +1,45 @@
+import hashlib
+import os
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from typing import Any
 
-from griffe import DataclassesExtension, Extension, Extensions, Module, visit
+from griffe import (
+    Alias,
+    AliasResolutionError,
+    Class,
+    DataclassesExtension,
+    Expr,
+    Extension,
+    Extensions,
+    Module,
+    Object,
+    visit,
+)
+
+from haystack_pydoc_tools import profiling
+from haystack_pydoc_tools.cache import ParseCache
+from haystack_pydoc_tools.config import GRIFFE2MD_DEFAULT_CONFIG
+from haystack_pydoc_tools.discovery import ModuleKey
+from haystack_pydoc_tools.discovery import module_filepath as module_filepath
+from haystack_pydoc_tools.workers import mp_context
+
+try:
+    # Per-class steps of griffe's DataclassesExtension, which otherwise walks every module and class
+    from griffe._internal.extensions.dataclasses import (
+        _dataclass_parameters,
+        _del_members_annotated_as_initvar,
+        _set_dataclass_init,
+    )
+except ImportError:  # pragma: no cover - griffe moved its internals, walk the whole tree instead
+    _set_dataclass_init = _del_members_annotated_as_initvar = _dataclass_parameters = None
+
+
+def _base_name(base: Expr | str) -> str:
+    # Last segment of the base's name, without type arguments: `pkg.Base[T]` gives `Base`
+    return str(base).split("[", 1)[0].rsplit(".", 1)[-1]
 
 
 class DataclassesVisitorExtension(Extension):
@@ -9,51 +47,261 @@ class DataclassesVisitorExtension(Extension):
     Synthesize __init__ for dataclasses when using visit().
 
     griffe's built-in DataclassesExtension only hooks on_package (loader), so it doesn't run with visit().
-    This extension hooks on_module_members (called by the visitor) and delegates to the same logic.
+    This extension hooks on_module_members (called by the visitor) and applies the same logic.
+
+    Instead of walking every member of the module, classes that can be dataclasses are collected as the
+    visitor creates them: decorated classes, and classes with a base named like one of them, since a class
+    inheriting from a dataclass is a dataclass too. Modules are visited on their own, so bases only resolve
+    to classes of the same module: other classes are never dataclasses and are skipped.
     """
 
     def __init__(self) -> None:
         self._inner = DataclassesExtension()
+        # In creation order, outer classes before nested ones, as griffe's walk visits them
+        self._classes: list[Class] = []
+
+    def on_class_instance(self, *, cls: Class, **kwargs: Any) -> None:  # noqa: ARG002, D102
+        if cls.decorators or cls.bases:
+            self._classes.append(cls)
+
+    def _candidates(self) -> list[Class]:
+        names = {cls.name for cls in self._classes if cls.decorators}
+        if not names:
+            return []
+        candidates = {id(cls) for cls in self._classes if cls.decorators}
+        # Subclasses of candidates, and their own subclasses, in any order of definition
+        changed = True
+        while changed:
+            changed = False
+            for cls in self._classes:
+                if id(cls) not in candidates and any(_base_name(base) in names for base in cls.bases):
+                    candidates.add(id(cls))
+                    names.add(cls.name)
+                    changed = True
+        return [cls for cls in self._classes if id(cls) in candidates]
 
     def on_module_members(self, *, mod: Module, **kwargs: Any) -> None:  # noqa: ARG002, D102
-        self._inner.on_package(pkg=mod)
+        with profiling.timed("dataclasses", module=mod.name):
+            # The classes of this module only: an instance reused for another module starts over
+            candidates, self._classes = self._candidates(), []
+            if _set_dataclass_init is None:
+                self._inner.on_package(pkg=mod)
+                return
+            for cls in candidates:
+                # Skips classes redefined later in their scope, which griffe's walk doesn't reach either
+                if "__init__" not in cls.members and cls.parent.members.get(cls.name) is cls:
+                    _set_dataclass_init(cls)
+                    _del_members_annotated_as_initvar(cls)
+            # griffe memoizes the parameters of each dataclass for the life of the process, which would keep
+            # every module visited by a long-running worker in memory. Only the classes of this module use them.
+            if hasattr(_dataclass_parameters, "cache_clear"):
+                _dataclass_parameters.cache_clear()
+
+
+def _keep_name(name: str, filters: list[tuple[re.Pattern, bool]]) -> bool:
+    # Same rules as griffe2md: the last matching filter wins, and names matching none are kept
+    # unless every filter is an inclusion
+    keep = None
+    for regex, exclude in filters:
+        if regex.search(name):
+            keep = not exclude
+    if keep is None:
+        return not filters or any(exclude for _, exclude in filters)
+    return keep
+
+
+def _counts_as_documented(member: Object | Alias) -> bool:
+    # The members griffe's `has_docstrings` looks at
+    try:
+        return (not member.is_imported or member.is_public) and member.has_docstrings
+    except AliasResolutionError:
+        return False
 
 
-def load_modules(search_path: str, modules: list[str]) -> list[Module]:
+# Variable fields of Sphinx docstrings, such as `:ivar name: description`
+_VARIABLE_FIELD = re.compile(r"^\s*:(?:ivar|var|cvar|attr)\s+([^\s:]+)\s*:", re.MULTILINE)
+
+
+def _documented_variables(obj: Object) -> set[str]:
+    # griffe's Sphinx parser reads the annotation of each variable field from the member of that name, in the
+    # object or its bases: such members are kept whatever their name, or parsing the docstring would fail
+    names = set(_VARIABLE_FIELD.findall(obj.docstring.value)) if obj.docstring else set()
+    for member in obj.members.values():
+        if not member.is_alias:
+            names |= _documented_variables(member)
+    return names
+
+
+def _prune(obj: Object, filters: list[tuple[re.Pattern, bool]], documented_only: bool, variables: set[str]) -> int:
+    removed = []
+    for name, member in obj.members.items():
+        # Imports are aliases already. The __init__ of a class gives its signature, even when it is not rendered
+        keep = (
+            member.is_alias
+            or (obj.is_class and name == "__init__")
+            or name in variables
+            or (_keep_name(name, filters) and (not documented_only or member.has_docstrings))
+        )
+        if not keep:
+            removed.append(name)
+    # griffe2md shows an object without a docstring if one of its members has one, even a filtered member:
+    # keep one of them when no other member would still make the object documented
+    if removed and not obj.has_docstring:
+        kept = [member for name, member in obj.members.items() if name not in removed]
+        if not any(map(_counts_as_documented, kept)):
+            witness = next((name for name in removed if _counts_as_documented(obj.members[name])), None)
+            if witness is not None:
+                removed.remove(witness)
+    for name in removed:
+        # Annotations naming the object resolve through the members of their scopes: an alias to the object's
+        # own path keeps them linking to the same anchor, without its docstring, members and signature
+        member = obj.members[name]
+        obj.members[name] = Alias(name, member.path, lineno=member.lineno, endlineno=member.endlineno, parent=obj)
+    pruned = len(removed)
+    for member in obj.members.values():
+        if not member.is_alias:
+            pruned += _prune(member, filters, documented_only, variables)
+    return pruned
+
+
+def prune_members(obj: Object, filters: list[str] | None = None, *, documented_only: bool = False) -> int:
+    """
+    Replace the members that griffe2md filters out when rendering by aliases, so they aren't kept in memory.
+
+    The decisions are the ones griffe2md takes while rendering: a member is kept if its name passes the filters
+    and, with `documented_only`, if it or one of its own members has a docstring. They are taken on the members
+    before any of their own members are pruned, and an object documented only through a filtered member keeps
+    one of them. Members named in the variable fields of a docstring (`:ivar name:`) are kept too, since parsing
+    the docstring reads their annotation. Pruning doesn't change the rendered Markdown.
+
+    :param obj: The module, or any object, whose members are pruned recursively.
+    :param filters: griffe2md name filters, such as `"!^_"`. The default filters of the renderer by default.
+    :param documented_only: Also remove undocumented members, for configs that don't show them.
+    :returns: The number of members replaced, not counting the members of replaced members.
+    """
+    if filters is None:
+        filters = GRIFFE2MD_DEFAULT_CONFIG["filters"]
+    compiled = [(re.compile(name.lstrip("!")), name.startswith("!")) for name in filters]
+    return _prune(obj, compiled, documented_only, _documented_variables(obj))
+
+
+@profiling.profiled
+def _load_module(
+    root: Path, module_name: str, parent: Module | None, cache: ParseCache | None, documented_only: bool = False
+) -> Module:
+    filepath = module_filepath(root, module_name)
+    with profiling.timed("read", module=module_name):
+        code = filepath.read_text()
+
+    key = ""
+    mod = None
+    if cache:
+        key = cache.key(module_name, code, parent=parent.name if parent else None, documented_only=documented_only)
+        mod = cache.get(key)
+    if mod is None:
+        with profiling.timed("visit", module=module_name):
+            mod = visit(
+                module_name,
+                filepath=filepath,
+                code=code,
+                docstring_parser="sphinx",
+                # Fresh extensions per module: the dataclass extension runs on each module's members
+                extensions=Extensions(DataclassesVisitorExtension()),
+                parent=parent,
+            )
+        # Detach from parent so the module path stays short for rendering
+        mod.parent = None
+        # Before caching, so that filtered members are neither stored nor sent to the renderers
+        with profiling.timed("prune", module=module_name):
+            prune_members(mod, documented_only=documented_only)
+        if cache:
+            cache.put(key, mod)
+    # Identifies the source of the module for the render cache
+    mod.extra["haystack_pydoc"]["source_hash"] = hashlib.sha256(code.encode("utf-8")).hexdigest()
+    mod.extra["haystack_pydoc"]["documented_only"] = documented_only
+    return mod
+
+
+def can_render(module: Module, *, documented_only: bool) -> bool:
+    """
+    Tell if a loaded module can be rendered by a config, given the members pruned when loading it.
+
+    :param module: A module returned by `load_modules`.
+    :param documented_only: Whether the config only shows documented objects.
+    :returns: False if undocumented members the config shows were pruned.
+    """
+    return documented_only or not module.extra["haystack_pydoc"].get("documented_only", False)
+
+
+def load_modules(  # noqa: PLR0913
+    search_path: str,
+    modules: list[str],
+    *,
+    cache: ParseCache | None = None,
+    workers: int | None = 1,
+    executor: Executor | None = None,
+    documented_only: bool = False,
+) -> list[Module]:
     """
     Load Python modules using griffe.
 
     Uses griffe.visit() to parse source files directly, which also works with namespace packages
-    (such as Haystack Core Integrations).
+    (such as Haystack Core Integrations). Members excluded by the renderer's filters, such as private
+    members, are removed from the loaded modules, see `prune_members`.
 
     :param search_path: Filesystem path to the source root (e.g. "../src").
     :param modules: Module names (dotted or slash-separated) relative to search_path.
+    :param cache: Optional parse cache. Modules whose source is already in the cache are not parsed again.
+    :param workers: Number of worker processes parsing modules in parallel. 1 parses in the current process,
+        None uses one worker per CPU.
+    :param executor: Executor parsing the modules, instead of a pool of `workers` processes.
+    :param documented_only: Also remove undocumented members, when the modules are only rendered by configs
+        that don't show them.
     :returns: Loaded griffe Module objects, in alphabetical order.
     """
-    root = Path(search_path).resolve()
-    extensions = Extensions(DataclassesVisitorExtension())
+    root = str(Path(search_path).resolve())
+    keys = [(root, module_name) for module_name in sorted(modules)]
+    return load_module_keys(keys, cache=cache, workers=workers, executor=executor, documented_only=documented_only)
+
 
-    # If root is a proper package, provide parent context so griffe doesn't confuse
+def load_module_keys(
+    keys: list[ModuleKey],
+    *,
+    cache: ParseCache | None = None,
+    workers: int | None = 1,
+    executor: Executor | None = None,
+    documented_only: bool = False,
+) -> list[Module]:
+    """
+    Load Python modules from one or more source roots using griffe.
+
+    :param keys: The (resolved search path, module name) of each module, as returned by `config.module_keys`.
+    :param cache: Optional parse cache. Modules whose source is already in the cache are not parsed again.
+    :param workers: Number of worker processes parsing modules in parallel. 1 parses in the current process,
+        None uses one worker per CPU.
+    :param executor: Executor parsing the modules, instead of a pool of `workers` processes.
+    :param documented_only: Also remove undocumented members, see `load_modules`.
+    :returns: Loaded griffe Module objects, in the order of `keys`.
+    """
+    # If a root is a proper package, provide parent context so griffe doesn't confuse
     # module names (e.g. "dataclasses") with stdlib modules of the same name.
-    parent = Module(name=root.name, filepath=root) if (root / "__init__.py").is_file() else None
-
-    results: list[Module] = []
-    for module_name in sorted(modules):
-        filepath = root / module_name.replace(".", "/")
-        if (filepath / "__init__.py").is_file():
-            filepath = filepath / "__init__.py"
-        else:
-            filepath = filepath.with_suffix(".py")
-        mod = visit(
-            module_name,
-            filepath=filepath,
-            code=filepath.read_text(),
-            docstring_parser="sphinx",
-            extensions=extensions,
-            parent=parent,
-        )
-        # Detach from parent so the module path stays short for rendering
-        mod.parent = None
-        results.append(mod)
+    parents: dict[str, Module | None] = {}
+    for root, _ in keys:
+        if root not in parents:
+            path = Path(root)
+            parents[root] = Module(name=path.name, filepath=path) if (path / "__init__.py").is_file() else None
+
+    roots = [Path(root) for root, _ in keys]
+    module_names = [module_name for _, module_name in keys]
+    module_parents = [parents[root] for root, _ in keys]
+    args = (roots, module_names, module_parents, repeat(cache), repeat(documented_only))
+    if executor is not None:
+        return list(executor.map(_load_module, *args))
+
+    workers = min(workers or os.cpu_count() or 1, len(keys))
+    if workers <= 1:
+        return list(map(_load_module, *args))
 
-    return results
+    # griffe parsing is pure Python and holds the GIL, so modules are parsed in separate processes
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context()) as pool:
+        return list(pool.map(_load_module, *args))
@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from haystack_pydoc_tools.__about__ import __version__
+from haystack_pydoc_tools.config import GRIFFE2MD_DEFAULT_CONFIG, DocsConfig, module_keys
+from haystack_pydoc_tools.discovery import module_filepath
+from haystack_pydoc_tools.utils import hash_file, package_version, write_text_if_changed
+
+# Bump when the manifest layout changes, so that old manifests never match.
+MANIFEST_VERSION = 1
+
+
+def manifest_path(filename: str) -> Path:
+    """Return the path of the manifest recorded for an output file (a hidden file next to it)."""
+    output = Path(filename)
+    return output.with_name(f".{output.name}.manifest.json")
+
+
+def build_manifest(config: DocsConfig) -> dict[str, Any]:
+    """
+    Describe every input that affects the output of a config.
+
+    :param config: The resolved config.
+    :returns: A JSON-serializable manifest.
+    """
+    sources = {}
+    for search_path, module_name in module_keys(config):
+        filepath = module_filepath(Path(search_path), module_name)
+        sources[str(filepath)] = hash_file(filepath)
+
+    griffe2md_config = {**GRIFFE2MD_DEFAULT_CONFIG, "show_if_no_docstring": config.show_if_no_docstring}
+    return {
+        "version": MANIFEST_VERSION,
+        "tool": __version__,
+        "griffe": package_version("griffe"),
+        "griffe2md": package_version("griffe2md"),
+        # Format signatures and pages: upgrading them changes the output too
+        "black": package_version("black"),
+        "mdformat": package_version("mdformat"),
+        "config": hash_file(Path(config.path)),
+        "sources": sources,
+        "renderer": {**config.renderer_settings(), "griffe2md": griffe2md_config},
+    }
+
+
+def is_up_to_date(filename: str, manifest: dict[str, Any]) -> bool:
+    """
+    Check whether an output file was generated from the inputs described by `manifest`.
+
+    The output must exist and still match the hash recorded when it was written.
+
+    :param filename: Path of the output Markdown file.
+    :param manifest: Manifest of the current inputs, as returned by `build_manifest`.
+    :returns: True if the output does not need to be regenerated.
+    """
+    output = Path(filename)
+    try:
+        recorded = json.loads(manifest_path(filename).read_text(encoding="utf-8"))
+        output_hash = recorded.pop("output")
+        return recorded == manifest and hash_file(output) == output_hash
+    except (FileNotFoundError, ValueError, KeyError, AttributeError):
+        return False
+
+
+def write_manifest(filename: str, manifest: dict[str, Any]) -> None:
+    """
+    Record the manifest of a freshly written output file.
+
+    :param filename: Path of the output Markdown file.
+    :param manifest: Manifest of the inputs used to generate it.
+    """
+    recorded = {**manifest, "output": hash_file(Path(filename))}
+    write_text_if_changed(manifest_path(filename), json.dumps(recorded, indent=2, sort_keys=True))
@@ -0,0 +1,70 @@
+import re
+import sys
+from collections.abc import Callable
+from typing import Any
+
+from haystack_pydoc_tools.workers import picklable_errors
+
+_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_size(value: str) -> int:
+    """
+    Parse a memory size, such as `512M`, `1.5G` or `4GB`, in binary units.
+
+    :param value: A number of bytes, optionally followed by K, M, G or T.
+    :returns: The size in bytes.
+    :raises ValueError: If the size is not valid.
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*", value, re.IGNORECASE)
+    if not match:
+        msg = f"Invalid size '{value}', expected a number of bytes or a size such as 512M or 4G"
+        raise ValueError(msg)
+    return int(float(match[1]) * _UNITS[match[2].upper()])
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the peak resident set size of the current process to its current size.
+
+    :returns: True on success. Only supported on Linux: elsewhere the peak covers the whole life of the process.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def peak_rss() -> int | None:
+    """Return the peak resident set size of the current process in bytes, or None if it can't be measured."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        # Windows
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+@picklable_errors
+def measured(fn: Callable[..., Any], *args: Any) -> tuple[Any, int | None]:
+    """
+    Run a task and measure the peak RSS of the process running it.
+
+    :param fn: Function to run, picklable to run it in a worker process.
+    :param args: Positional arguments of `fn`.
+    :returns: The result of `fn` and the peak RSS in bytes while it ran, or None if it can't be measured.
+    """
+    reset_peak_rss()
+    result = fn(*args)
+    return result, peak_rss()
@@ -0,0 +1,72 @@
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    A cleanup rule applied to rendered Markdown: every match of `pattern` is replaced with `replacement`.
+
+    Patterns are compiled with `re.MULTILINE` and must not match across lines, since documents are processed
+    in chunks of whole lines. `replacement` is a `re.sub` template, so it can refer to groups as `\\1`.
+    """
+
+    pattern: str
+    replacement: str
+    # A literal substring found in every match: chunks without it are skipped without running the regex
+    trigger: str | None = None
+    regex: re.Pattern = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        try:
+            regex = re.compile(self.pattern, re.MULTILINE)
+        except re.error as error:
+            msg = f"Invalid post-processing pattern '{self.pattern}': {error}"
+            raise ValueError(msg) from error
+        object.__setattr__(self, "regex", regex)
+
+    def apply(self, markdown: str) -> str:
+        """Apply the rule to a chunk of whole lines."""
+        if self.trigger is not None and self.trigger not in markdown:
+            return markdown
+        return self.regex.sub(self.replacement, markdown)
+
+
+DEFAULT_RULES = (
+    # Remove backticks wrapping headers (hardcoded in griffe2md)
+    Rule(r"^(#{1,6}) `(.+?)`$", r"\1 \2", trigger=" `"),
+    # Remove anchor-only markdown links (not proper URLs)
+    Rule(r"\[([^\]]+)\]\(#[^)]+\)", r"\1", trigger="](#"),
+)
+
+
+class Pipeline:
+    """
+    Post-processing rules applied, in order, to each chunk of rendered Markdown.
+
+    Chunks are small (the Markdown of one module), so applying each rule as its own C-level regex pass over a chunk
+    is cheaper than a single pass with all rules fused into one pattern: an alternation of patterns defeats the
+    regex engine's fast search for literal prefixes, and dispatching matches to the right rule needs a Python call
+    per match. Rules whose trigger does not occur in a chunk are skipped.
+    """
+
+    def __init__(self, rules: Iterable[Rule | dict[str, str]] = ()) -> None:
+        """
+        Create a pipeline.
+
+        :param rules: Rules applied after the default ones, as `Rule` objects or as dicts of `Rule` fields.
+        """
+        extra = [rule if isinstance(rule, Rule) else Rule(**rule) for rule in rules]
+        self.rules = (*DEFAULT_RULES, *extra)
+
+    def __call__(self, markdown: str) -> str:
+        """
+        Clean up a chunk of whole lines of rendered Markdown.
+
+        :param markdown: Rendered Markdown.
+        :returns: The cleaned up Markdown.
+        """
+        for rule in self.rules:
+            markdown = rule.apply(markdown)
+        return markdown
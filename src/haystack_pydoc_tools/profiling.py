@@ -0,0 +1,160 @@
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import time
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, TypeVar
+
+# Bump when the layout of the JSON report changes.
+REPORT_VERSION = 1
+
+REPORT_FILENAME = "profile.json"
+
+# Build stages, in the order they run. "dataclasses" runs inside "visit", its time is also counted there.
+STAGES = ("yaml", "read", "visit", "dataclasses", "prune", "render", "postprocess", "write")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_directory: Path | None = None
+_profiler: cProfile.Profile | None = None
+_profiling = False
+_labels: ContextVar[dict[str, str] | None] = ContextVar("labels", default=None)
+
+
+def enable(directory: str | Path, *, cprofile: bool = False) -> None:
+    """
+    Record the timings of the current process in `directory`.
+
+    Called in the main process and, as an executor initializer, in every worker process.
+
+    :param directory: Directory where timings and cProfile dumps are written.
+    :param cprofile: Also profile the build tasks with cProfile, one dump per process.
+    """
+    global _directory, _profiler  # noqa: PLW0603
+    _directory = Path(directory)
+    _profiler = cProfile.Profile() if cprofile else None
+
+
+def start(directory: str | Path, *, cprofile: bool = False) -> None:
+    """
+    Enable profiling in the main process, removing the records of a previous run from `directory`.
+
+    :param directory: Directory where timings and cProfile dumps are written. Created if missing.
+    :param cprofile: Also profile the build tasks with cProfile, one dump per process.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for path in [*directory.glob("timings-*.jsonl"), *directory.glob("worker-*.prof")]:
+        path.unlink()
+    enable(directory, cprofile=cprofile)
+
+
+@contextlib.contextmanager
+def labels(**values: str) -> Iterator[None]:
+    """Attach labels, such as the config being built, to the timings recorded in this context."""
+    token = _labels.set({**(_labels.get() or {}), **values})
+    try:
+        yield
+    finally:
+        _labels.reset(token)
+
+
+@contextlib.contextmanager
+def timed(stage: str, **values: str) -> Iterator[None]:
+    """
+    Record the time spent in this context, when profiling is enabled.
+
+    :param stage: One of `STAGES`.
+    :param values: Labels of the record, such as the module being processed.
+    """
+    if _directory is None:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        record = {
+            "stage": stage,
+            "seconds": time.perf_counter() - start_time,
+            "pid": os.getpid(),
+            **(_labels.get() or {}),
+            **values,
+        }
+        with open(_directory / f"timings-{os.getpid()}.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def profiled(fn: F) -> F:
+    """Run a build task under this process' cProfile profiler, when enabled, and dump its stats."""
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        global _profiling  # noqa: PLW0603
+        # Nested tasks (such as a task loading modules in the calling process) are already profiled
+        if _profiler is None or _directory is None or _profiling:
+            return fn(*args, **kwargs)
+        _profiling = True
+        _profiler.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _profiler.disable()
+            _profiling = False
+            _profiler.dump_stats(_directory / f"worker-{os.getpid()}.prof")
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _add(totals: dict[str, dict[str, float]], name: str, stage: str, seconds: float) -> None:
+    entry = totals.setdefault(name, {"total": 0.0})
+    entry[stage] = entry.get(stage, 0.0) + seconds
+    # "dataclasses" is part of "visit", don't count it twice
+    if stage != "dataclasses":
+        entry["total"] += seconds
+
+
+def _slowest_first(totals: dict[str, dict[str, float]]) -> dict[str, dict[str, float]]:
+    return dict(sorted(totals.items(), key=lambda item: item[1]["total"], reverse=True))
+
+
+def write_report(directory: str | Path, wall_seconds: float) -> Path:
+    """
+    Aggregate the timings recorded by every process into a JSON report.
+
+    The report lists the total time of each stage, then the time of each config and each module by stage,
+    slowest first.
+
+    :param directory: Directory passed to `start`.
+    :param wall_seconds: Wall-clock duration of the build.
+    :returns: Path of the report.
+    """
+    directory = Path(directory)
+    stages: dict[str, float] = {}
+    configs: dict[str, dict[str, float]] = {}
+    modules: dict[str, dict[str, float]] = {}
+    for path in sorted(directory.glob("timings-*.jsonl")):
+        for line in path.read_text(encoding="utf-8").splitlines():
+            record = json.loads(line)
+            stage, seconds = record["stage"], record["seconds"]
+            stages[stage] = stages.get(stage, 0.0) + seconds
+            if "config" in record:
+                _add(configs, record["config"], stage, seconds)
+            if "module" in record:
+                _add(modules, record["module"], stage, seconds)
+
+    report = {
+        "version": REPORT_VERSION,
+        "wall_seconds": wall_seconds,
+        "stages": {stage: stages[stage] for stage in STAGES if stage in stages},
+        "configs": _slowest_first(configs),
+        "modules": _slowest_first(modules),
+        "cprofile": sorted(str(path) for path in directory.glob("worker-*.prof")),
+    }
+    report_path = directory / REPORT_FILENAME
+    report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return report_path
@@ -1,52 +1,19 @@
-import re
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
 from pathlib import Path
 
+import mdformat
 from griffe import Module
-from griffe2md import render_object_docs
-
-GRIFFE2MD_DEFAULT_CONFIG = {
-    # Heading structure
-    "heading_level": 2,
-    "show_root_heading": True,
-    "show_root_full_path": True,
-    "show_root_members_full_path": False,
-    "show_object_full_path": False,
-    # Signatures
-    "separate_signature": True,
-    "show_signature": True,
-    "show_signature_annotations": True,
-    "signature_crossrefs": False,
-    "line_length": 80,
-    # Members
-    "merge_init_into_class": False,
-    "inherited_members": True,
-    "filters": ["!^_", "^__init__$"],
-    "members": None,
-    "members_order": "source",
-    "group_by_category": False,
-    "show_submodules": False,
-    "show_bases": True,
-    "show_category_heading": False,
-    # Docstring rendering
-    "docstring_section_style": "list",
-    "show_docstring_attributes": True,
-    "show_docstring_description": True,
-    "show_docstring_examples": True,
-    "show_docstring_other_parameters": True,
-    "show_docstring_parameters": True,
-    "show_docstring_raises": True,
-    "show_docstring_receives": True,
-    "show_docstring_returns": True,
-    "show_docstring_warns": True,
-    "show_docstring_yields": True,
-    "show_docstring_classes": True,
-    "show_docstring_functions": True,
-    "show_docstring_modules": True,
-    # Display
-    "show_if_no_docstring": False,
-    "summary": False,
-    "annotations_path": "brief",
-}
+from griffe2md import do_format_code, prepare_context, prepare_env
+from jinja2 import Environment
+
+from haystack_pydoc_tools import profiling
+from haystack_pydoc_tools.cache import RenderCache
+from haystack_pydoc_tools.config import GRIFFE2MD_DEFAULT_CONFIG as GRIFFE2MD_DEFAULT_CONFIG
+from haystack_pydoc_tools.model import DocModule
+from haystack_pydoc_tools.postprocessing import Pipeline, Rule
+from haystack_pydoc_tools.signatures import do_format_signature
+from haystack_pydoc_tools.utils import replace_if_changed, temp_path
 
 DOCUSAURUS_FRONTMATTER = """---
 title: "{title}"
@@ -57,36 +24,146 @@ slug: "/{id}"
 
 """
 
-ANCHOR_LINK_RE = re.compile(r"\[([^\]]+)\]\(#[^)]+\)")
-HEADING_BACKTICKS_RE = re.compile(r"^(#{1,6}) `(.+?)`$", re.MULTILINE)
+# "black" formats long signatures with black (griffe2md's default), "fast" uses a built-in line wrapper
+SIGNATURE_FORMATTERS = ("black", "fast")
 
 
-def render_docusaurus(  # noqa: PLR0913
-    modules: list[Module],
+@lru_cache(maxsize=None)
+def _env(signature_formatter: str) -> Environment:
+    # griffe2md's `render_object_docs` prepares a new environment, recompiling its templates, for every object
+    env = prepare_env()
+    if signature_formatter == "fast":
+        env.filters["format_signature"] = do_format_signature
+    return env
+
+
+def warm_up() -> None:
+    """
+    Compile the griffe2md templates of the default signature formatter and load black.
+
+    Called when a worker process starts, so that its first render doesn't pay for them, and by a `Builder` or
+    a server rendering in threads of the calling process, so that black is not imported by several threads at once.
+    """
+    env = _env("black")
+    for name in env.list_templates(extensions=["jinja"]):
+        env.get_template(name)
+    # black is imported by the first signature too long for its line
+    do_format_code("def f(a, b): pass", 1)
+
+
+def render_module(module: Module | DocModule, config: dict, signature_formatter: str = "black") -> str:
+    """
+    Render a griffe module to Markdown with griffe2md.
+
+    :param module: The module to render, as loaded or in the compact documentation model.
+    :param config: griffe2md config.
+    :param signature_formatter: "black" to format long signatures with black, "fast" to use the built-in formatter.
+    :returns: The rendered Markdown.
+    """
+    if signature_formatter not in SIGNATURE_FORMATTERS:
+        msg = f"Unknown signature_formatter '{signature_formatter}', choose between {', '.join(SIGNATURE_FORMATTERS)}."
+        raise ValueError(msg)
+    if isinstance(module, DocModule):
+        module = module.to_griffe()
+    # Same steps as griffe2md's `render_object_docs(module, config, format_md=True)`, with a reused environment
+    context = prepare_context(module, config)
+    rendered = _env(signature_formatter).get_template(f"{module.kind.value}.md.jinja").render(**context)
+    return mdformat.text(rendered, extensions=config.get("mdformat_extensions", []))
+
+
+def _render_cached(
+    module: Module | DocModule, config: dict, signature_formatter: str, render_cache: RenderCache | None
+) -> str:
+    key = render_cache.key(module, config, signature_formatter) if render_cache else None
+    rendered = render_cache.get(key) if key else None
+    if rendered is None:
+        with profiling.timed("render", module=module.name):
+            rendered = render_module(module, config, signature_formatter)
+        if key:
+            render_cache.put(key, rendered)
+    return rendered
+
+
+def iter_docusaurus(  # noqa: PLR0913
+    modules: Iterable[Module | DocModule],
     *,
     title: str,
     doc_id: str,
     description: str,
-    filename: str,
     show_if_no_docstring: bool = False,
     skip_empty_modules: bool = True,
-) -> None:
-    """Render griffe modules to Docusaurus-compatible Markdown and write to file."""
+    signature_formatter: str = "black",
+    render_cache: RenderCache | None = None,
+    postprocess_rules: Iterable[Rule | dict[str, str]] = (),
+) -> Iterator[str]:
+    """
+    Render griffe modules to Docusaurus-compatible Markdown, one chunk at a time.
+
+    The front matter comes first, then the post-processed Markdown of each module, each module rendered when
+    its chunk is requested. Takes the same arguments as `render_docusaurus`, except the output file.
+    """
+    postprocess = Pipeline(postprocess_rules)
     config = {**GRIFFE2MD_DEFAULT_CONFIG, "show_if_no_docstring": show_if_no_docstring}
+    yield postprocess(DOCUSAURUS_FRONTMATTER.format(title=title, id=doc_id, description=description))
+    for module in modules:
+        rendered = _render_cached(module, config, signature_formatter, render_cache)
+        if skip_empty_modules and not rendered.strip():
+            continue
+        with profiling.timed("postprocess"):
+            rendered = postprocess(rendered)
+        # Modules are separated by a blank line
+        yield "\n"
+        yield rendered
 
-    parts = [DOCUSAURUS_FRONTMATTER.format(title=title, id=doc_id, description=description)]
 
-    for module in modules:
-        rendered = render_object_docs(module, config, format_md=True)
-        if rendered.strip() or not skip_empty_modules:
-            parts.append(rendered)
+def render_docusaurus(  # noqa: PLR0913
+    modules: Iterable[Module | DocModule],
+    *,
+    title: str,
+    doc_id: str,
+    description: str,
+    filename: str,
+    show_if_no_docstring: bool = False,
+    skip_empty_modules: bool = True,
+    signature_formatter: str = "black",
+    render_cache: RenderCache | None = None,
+    postprocess_rules: Iterable[Rule | dict[str, str]] = (),
+) -> bool:
+    """
+    Render griffe modules to Docusaurus-compatible Markdown and write to file.
 
-    output = "\n".join(parts)
+    The output is streamed: the Markdown of each module is post-processed and written as soon as it is rendered,
+    so only one module's Markdown is held in memory. Pass a generator as `modules` to also load them one at a time.
+    The file is written next to `filename` and moved in place once complete, so a failed render never
+    leaves a truncated output. If the existing output already has the same content, it is left untouched
+    (keeping its mtime), so that downstream incremental builds don't see a change.
 
-    # Remove backticks wrapping headers (hardcoded in griffe2md)
-    output = HEADING_BACKTICKS_RE.sub(r"\1 \2", output)
+    Pass a `render_cache` to reuse the Markdown of modules already rendered with the same settings.
+    `postprocess_rules` are applied to the Markdown after the default cleanup rules.
 
-    # Remove anchor-only markdown links (not proper URLs)
-    output = ANCHOR_LINK_RE.sub(r"\1", output)
+    Returns True if the output file was written, False if it was unchanged.
+    """
+    output = Path(filename)
+    chunks = iter_docusaurus(
+        modules,
+        title=title,
+        doc_id=doc_id,
+        description=description,
+        show_if_no_docstring=show_if_no_docstring,
+        skip_empty_modules=skip_empty_modules,
+        signature_formatter=signature_formatter,
+        render_cache=render_cache,
+        postprocess_rules=postprocess_rules,
+    )
 
-    Path(filename).write_text(output, encoding="utf-8")
+    tmp = temp_path(output)
+    try:
+        # Unlike tempfile.mkstemp, open() creates the file with the usual permissions (as set by the umask)
+        with open(tmp, "x", encoding="utf-8") as f:
+            for chunk in chunks:
+                with profiling.timed("write"):
+                    f.write(chunk)
+        return replace_if_changed(tmp, output)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
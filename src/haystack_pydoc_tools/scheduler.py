@@ -0,0 +1,139 @@
+import heapq
+import itertools
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, Executor, Future, wait
+from pathlib import Path
+from typing import Any
+
+from haystack_pydoc_tools.config import DocsConfig, module_keys
+from haystack_pydoc_tools.discovery import module_filepath
+
+# Fixed cost of a module, in source bytes: loading, visiting and rendering a module costs more than its size
+MODULE_OVERHEAD = 4096
+
+# Resident memory of an idle worker process, with the dependencies loaded and the templates compiled
+WORKER_MEMORY = 64 * 1024**2
+
+# Memory needed per unit of cost: a griffe tree takes about ten times the size of its source, plus rendering
+MEMORY_PER_COST = 12
+
+
+def source_size(search_path: str, module_name: str) -> int:
+    """Return the size of a module's source file in bytes, or 0 if it can't be found."""
+    try:
+        return module_filepath(Path(search_path), module_name).stat().st_size
+    except OSError:
+        return 0
+
+
+def estimate_cost(config: DocsConfig) -> int:
+    """
+    Estimate the cost of building a config, from its total source bytes and module count.
+
+    :param config: The resolved config.
+    :returns: An estimate in source bytes, only meaningful relative to other configs.
+    """
+    return sum(source_size(search_path, name) + MODULE_OVERHEAD for search_path, name in module_keys(config))
+
+
+def estimate_memory(cost: int) -> int:
+    """
+    Estimate the peak memory of a worker process running a task.
+
+    :param cost: Estimated cost of the task, as returned by `estimate_cost`.
+    :returns: An estimate in bytes.
+    """
+    return WORKER_MEMORY + MEMORY_PER_COST * cost
+
+
+class SerialExecutor(Executor):
+    """Executor running every task in the calling thread, as soon as it is submitted."""
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:  # noqa: D102
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:  # noqa: BLE001
+            future.set_exception(exc)
+        return future
+
+
+class Scheduler:
+    """
+    Run tasks on an executor, highest cost first.
+
+    Tasks are queued by cost and only `slots` of them are handed to the executor at a time, so that
+    an expensive task queued late still runs before cheaper ones queued earlier. Tasks can be queued
+    while iterating over `completed`.
+
+    With a memory budget, tasks also wait until the estimated memory of the running tasks leaves room
+    for theirs. A task estimated above the whole budget runs alone.
+
+    When the executor breaks, for instance because a worker process was killed, the running tasks and
+    every task submitted afterwards complete with the executor's error, like tasks that failed.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        slots: int,
+        memory_budget: int | None = None,
+        on_start: Callable[[Any], None] | None = None,
+    ) -> None:
+        """
+        Create a scheduler.
+
+        :param executor: Executor running the tasks.
+        :param slots: Maximum number of tasks handed to the executor at a time, usually its worker count.
+        :param memory_budget: Maximum estimated memory of the tasks running at a time, in bytes. Unlimited by default.
+        :param on_start: Called with the tag of each task right before it is handed to the executor.
+        """
+        self.executor = executor
+        self.slots = max(slots, 1)
+        self.memory_budget = memory_budget
+        self.on_start = on_start
+        self._queue: list[tuple[int, int, Any, Callable[..., Any], tuple, int]] = []
+        self._counter = itertools.count()
+        self._running: dict[Future, tuple[Any, int]] = {}
+        self._memory = 0
+
+    def submit(self, cost: int, tag: Any, fn: Callable[..., Any], *args: Any, memory: int = 0) -> None:
+        """
+        Queue a task.
+
+        :param cost: Estimated cost of the task. Tasks with equal cost run in submission order.
+        :param tag: Returned with the task's future by `completed`.
+        :param fn: Function to run.
+        :param args: Positional arguments of `fn`.
+        :param memory: Estimated memory of the task in bytes, counted against the memory budget.
+        """
+        heapq.heappush(self._queue, (-cost, next(self._counter), tag, fn, args, memory))
+
+    def _fits(self, memory: int) -> bool:
+        if self.memory_budget is None or not self._running:
+            return True
+        return self._memory + memory <= self.memory_budget
+
+    def _fill(self) -> None:
+        # Smaller tasks don't overtake a task waiting for memory, or it could wait until the end of the build
+        while self._queue and len(self._running) < self.slots and self._fits(self._queue[0][5]):
+            _, _, tag, fn, args, memory = heapq.heappop(self._queue)
+            if self.on_start:
+                self.on_start(tag)
+            try:
+                future = self.executor.submit(fn, *args)
+            except BrokenExecutor as exc:
+                future = Future()
+                future.set_exception(exc)
+            self._running[future] = (tag, memory)
+            self._memory += memory
+
+    def completed(self) -> Iterator[tuple[Any, Future]]:
+        """Yield `(tag, future)` for every task as it finishes, until no task is queued or running."""
+        while self._queue or self._running:
+            self._fill()
+            done, _ = wait(self._running, return_when=FIRST_COMPLETED)
+            for future in done:
+                tag, memory = self._running.pop(future)
+                self._memory -= memory
+                yield tag, future
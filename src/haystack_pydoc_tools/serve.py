@@ -0,0 +1,213 @@
+import asyncio
+import json
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import BrokenExecutor, Executor
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote, urlsplit
+
+from haystack_pydoc_tools.build import ModuleKey, module_keys, parse_module, render_markdown
+from haystack_pydoc_tools.cache import ModuleCache
+from haystack_pydoc_tools.config import DocsConfig, load_config
+from haystack_pydoc_tools.discovery import module_filepath, module_index
+from haystack_pydoc_tools.loaders import can_render
+from haystack_pydoc_tools.model import DocModule
+from haystack_pydoc_tools.scheduler import SerialExecutor
+from haystack_pydoc_tools.utils import Stamp, file_stamp
+
+# Identifies the inputs of a page: (config path, config stamp, stamp of each module)
+PageKey = tuple[str, Stamp, tuple[Stamp, ...]]
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+
+
+class DocsServer:
+    """
+    Render the Markdown of configs on request, keeping parsed modules and rendered pages in memory.
+
+    Each page is rendered again only when its YAML config or the source of one of its modules changed,
+    and only the changed modules are parsed again. Parsing and rendering run on the executor, so the
+    event loop keeps answering other requests, and concurrent requests for the same page share a render.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        target: Path,
+        *,
+        executor: Executor,
+        new_executor: Callable[[], Executor] | None = None,
+        cache_dir: str | None = None,
+        max_pages: int = 128,
+        max_modules: int = 4096,
+    ) -> None:
+        """
+        Create a server. Nothing is parsed until a page is requested.
+
+        :param target: YAML config file or directory of config files, served by file name without extension.
+        :param executor: Executor parsing and rendering modules, usually a process pool. With a `SerialExecutor`,
+            modules are parsed and rendered in threads of the server process instead.
+        :param new_executor: Creates an executor replacing `executor` once it is broken, for instance because
+            a worker process was killed. The render that found it broken fails, later renders use the new one.
+        :param cache_dir: Optional directory where parsed and rendered modules are persisted.
+        :param max_pages: Maximum number of rendered pages kept in memory, least recently used first out.
+        :param max_modules: Maximum number of parsed modules kept in memory.
+        """
+        self.target = target
+        self.executor = executor
+        self.new_executor = new_executor
+        self.cache_dir = cache_dir
+        self.max_pages = max_pages
+        self.module_cache = ModuleCache(max_modules)
+        self._pages: OrderedDict[str, tuple[PageKey, str]] = OrderedDict()
+        self._pending: dict[PageKey, asyncio.Future[str]] = {}
+
+    def config_paths(self) -> dict[str, Path]:
+        """Return the config files currently served, by page name."""
+        paths = sorted(self.target.glob("*.yml")) if self.target.is_dir() else [self.target]
+        return {path.stem: path for path in paths}
+
+    @staticmethod
+    def _resolve(path: Path) -> tuple[DocsConfig, list[ModuleKey], PageKey]:
+        # Reads the config and stats the sources: run in a thread, off the event loop
+        stamp = file_stamp(path)
+        module_index.cache_clear()
+        config = load_config(str(path))
+        keys = module_keys(config)
+        stamps = tuple(file_stamp(module_filepath(Path(root), name)) for root, name in keys)
+        return config, keys, (str(path), stamp, stamps)
+
+    async def page(self, name: str) -> str:
+        """
+        Return the Markdown of a config, rendering it if its inputs changed since it was last requested.
+
+        :param name: File name of the config, without extension.
+        :returns: The Markdown that a build would write for the config.
+        :raises KeyError: If no config has this name.
+        """
+        path = self.config_paths()[name]
+        config, keys, page_key = await asyncio.to_thread(self._resolve, path)
+        cached = self._pages.get(page_key[0])
+        if cached is not None and cached[0] == page_key:
+            self._pages.move_to_end(page_key[0])
+            return cached[1]
+
+        if page_key not in self._pending:
+            task = asyncio.ensure_future(self._render(config, keys, page_key[2]))
+            self._pending[page_key] = task
+            task.add_done_callback(lambda _: self._pending.pop(page_key, None))
+        # A client disconnecting does not cancel a render other clients may be waiting for
+        markdown = await asyncio.shield(self._pending[page_key])
+
+        self._pages[page_key[0]] = (page_key, markdown)
+        self._pages.move_to_end(page_key[0])
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return markdown
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        executor = self.executor
+        if isinstance(executor, SerialExecutor):
+            # Would run the task on the event loop, which then stops answering requests until it is done
+            return await asyncio.to_thread(fn, *args)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except BrokenExecutor:
+            # Replaced once, by the first of the renders it failed
+            if self.new_executor is not None and self.executor is executor:
+                self.executor = self.new_executor()
+                executor.shutdown(wait=False)
+            raise
+
+    async def _render(self, config: DocsConfig, keys: list[ModuleKey], stamps: tuple[Stamp, ...]) -> str:
+        documented_only = not config.show_if_no_docstring
+        modules: dict[ModuleKey, DocModule | None] = {
+            key: self.module_cache.get(key, stamp) for key, stamp in zip(keys, stamps)
+        }
+        # A module pruned for pages hiding undocumented objects is parsed again for a page showing them
+        missing = [
+            (key, stamp)
+            for key, stamp in zip(keys, stamps)
+            if modules[key] is None or not can_render(modules[key], documented_only=documented_only)
+        ]
+        parsed = await asyncio.gather(
+            *(self._run(parse_module, *key, self.cache_dir, documented_only) for key, _ in missing)
+        )
+        for (key, stamp), module in zip(missing, parsed):
+            self.module_cache.put(key, stamp, module)
+            modules[key] = module
+        return await self._run(render_markdown, config, [modules[key] for key in keys], self.cache_dir)
+
+    async def respond(self, method: str, target: str) -> tuple[HTTPStatus, str, str]:
+        """
+        Answer a request.
+
+        `GET /` lists the pages as JSON, `GET /<name>` returns the Markdown of the config `<name>.yml`.
+
+        :param method: HTTP method.
+        :param target: Request target, such as `/generators_api`.
+        :returns: The status, content type and body of the response.
+        """
+        if method != "GET":
+            return HTTPStatus.METHOD_NOT_ALLOWED, "text/plain", "Only GET requests are supported\n"
+        name = unquote(urlsplit(target).path).strip("/")
+        if not name:
+            pages = {name: f"/{name}" for name in self.config_paths()}
+            return HTTPStatus.OK, "application/json", json.dumps({"pages": pages}, indent=2) + "\n"
+        if name not in self.config_paths():
+            return HTTPStatus.NOT_FOUND, "text/plain", f"No config named {name}\n"
+        try:
+            return HTTPStatus.OK, "text/markdown", await self.page(name)
+        except Exception as exc:  # noqa: BLE001
+            return HTTPStatus.INTERNAL_SERVER_ERROR, "text/plain", f"Failed to render {name}: {exc}\n"
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve a single HTTP/1.1 request on a connection, then close it."""
+        try:
+            request_line = await reader.readline()
+            # Headers are not used
+            while await reader.readline() not in (b"\r\n", b"\n", b""):
+                pass
+            try:
+                method, target, _ = request_line.decode("latin-1").split()
+            except ValueError:
+                status, content_type, body = HTTPStatus.BAD_REQUEST, "text/plain", "Bad request\n"
+            else:
+                status, content_type, body = await self.respond(method, target)
+            payload = body.encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: {content_type}; charset=utf-8\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1")
+            )
+            writer.write(payload)
+            await writer.drain()
+        except (ConnectionError, ValueError):
+            # Client gone, or request line longer than the stream limit
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(
+    server: DocsServer,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    ready: Callable[[str, int], None] | None = None,
+) -> None:
+    """
+    Serve pages over HTTP until cancelled.
+
+    :param server: The server rendering the pages.
+    :param host: Interface to listen on, localhost by default.
+    :param port: Port to listen on, 0 to pick a free one.
+    :param ready: Called with the host and port once the server listens.
+    """
+    listener = await asyncio.start_server(server.handle, host, port)
+    if ready:
+        ready(*listener.sockets[0].getsockname()[:2])
+    async with listener:
+        await listener.serve_forever()
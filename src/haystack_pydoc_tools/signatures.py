@@ -0,0 +1,233 @@
+import io
+import tokenize
+from functools import lru_cache
+
+from griffe2md import do_format_code
+from griffe2md import do_format_signature as _do_format_signature_black
+from jinja2 import pass_context
+from jinja2.runtime import Context
+
+INDENT = "    "
+
+# Keywords whose layout black may change (parenthesized conditionals, lambdas, etc.)
+_UNSUPPORTED_KEYWORDS = {"lambda", "if", "else", "await", "yield", "async"}
+
+
+class _Unsupported(Exception):
+    """Raised when a signature uses a construct the fast formatter does not reproduce."""
+
+
+def _tokens(code: str) -> list[tokenize.TokenInfo]:
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(code).readline))
+    except (tokenize.TokenError, SyntaxError) as error:
+        raise _Unsupported from error
+    return [tok for tok in tokens if tok.type not in {tokenize.NEWLINE, tokenize.NL, tokenize.ENDMARKER}]
+
+
+def _normalize_string(string: str) -> str:
+    # Mirror black's preference for double quotes, for plain strings only
+    if string[0] not in "'\"" or "\\" in string or string.startswith(("'''", '"""')):
+        raise _Unsupported
+    if string[0] == '"' or '"' in string[1:-1]:
+        return string
+    return f'"{string[1:-1]}"'
+
+
+def _check_token(tok: tokenize.TokenInfo, brackets: list[str], previous: str | None) -> None:
+    """Raise _Unsupported for tokens black would rewrite in ways the fast formatter does not reproduce."""
+    if tok.start[0] != 1:
+        raise _Unsupported
+    text = tok.string
+    if tok.type == tokenize.NUMBER:
+        # black normalizes hex digits, exponents, suffixes, etc.
+        if not text.replace(".", "").isdigit():
+            raise _Unsupported
+    elif tok.type == tokenize.NAME:
+        if text in _UNSUPPORTED_KEYWORDS:
+            raise _Unsupported
+    elif tok.type == tokenize.OP:
+        if text == ":=" or (text == ":" and brackets and brackets[-1] == "["):
+            raise _Unsupported
+        if text == "**" and previous not in {"(", ","}:
+            # Power operator: black hugs simple operands
+            raise _Unsupported
+    elif tok.type != tokenize.STRING:
+        raise _Unsupported
+
+
+def _normalize(code: str) -> str:
+    """Apply the token-level normalizations black would apply, or raise _Unsupported."""
+    parts = []
+    last = 0
+    brackets: list[str] = []
+    previous = None
+    for tok in _tokens(code):
+        _check_token(tok, brackets, previous)
+        if tok.type == tokenize.OP and tok.string in "([{":
+            brackets.append(tok.string)
+        elif tok.type == tokenize.OP and tok.string in ")]}":
+            brackets.pop()
+        parts.append(code[last : tok.start[1]])
+        parts.append(_normalize_string(tok.string) if tok.type == tokenize.STRING else tok.string)
+        last = tok.end[1]
+        previous = tok.string
+    parts.append(code[last:])
+    return "".join(parts)
+
+
+def _split_parameters(signature: str) -> tuple[list[str], str]:
+    """Split a normalized `(params) -> ret` signature into its parameters and the closing part starting at ")"."""
+    tokens = _tokens(signature)
+    if not tokens or tokens[0].string != "(":
+        raise _Unsupported
+    depth = 0
+    commas = []
+    close = None
+    for tok in tokens:
+        if tok.type != tokenize.OP:
+            continue
+        if tok.string in "([{":
+            depth += 1
+        elif tok.string in ")]}":
+            depth -= 1
+            if depth == 0:
+                close = tok.start[1]
+                break
+        elif tok.string == "," and depth == 1:
+            commas.append(tok.start[1])
+    if close is None:
+        raise _Unsupported
+
+    bounds = [0, *commas, close]
+    parameters = [signature[start + 1 : end].strip() for start, end in zip(bounds, bounds[1:])]
+    return [_normalize_parameter(p) for p in parameters if p], signature[close:]
+
+
+def _default_has_commas(parameter: str) -> bool:
+    # Commas inside the annotation don't count for black, only those in the default value
+    depth = 0
+    in_default = False
+    for tok in _tokens(parameter):
+        if tok.type != tokenize.OP:
+            continue
+        if tok.string in "([{":
+            depth += 1
+        elif tok.string in ")]}":
+            depth -= 1
+        elif tok.string == "=" and depth == 0:
+            in_default = True
+        elif tok.string == "," and in_default:
+            return True
+    return False
+
+
+def _normalize_parameter(parameter: str) -> str:
+    # black removes spaces around "=" for parameters without an annotation
+    name, sep, default = parameter.partition(" = ")
+    if sep and ":" not in name:
+        return f"{name}={default}"
+    return parameter
+
+
+def _trailing_comma_safe(parameters: list[str]) -> bool:
+    # black only adds a trailing comma after *args/**kwargs when the code targets Python 3.6+,
+    # which it can only infer here from a positional-only marker.
+    has_varargs = any(p.startswith("*") for p in parameters)
+    return not has_varargs or "/" in parameters
+
+
+def _fast_format_signature(name: str, signature: str, line_length: int) -> str:
+    signature = _normalize(signature)
+    parameters, closing = _split_parameters(signature)
+    placeholder = "x" * len(name)
+    joined = ", ".join(parameters)
+
+    if len(f"def {placeholder}({joined}{closing}:") <= line_length:
+        return f"{name}({joined}{closing}"
+
+    # Without parameters, black splits the return annotation instead
+    if not parameters or len(f"def {placeholder}(") > line_length or len(f"{closing}:") > line_length:
+        raise _Unsupported
+
+    if len(parameters) == 1:
+        # black adds a trailing comma to a lone parameter, unless its default value contains commas
+        body = [INDENT + joined if _default_has_commas(joined) else f"{INDENT}{joined},"]
+    elif len(INDENT + joined) <= line_length:
+        body = [INDENT + joined]
+    else:
+        trailing = "," if _trailing_comma_safe(parameters) else ""
+        body = [f"{INDENT}{p}," for p in parameters[:-1]] + [f"{INDENT}{p}{trailing}" for p in parameters[-1:]]
+
+    # Lines still too long would be split again by black
+    if any(len(line) > line_length for line in body):
+        raise _Unsupported
+    return "\n".join([f"{name}(", *body, closing])
+
+
+@lru_cache(maxsize=4096)
+def format_signature(name: str, signature: str, line_length: int) -> str:
+    """
+    Format a callable signature the way griffe2md does with black, without running black.
+
+    Signatures are wrapped the same way black wraps a `def` statement: on one line if it fits,
+    otherwise with all parameters on an indented line, otherwise with one parameter per line.
+    Constructs that black would lay out differently fall back to black.
+    Results are memoized by signature text.
+
+    :param name: Name of the callable.
+    :param signature: Rendered signature, such as `(self, a: int = 1) -> str`.
+    :param line_length: Maximum line length.
+    :returns: The formatted signature, including the name.
+    """
+    name = name.strip()
+    signature = signature.strip()
+    if len(name + signature) < line_length:
+        return name + signature
+    try:
+        return _fast_format_signature(name, signature, line_length)
+    except _Unsupported:
+        return _format_signature_black(name, signature, line_length)
+
+
+def _format_signature_black(name: str, signature: str, line_length: int) -> str:
+    # Same transformation as griffe2md: black cannot format names with dots, so the name is
+    # replaced with a placeholder of equal length, then restored.
+    formatted = do_format_code(f"def {'x' * len(name)}{signature}: pass", line_length)
+    return name + formatted[4:-5].strip()[len(name) : -1]
+
+
+@pass_context
+def do_format_signature(  # noqa: PLR0913
+    context: Context,
+    callable_path: str,
+    function: object,
+    line_length: int,
+    *,
+    annotations: bool | None = None,
+    crossrefs: bool = False,
+) -> str:
+    """
+    Jinja filter replacing griffe2md's `format_signature` with the fast formatter.
+
+    :param context: Jinja context, passed automatically.
+    :param callable_path: The path of the callable we render the signature of.
+    :param function: The function we render the signature of.
+    :param line_length: Maximum line length.
+    :param annotations: Whether to show type annotations.
+    :param crossrefs: Whether to cross-reference types in the signature.
+    :returns: The formatted signature.
+    """
+    if crossrefs:
+        # Cross-references are stashed and restored around formatting, keep griffe2md's implementation
+        return _do_format_signature_black(
+            context, callable_path, function, line_length, annotations=annotations, crossrefs=crossrefs
+        )
+    template = context.environment.get_template("signature.md.jinja")
+    if annotations is None:
+        new_context = context.parent
+    else:
+        new_context = dict(context.parent)
+        new_context["config"] = {**new_context["config"], "show_signature_annotations": annotations}
+    signature = template.render(new_context, function=function, signature=True)
+    return format_signature(str(callable_path), signature, line_length)
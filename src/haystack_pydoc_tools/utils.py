@@ -0,0 +1,91 @@
+import hashlib
+import os
+import uuid
+from pathlib import Path
+
+_CHUNK_SIZE = 1024 * 1024
+
+# Identifies a version of a file: (mtime in ns, size), or None if the file is missing
+Stamp = tuple[int, int] | None
+
+
+def package_version(name: str) -> str:
+    """Return the installed version of a distribution, or "unknown" if it is not installed."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def file_stamp(path: Path) -> Stamp:
+    """Return the (mtime in ns, size) of a file, which change when it is written, or None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def temp_path(path: Path) -> Path:
+    """Return a unique temporary path next to `path`, to write it atomically with `replace_if_changed`."""
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+
+
+def _same_content(first: Path, second: Path) -> bool:
+    # Sizes differ for most changes, so the content is only compared when they match
+    try:
+        if first.stat().st_size != second.stat().st_size:
+            return False
+    except FileNotFoundError:
+        return False
+    with open(first, "rb") as f1, open(second, "rb") as f2:
+        while True:
+            chunk = f1.read(_CHUNK_SIZE)
+            if chunk != f2.read(_CHUNK_SIZE):
+                return False
+            if not chunk:
+                return True
+
+
+def replace_if_changed(tmp: Path, path: Path) -> bool:
+    """
+    Move a freshly written temporary file to `path`, unless `path` already has the same content.
+
+    Unchanged files are left untouched, keeping their mtime, so that tools watching them don't rebuild.
+    The temporary file is removed in both cases.
+
+    :param tmp: Temporary file, on the same filesystem as `path` (see `temp_path`).
+    :param path: Destination file.
+    :returns: True if `path` was written, False if it was unchanged.
+    """
+    if _same_content(tmp, path):
+        tmp.unlink()
+        return False
+    os.replace(tmp, path)
+    return True
+
+
+def write_text_if_changed(path: Path, text: str) -> bool:
+    """
+    Atomically write `text` to `path`, unless `path` already has this content.
+
+    :param path: Destination file.
+    :param text: Content to write, encoded as UTF-8.
+    :returns: True if `path` was written, False if it was unchanged.
+    """
+    tmp = temp_path(path)
+    try:
+        # Unlike tempfile.mkstemp, open() creates the file with the usual permissions (as set by the umask)
+        with open(tmp, "x", encoding="utf-8") as f:
+            f.write(text)
+        return replace_if_changed(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,183 @@
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor
+from itertools import repeat
+from pathlib import Path
+
+from haystack_pydoc_tools.build import ConfigResult, ModuleKey, module_keys, parse_module
+from haystack_pydoc_tools.cache import RenderCache
+from haystack_pydoc_tools.config import DocsConfig, load_config
+from haystack_pydoc_tools.discovery import module_filepath, module_index
+from haystack_pydoc_tools.model import DocModule
+from haystack_pydoc_tools.renderers import render_docusaurus
+from haystack_pydoc_tools.utils import Stamp, file_stamp
+
+DEFAULT_INTERVAL = 0.2
+
+
+def _parse(search_path: str, module_name: str, cache_dir: str | None) -> DocModule | BaseException:
+    # Parse errors are returned rather than raised, so that one broken module doesn't abort the others
+    try:
+        return parse_module(search_path, module_name, cache_dir)
+    except Exception as exc:  # noqa: BLE001
+        return exc
+
+
+class Watcher:
+    """
+    Rebuild configs when their YAML file or the source of one of their modules changes.
+
+    Configs, parsed modules and rendered Markdown are kept in memory between polls: only the modules
+    whose source changed are parsed again, and only the configs using them are rendered again,
+    reusing the Markdown of their unchanged modules.
+    """
+
+    def __init__(
+        self,
+        target: Path,
+        output_dir: str | None = None,
+        *,
+        executor: Executor | None = None,
+        cache_dir: str | None = None,
+    ) -> None:
+        """
+        Create a watcher. Nothing is built until the first call to `poll`.
+
+        :param target: YAML config file or directory of config files.
+        :param output_dir: Optional directory where output files are written.
+        :param executor: Optional executor parsing changed modules in parallel.
+        :param cache_dir: Optional parse cache directory.
+        """
+        self.target = target
+        self.output_dir = output_dir
+        self.executor = executor
+        self.cache_dir = cache_dir
+        self.render_cache = RenderCache()
+        self._configs: dict[Path, tuple[Stamp, DocsConfig | BaseException]] = {}
+        self._modules: dict[ModuleKey, tuple[Stamp, DocModule | BaseException]] = {}
+
+    def config_paths(self) -> list[Path]:
+        """Return the config files currently watched."""
+        return sorted(self.target.glob("*.yml")) if self.target.is_dir() else [self.target]
+
+    def _module_stamp(self, key: ModuleKey, stamps: dict[ModuleKey, Stamp]) -> Stamp:
+        if key not in stamps:
+            stamps[key] = file_stamp(module_filepath(Path(key[0]), key[1]))
+        return stamps[key]
+
+    def _is_stale(self, path: Path, stamps: dict[ModuleKey, Stamp]) -> bool:
+        entry = self._configs.get(path)
+        if entry is None or entry[0] != file_stamp(path):
+            return True
+        config = entry[1]
+        if isinstance(config, BaseException):
+            return False
+        return any(
+            key not in self._modules or self._modules[key][0] != self._module_stamp(key, stamps)
+            for key in module_keys(config)
+        )
+
+    def _load_config(self, path: Path) -> DocsConfig | BaseException:
+        stamp = file_stamp(path)
+        try:
+            config: DocsConfig | BaseException = load_config(str(path), self.output_dir)
+        except Exception as exc:  # noqa: BLE001
+            config = exc
+        self._configs[path] = (stamp, config)
+        return config
+
+    def _parse(self, keys: list[ModuleKey], stamps: dict[ModuleKey, Stamp]) -> None:
+        # Stamps are taken before parsing, so that a file saved again while parsing is picked up by the next poll
+        current = [self._module_stamp(key, stamps) for key in keys]
+        search_paths = [key[0] for key in keys]
+        module_names = [key[1] for key in keys]
+        if self.executor is None or len(keys) <= 1:
+            parsed = map(_parse, search_paths, module_names, repeat(self.cache_dir))
+        else:
+            parsed = self.executor.map(_parse, search_paths, module_names, repeat(self.cache_dir))
+        for key, stamp, module in zip(keys, current, parsed):
+            self._modules[key] = (stamp, module)
+
+    def _render(self, path: Path, config: DocsConfig) -> ConfigResult:
+        try:
+            modules = []
+            for key in module_keys(config):
+                module = self._modules[key][1]
+                if isinstance(module, BaseException):
+                    raise module
+                modules.append(module)
+            render_docusaurus(
+                modules, filename=config.filename, render_cache=self.render_cache, **config.renderer_settings()
+            )
+        except Exception as exc:  # noqa: BLE001
+            return ConfigResult(str(path), "failed", exc)
+        return ConfigResult(str(path), "ok")
+
+    def poll(self) -> list[ConfigResult]:
+        """
+        Rebuild the configs whose inputs changed since the last poll. The first poll builds every config.
+
+        :returns: The result of every rebuilt config.
+        """
+        paths = self.config_paths()
+        for removed in set(self._configs) - set(paths):
+            del self._configs[removed]
+
+        # Pick up modules added to the source roots, which patterns may select. Only directories
+        # whose mtime changed are listed again.
+        module_index.cache_clear()
+        stamps: dict[ModuleKey, Stamp] = {}
+        stale = [path for path in paths if self._is_stale(path, stamps)]
+        results = []
+        configs = {}
+        for path in stale:
+            config = self._load_config(path)
+            if isinstance(config, BaseException):
+                results.append(ConfigResult(str(path), "failed", config))
+            else:
+                configs[path] = config
+
+        changed = {
+            key
+            for config in configs.values()
+            for key in module_keys(config)
+            if key not in self._modules or self._modules[key][0] != self._module_stamp(key, stamps)
+        }
+        self._parse(sorted(changed), stamps)
+
+        results.extend(self._render(path, config) for path, config in configs.items())
+        return results
+
+
+def watch(  # noqa: PLR0913
+    target: Path,
+    output_dir: str | None = None,
+    *,
+    executor: Executor | None = None,
+    cache_dir: str | None = None,
+    interval: float = DEFAULT_INTERVAL,
+    report: Callable[[ConfigResult], None],
+    ready: Callable[[], None] | None = None,
+) -> None:
+    """
+    Build every config, then rebuild configs as their inputs change, until interrupted.
+
+    Files are polled for changes every `interval` seconds.
+
+    :param target: YAML config file or directory of config files.
+    :param output_dir: Optional directory where output files are written.
+    :param executor: Optional executor parsing changed modules in parallel.
+    :param cache_dir: Optional parse cache directory.
+    :param interval: Seconds between polls.
+    :param report: Called with the result of every rebuilt config.
+    :param ready: Called once the initial build is done.
+    """
+    watcher = Watcher(target, output_dir, executor=executor, cache_dir=cache_dir)
+    for result in watcher.poll():
+        report(result)
+    if ready:
+        ready()
+    while True:
+        time.sleep(interval)
+        for result in watcher.poll():
+            report(result)
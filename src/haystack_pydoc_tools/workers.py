@@ -0,0 +1,105 @@
+import functools
+import multiprocessing
+import pickle
+import sys
+import traceback
+import warnings
+from collections.abc import Callable
+from concurrent.futures import Executor
+from multiprocessing.context import BaseContext
+from typing import Any, TypeVar
+
+from haystack_pydoc_tools import profiling
+
+# Imported once by the fork server: worker processes forked from it start with griffe, griffe2md, jinja2,
+# mdformat and black already loaded
+PRELOAD = ("black", "haystack_pydoc_tools.loaders", "haystack_pydoc_tools.renderers")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def mp_context() -> BaseContext:
+    """
+    Return the multiprocessing context of worker pools.
+
+    Where the "forkserver" start method is available, workers are forked from a server process that imports
+    the heavy dependencies once, when the first worker starts. Elsewhere (Windows), the platform default is used
+    and each worker imports them.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context()
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(list(PRELOAD))
+    return context
+
+
+def picklable_errors(fn: F) -> F:
+    """
+    Raise the errors of a task that can't be sent back from a worker process as a `RuntimeError` instead.
+
+    Errors holding griffe objects fail to unpickle in the calling process, which then breaks the whole pool.
+    The `RuntimeError` carries the type, message and traceback of the original error.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return fn(*args, **kwargs)
+        except Exception as exc:
+            try:
+                pickle.loads(pickle.dumps(exc))
+            except Exception:  # noqa: BLE001
+                details = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+                msg = f"{type(exc).__name__}: {exc}\n\n{details}"
+                raise RuntimeError(msg) from exc
+            raise
+
+    return wrapper  # type: ignore[return-value]
+
+
+def init_worker(profile_dir: str | None = None, cprofile: bool = False) -> None:
+    """
+    Initializer of worker processes: compile the rendering templates and load black before the first task.
+
+    :param profile_dir: Directory passed to `--profile`, to record the timings of this worker.
+    :param cprofile: Also profile the tasks of this worker with cProfile.
+    """
+    from haystack_pydoc_tools.renderers import warm_up
+
+    warm_up()
+    if profile_dir:
+        profiling.enable(profile_dir, cprofile=cprofile)
+
+
+def create_executor(
+    jobs: int | None = None,
+    profile_dir: str | None = None,
+    *,
+    cprofile: bool = False,
+    max_tasks_per_child: int | None = None,
+) -> Executor:
+    """
+    Create the executor running parse and render tasks.
+
+    :param jobs: Number of worker processes, one per CPU by default. 0 runs every task in the calling thread.
+    :param profile_dir: Directory passed to `--profile`, to record the timings of each worker.
+    :param cprofile: Also profile the tasks of each worker with cProfile.
+    :param max_tasks_per_child: Replace each worker process after this many tasks. Requires Python 3.11 or later,
+        ignored with a warning on older versions.
+    :returns: A process pool whose workers are started with `init_worker`, or a `SerialExecutor`.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    from haystack_pydoc_tools.scheduler import SerialExecutor
+
+    if jobs == 0:
+        return SerialExecutor()
+    kwargs = {}
+    if max_tasks_per_child:
+        if sys.version_info >= (3, 11):
+            kwargs["max_tasks_per_child"] = max_tasks_per_child
+        else:
+            warnings.warn("max_tasks_per_child requires Python 3.11 or later, ignoring it", stacklevel=2)
+    return ProcessPoolExecutor(
+        max_workers=jobs, mp_context=mp_context(), initializer=init_worker, initargs=(profile_dir, cprofile), **kwargs
+    )
@@ -0,0 +1,31 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from haystack_pydoc_tools import build, serve, watch
+
+TEST_FILES = Path(__file__).parent / "test_files"
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Copy the test components, and the `generators_api.yml` config documenting them, to a temporary directory."""
+    shutil.copytree(TEST_FILES / "components", tmp_path / "components")
+    shutil.copy(TEST_FILES / "generators_api.yml", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    """Record the name of every module parsed by builds, `serve` and `watch`."""
+    calls = []
+    parse_module = build.parse_module
+
+    def counting_parse_module(search_path, module_name, cache_dir=None, documented_only=False):
+        calls.append(module_name)
+        return parse_module(search_path, module_name, cache_dir, documented_only)
+
+    for module in (build, serve, watch):
+        monkeypatch.setattr(module, "parse_module", counting_parse_module)
+    return calls
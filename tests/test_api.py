@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import BrokenExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from haystack_pydoc_tools import api
+from haystack_pydoc_tools.api import Builder, build
+
+TEST_FILES = Path(__file__).parent / "test_files"
+EXPECTED = (TEST_FILES / "expected_generators_api.md").read_text()
+
+
+def test_builder_parses_changed_modules_only(project, parse_calls):
+    out = project / "out"
+    with Builder(jobs=0) as builder:
+        results = builder.build(project / "generators_api.yml", out)
+        assert [result.status for result in results] == ["ok"]
+        assert sorted(parse_calls) == ["chat/azure", "chat/openai"]
+
+        parse_calls.clear()
+        results = builder.build(project, out)
+        assert [(result.status, result.cache) for result in results] == [("ok", "hit")]
+        assert parse_calls == []
+
+        azure = project / "components" / "generators" / "chat" / "azure.py"
+        azure.write_text(azure.read_text() + "\n\ndef added():\n    '''Added function.'''\n")
+        stat = azure.stat()
+        os.utime(azure, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        results = builder.build([project / "generators_api.yml"], out)
+        assert [(result.status, result.cache) for result in results] == [("ok", "partial")]
+        assert parse_calls == ["chat/azure"]
+    assert "Added function." in (out / "generators_api.md").read_text()
+
+
+def test_builder_builds_concurrently_in_threads(project):
+    with Builder(jobs=0) as builder, ThreadPoolExecutor(8) as threads:
+        results = list(
+            threads.map(
+                lambda index: builder.build(project / "generators_api.yml", project / f"out{index}")[0], range(16)
+            )
+        )
+    assert [result.status for result in results] == ["ok"] * 16
+    # Each build counts the render cache hits of its own modules only
+    assert all(result.cache_hits <= result.modules for result in results)
+    assert len({(project / f"out{index}" / "generators_api.md").read_text() for index in range(16)}) == 1
+
+
+def test_builder_reuses_worker_pool(tmp_path):
+    with Builder(jobs=1) as builder:
+        first = builder.build(TEST_FILES / "generators_api.yml", tmp_path)
+        second = builder.build(TEST_FILES / "generators_api.yml", tmp_path)
+        assert [result.status for result in first + second] == ["ok", "ok"]
+        # Rendered by the same worker, which kept the Markdown in memory
+        assert second[0].cache == "hit"
+    assert (tmp_path / "generators_api.md").read_text() == EXPECTED
+
+
+def test_builder_keeps_worker_pool_after_failing_config(project):
+    # Raises an AliasResolutionError, holding griffe objects that can't be sent back from a worker process
+    (project / "broken").mkdir()
+    (project / "broken" / "unresolved.py").write_text('''"""
+Module.
+
+:var thing: Imported from a package that is not installed.
+"""
+
+from not_installed_package import thing
+''')
+    (project / "broken.yml").write_text("""
+loaders:
+  - search_path: [broken]
+    modules: [unresolved]
+renderer:
+  title: Broken
+  id: broken
+  description: Broken.
+  filename: broken.md
+""")
+    with Builder(jobs=2) as builder:
+        results = [builder.build(project / name, project / "out")[0] for name in ("generators_api.yml", "broken.yml")]
+        results += [builder.build(project / "generators_api.yml", project / "out")[0] for _ in range(2)]
+    assert [result.status for result in results] == ["ok", "failed", "ok", "ok"]
+    assert isinstance(results[1].error, RuntimeError)
+    assert str(results[1].error).startswith("AliasResolutionError: Could not resolve alias unresolved.thing")
+
+
+def test_builder_replaces_broken_executor(tmp_path, monkeypatch):
+    def fail():
+        raise RuntimeError
+
+    # The first executor breaks on its first task, like a process pool whose worker was killed
+    executors = iter([ThreadPoolExecutor(1, initializer=fail), ThreadPoolExecutor(1)])
+    monkeypatch.setattr(api, "create_executor", lambda *_, **__: next(executors))
+    with Builder(jobs=1) as builder:
+        [broken] = builder.build(TEST_FILES / "generators_api.yml", tmp_path)
+        [result] = builder.build(TEST_FILES / "generators_api.yml", tmp_path)
+    assert isinstance(broken.error, BrokenExecutor)
+    assert result.status == "ok"
+
+
+def test_build_reports_errors(tmp_path):
+    results = build(tmp_path / "missing.yml", tmp_path / "out", jobs=0)
+    assert [result.status for result in results] == ["failed"]
+    assert isinstance(results[0].error, FileNotFoundError)
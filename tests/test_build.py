@@ -0,0 +1,169 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from haystack_pydoc_tools import build
+from haystack_pydoc_tools.build import build_directory
+from haystack_pydoc_tools.scheduler import SerialExecutor
+
+TEST_FILES = Path(__file__).parent / "test_files"
+EXPECTED = (TEST_FILES / "expected_generators_api.md").read_text()
+
+
+def test_shared_modules_parsed_once(tmp_path, parse_calls):
+    configs = [TEST_FILES / "generators_api.yml", TEST_FILES / "simpler_generators_api.yml"]
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        results = build_directory(configs, str(tmp_path), executor=executor, report=lambda _: None)
+
+    assert sorted(result.status for result in results) == ["ok", "ok"]
+    assert sorted(parse_calls) == ["chat/azure", "chat/openai"]
+    assert (tmp_path / "generators_api.md").read_text() == EXPECTED
+
+
+def test_reports_peak_rss_within_memory_budget(tmp_path):
+    configs = [TEST_FILES / "generators_api.yml", TEST_FILES / "simpler_generators_api.yml"]
+    results = build_directory(
+        configs, str(tmp_path), executor=SerialExecutor(), memory_budget=1024**3, report=lambda _: None
+    )
+
+    assert [result.status for result in results] == ["ok", "ok"]
+    assert all(result.peak_rss > 0 for result in results)
+    assert (tmp_path / "generators_api.md").read_text() == EXPECTED
+
+
+def test_reports_start_and_statistics(tmp_path):
+    build.render_cache.cache_clear()
+    events = []
+    config = TEST_FILES / "generators_api.yml"
+    for _ in range(2):
+        build_directory(
+            [config],
+            str(tmp_path),
+            executor=SerialExecutor(),
+            report=lambda result: events.append(("finish", result)),
+            started=lambda path: events.append(("start", path)),
+        )
+
+    assert [(event, getattr(value, "config", value)) for event, value in events] == [
+        ("start", str(config)),
+        ("finish", str(config)),
+    ] * 2
+    first, second = events[1][1], events[3][1]
+    assert (first.modules, first.cache) == (2, "miss")
+    assert first.output_bytes == (tmp_path / "generators_api.md").stat().st_size
+    # Rendered modules are kept in memory between builds of the same process
+    assert (second.cache_hits, second.cache) == (2, "hit")
+    assert second.seconds >= 0
+
+
+def test_parse_failure_fails_dependent_configs_only(tmp_path, parse_calls):
+    broken = tmp_path / "broken.yml"
+    broken.write_text(f"""
+loaders:
+  - search_path: [{TEST_FILES / "components" / "generators"}]
+    modules: [chat/azure, chat/missing]
+renderer:
+  title: Broken
+  id: broken
+  description: Broken.
+  filename: broken.md
+""")
+    reported = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        results = build_directory(
+            [broken, TEST_FILES / "generators_api.yml"], str(tmp_path), executor=executor, report=reported.append
+        )
+
+    statuses = {Path(result.config).name: result.status for result in results}
+    assert statuses == {"broken.yml": "failed", "generators_api.yml": "ok"}
+    assert reported == results
+    assert len(parse_calls) == 3  # noqa: PLR2004
+
+
+def test_unresolved_config_fails_alone(tmp_path):
+    unresolved = tmp_path / "unresolved.yml"
+    unresolved.write_text("""
+loaders:
+  - search_path: []
+    modules: [chat/azure]
+renderer:
+  title: Unresolved
+  id: unresolved
+  description: Unresolved.
+  filename: unresolved.md
+""")
+    reported = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        results = build_directory(
+            [unresolved, TEST_FILES / "generators_api.yml"], str(tmp_path), executor=executor, report=reported.append
+        )
+
+    statuses = {Path(result.config).name: result.status for result in results}
+    assert statuses == {"unresolved.yml": "failed", "generators_api.yml": "ok"}
+    assert reported == results
+
+
+def test_broken_worker_pool_fails_configs(tmp_path):
+    configs = [TEST_FILES / "generators_api.yml", TEST_FILES / "simpler_generators_api.yml"]
+    reported = []
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        # A worker killed, for instance for running out of memory, breaks the pool
+        executor.submit(os._exit, 1).exception()
+        results = build_directory(configs, str(tmp_path), executor=executor, report=reported.append)
+
+    assert sorted(Path(result.config).name for result in results) == [
+        "generators_api.yml",
+        "simpler_generators_api.yml",
+    ]
+    assert all(result.status == "failed" and isinstance(result.error, BrokenProcessPool) for result in results)
+    assert reported == results
+
+
+def test_renders_most_expensive_config_first(tmp_path):
+    # Only needs one of the two modules of the bigger config, so it is ready first, but rendered last
+    small = tmp_path / "small.yml"
+    small.write_text(f"""
+loaders:
+  - search_path: [{TEST_FILES / "components" / "generators"}]
+    modules: [chat/azure]
+renderer:
+  title: Small
+  id: small
+  description: Small.
+  filename: small.md
+""")
+    results = build_directory(
+        [small, TEST_FILES / "simpler_generators_api.yml"],
+        str(tmp_path),
+        executor=SerialExecutor(),
+        jobs=1,
+        report=lambda _: None,
+    )
+    assert [Path(result.config).name for result in results] == ["simpler_generators_api.yml", "small.yml"]
+
+
+def test_config_with_several_roots(tmp_path, parse_calls):
+    generators = TEST_FILES / "components" / "generators"
+    config = tmp_path / "several.yml"
+    config.write_text(f"""
+loaders:
+  - search_path: [{tmp_path}, {generators}]
+    modules: [chat/openai]
+  - search_path: [{generators}]
+    modules: [chat/azure, chat/openai]
+renderer:
+  title: Several
+  id: several
+  description: Several roots.
+  filename: several.md
+""")
+    results = build_directory(
+        [config, TEST_FILES / "generators_api.yml"], str(tmp_path), executor=SerialExecutor(), report=lambda _: None
+    )
+
+    assert [result.status for result in results] == ["ok", "ok"]
+    # Found in the second search path of the first loader, and shared with the other loader and config
+    assert sorted(parse_calls) == ["chat/azure", "chat/openai"]
+    content = (tmp_path / "several.md").read_text()
+    assert content.index("## chat/openai") < content.index("## chat/azure")
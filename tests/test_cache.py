@@ -0,0 +1,182 @@
+import os
+import threading
+from pathlib import Path
+
+from griffe import Module
+from griffe2md import render_object_docs
+
+from haystack_pydoc_tools import cache, loaders, renderers
+from haystack_pydoc_tools.cache import ModuleCache, ParseCache, RenderCache, dump_module, load_module
+from haystack_pydoc_tools.loaders import load_modules
+from haystack_pydoc_tools.renderers import GRIFFE2MD_DEFAULT_CONFIG, render_docusaurus
+
+TEST_FILES = Path(__file__).parent / "test_files"
+TEST_COMPONENTS = str(TEST_FILES / "components" / "generators")
+
+
+def test_round_trip_renders_identically():
+    modules = load_modules(TEST_COMPONENTS, ["chat/azure", "chat/openai"])
+    modules += load_modules(str(TEST_FILES), ["dataclasses.byte_stream"])
+    for module in modules:
+        restored = load_module(dump_module(module))
+        assert render_object_docs(restored, GRIFFE2MD_DEFAULT_CONFIG) == render_object_docs(
+            module, GRIFFE2MD_DEFAULT_CONFIG
+        )
+
+
+def test_cache_hit_skips_visit(tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path)
+    first = load_modules(TEST_COMPONENTS, ["chat/openai"], cache=cache)
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("visit() should not be called on a cache hit")
+
+    monkeypatch.setattr(loaders, "visit", fail)
+    second = load_modules(TEST_COMPONENTS, ["chat/openai"], cache=cache)
+    assert second[0].name == first[0].name
+    assert "OpenAIChatGenerator" in second[0].members
+
+
+def test_cached_dataclass_keeps_synthesized_init(tmp_path):
+    cache = ParseCache(tmp_path)
+    load_modules(str(TEST_FILES), ["dataclasses.byte_stream"], cache=cache)
+    modules = load_modules(str(TEST_FILES), ["dataclasses.byte_stream"], cache=cache)
+    init = modules[0].members["ByteStream"].members["__init__"]
+    assert [p.name for p in init.parameters] == ["self", "data", "meta", "mime_type"]
+
+
+def test_key_depends_on_content_and_name(tmp_path):
+    cache = ParseCache(tmp_path)
+    key = cache.key("mod", "x = 1")
+    assert key == cache.key("mod", "x = 1")
+    assert key != cache.key("mod", "x = 2")
+    assert key != cache.key("other", "x = 1")
+    assert key != cache.key("mod", "x = 1", docstring_parser="google")
+    assert key != cache.key("mod", "x = 1", documented_only=True)
+
+
+def test_corrupted_entry_is_a_miss(tmp_path):
+    cache = ParseCache(tmp_path)
+    key = cache.key("mod", "x = 1")
+    (tmp_path / f"{key}.json").write_text("{not json")
+    assert cache.get(key) is None
+    assert not (tmp_path / f"{key}.json").exists()
+
+
+def test_evicts_least_recently_used(tmp_path):
+    module = load_modules(TEST_COMPONENTS, ["chat/openai"])[0]
+    size = len(dump_module(module).encode("utf-8"))
+    cache = ParseCache(tmp_path, max_size=size * 2)
+
+    cache.put("a", module)
+    cache.put("b", module)
+    os.utime(tmp_path / "a.json", (1, 1))
+    os.utime(tmp_path / "b.json", (2, 2))
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") is not None
+    cache.put("c", module)
+
+    assert sorted(p.stem for p in tmp_path.glob("*.json")) == ["a", "c"]
+
+
+def test_writes_scan_the_directory_only_as_the_store_grows(tmp_path, monkeypatch):
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(cache.os, "scandir", lambda path: scans.append(path) or scandir(path))
+    store = ParseCache(tmp_path, max_size=160_000)
+
+    for index in range(200):
+        store.write(f"entry{index}", "x" * 100)
+    # Once on the first write, then every 10 kB written
+    assert len(scans) == 2  # noqa: PLR2004
+    assert len(list(tmp_path.glob("*.json"))) == 200  # noqa: PLR2004
+
+
+def test_render_cache_key():
+    cache = RenderCache()
+    module = load_modules(TEST_COMPONENTS, ["chat/openai"])[0]
+    config = GRIFFE2MD_DEFAULT_CONFIG
+    key = cache.key(module, config, "black")
+    assert key == cache.key(load_modules(TEST_COMPONENTS, ["chat/openai"])[0], config, "black")
+    assert key != cache.key(module, config, "fast")
+    assert key != cache.key(module, {**config, "show_if_no_docstring": True}, "black")
+
+    module.extra["haystack_pydoc"]["source_hash"] = "edited"
+    assert key != cache.key(module, config, "black")
+
+    # Modules not loaded by load_modules have no source hash and are not cached
+    assert cache.key(Module("unknown"), config, "black") is None
+
+
+def test_render_cache_key_changes_with_formatter_versions(monkeypatch):
+    module = load_modules(TEST_COMPONENTS, ["chat/openai"])[0]
+
+    def key(upgraded=None):
+        monkeypatch.setattr(cache, "package_version", lambda name: "2.0" if name == upgraded else "1.0")
+        cache._renderer_versions.cache_clear()
+        return RenderCache().key(module, GRIFFE2MD_DEFAULT_CONFIG, "black")
+
+    assert key("black") != key()
+    assert key("mdformat") != key()
+    cache._renderer_versions.cache_clear()
+
+
+def test_render_cache_memory_lru():
+    cache = RenderCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+
+def test_render_cache_persists_on_disk(tmp_path):
+    RenderCache(tmp_path).put("key", "# Rendered\n")
+    assert RenderCache(tmp_path).get("key") == "# Rendered\n"
+    assert RenderCache(tmp_path).get("other") is None
+    assert RenderCache().get("key") is None
+
+
+def test_render_cache_counts_hits_per_thread():
+    cache = RenderCache()
+    cache.put("key", "# Rendered\n")
+    thread = threading.Thread(target=lambda: [cache.get("key") for _ in range(3)])
+    thread.start()
+    thread.join()
+    assert cache.hits == 0
+    cache.get("key")
+    assert cache.hits == 1
+
+
+def test_render_docusaurus_reuses_rendered_modules(tmp_path, monkeypatch):
+    cache = RenderCache()
+    modules = load_modules(TEST_COMPONENTS, ["chat/azure", "chat/openai"])
+    render_docusaurus(
+        modules, title="A", doc_id="a", description="A", filename=str(tmp_path / "a.md"), render_cache=cache
+    )
+
+    def fail(*args, **kwargs):
+        raise AssertionError("render_module() should not be called on a cache hit")
+
+    monkeypatch.setattr(renderers, "render_module", fail)
+    modules = load_modules(TEST_COMPONENTS, ["chat/openai", "chat/azure"])
+    render_docusaurus(
+        modules, title="A", doc_id="a", description="A", filename=str(tmp_path / "b.md"), render_cache=cache
+    )
+    assert (tmp_path / "a.md").read_text() == (tmp_path / "b.md").read_text()
+
+
+def test_module_cache_checks_stamps_and_evicts():
+    cache = ModuleCache(max_entries=2)
+    modules = {name: Module(name) for name in "abc"}
+    for index, name in enumerate("abc"):
+        cache.put(("root", name), (index, 10), modules[name])
+
+    assert len(cache) == 2  # noqa: PLR2004
+    assert cache.get(("root", "a"), (0, 10)) is None
+    assert cache.get(("root", "b"), (1, 10)) is modules["b"]
+    assert cache.get(("root", "b"), (1, 11)) is None
+    assert cache.get(("root", "c"), None) is None
@@ -1,4 +1,8 @@
+import json
+import re
 import subprocess
+import sys
+import urllib.request
 from pathlib import Path
 
 import pytest
@@ -32,3 +36,209 @@ def test_output_matches_expected(tmp_path, config):
     content = (tmp_path / "generators_api.md").read_text()
     expected = (Path(__file__).parent / "test_files" / "expected_generators_api.md").read_text()
     assert content == expected
+
+
+def test_cache_dir(tmp_path):
+    cache_dir = tmp_path / "cache"
+    for _ in range(2):
+        subprocess.run(["haystack-pydoc", TEST_CONFIG, str(tmp_path), "--cache-dir", str(cache_dir)], check=True)
+        content = (tmp_path / "generators_api.md").read_text()
+        expected = (Path(__file__).parent / "test_files" / "expected_generators_api.md").read_text()
+        assert content == expected
+    assert len(list(cache_dir.glob("*.json"))) == 2  # noqa: PLR2004
+    assert len(list((cache_dir / "render").glob("*.md"))) == 2  # noqa: PLR2004
+
+
+def test_incremental_skips_unchanged(tmp_path):
+    cmd = ["haystack-pydoc", TEST_CONFIG, str(tmp_path), "--incremental"]
+    subprocess.run(cmd, check=True)
+    output = tmp_path / "generators_api.md"
+    mtime = output.stat().st_mtime_ns
+    subprocess.run(cmd, check=True)
+    assert output.stat().st_mtime_ns == mtime
+
+    output.write_text("edited")
+    subprocess.run(cmd, check=True)
+    assert output.read_text() == (Path(__file__).parent / "test_files" / "expected_generators_api.md").read_text()
+
+
+def test_serial_jobs(tmp_path):
+    config_dir = Path(__file__).parent / "test_files"
+    subprocess.run(["haystack-pydoc", str(config_dir), str(tmp_path), "--jobs", "0"], check=True)
+    expected = (config_dir / "expected_generators_api.md").read_text()
+    assert (tmp_path / "generators_api.md").read_text() == expected
+
+
+def test_single_config_builds_in_process_by_default(tmp_path, monkeypatch):
+    from haystack_pydoc_tools import cli, workers
+
+    jobs = []
+    create_executor = workers.create_executor
+
+    def recording_create_executor(requested, *args, **kwargs):
+        jobs.append(requested)
+        return create_executor(requested, *args, **kwargs)
+
+    monkeypatch.setattr(workers, "create_executor", recording_create_executor)
+    for extra in ([], ["--jobs", "2"]):
+        monkeypatch.setattr(sys, "argv", ["haystack-pydoc", TEST_CONFIG, str(tmp_path), *extra])
+        cli.main()
+    assert jobs == [0, 2]
+    expected = (Path(__file__).parent / "test_files" / "expected_generators_api.md").read_text()
+    assert (tmp_path / "generators_api.md").read_text() == expected
+
+
+def test_negative_jobs():
+    with pytest.raises(subprocess.CalledProcessError):
+        subprocess.run(["haystack-pydoc", TEST_CONFIG, "--jobs", "-1"], capture_output=True, check=True)
+
+
+def test_memory_options(tmp_path):
+    config_dir = Path(__file__).parent / "test_files"
+    result = subprocess.run(
+        ["haystack-pydoc", str(config_dir), str(tmp_path), "--memory-budget", "1G", "--max-tasks-per-child", "1"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert "peak RSS" in result.stdout
+    expected = (config_dir / "expected_generators_api.md").read_text()
+    assert (tmp_path / "generators_api.md").read_text() == expected
+
+
+def test_invalid_memory_budget():
+    result = subprocess.run(
+        ["haystack-pydoc", TEST_CONFIG, "--memory-budget", "lots"], capture_output=True, text=True, check=False
+    )
+    assert result.returncode != 0
+    assert "Invalid size" in result.stderr
+
+
+@pytest.mark.parametrize(
+    ("options", "message"),
+    [
+        (["--watch", "--profile", "prof", "--incremental"], "--incremental, --profile cannot be used with --watch"),
+        (["--watch", "--memory-budget", "1G"], "--memory-budget cannot be used with --watch"),
+        (["--memory-budget", "1G"], "--memory-budget only applies to a directory of configs"),
+    ],
+)
+def test_ignored_options_are_rejected(tmp_path, options, message):
+    result = subprocess.run(
+        ["haystack-pydoc", TEST_CONFIG, str(tmp_path), *options], capture_output=True, text=True, check=False
+    )
+    assert result.returncode == 2  # noqa: PLR2004
+    assert message in result.stderr
+
+
+def test_json_events(tmp_path):
+    config_dir = Path(__file__).parent / "test_files"
+    cmd = ["haystack-pydoc", str(config_dir), str(tmp_path), "--format", "json", "--incremental"]
+    cmd += ["--cache-dir", str(tmp_path / "cache")]
+
+    def run():
+        stdout = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+        return [json.loads(line) for line in stdout.splitlines()]
+
+    events = run()
+
+    configs = sorted(str(path) for path in config_dir.glob("*.yml"))
+    assert sorted(event["config"] for event in events if event["event"] == "start") == configs
+    finished = {event["config"]: event for event in events if event["event"] == "finish"}
+    assert sorted(finished) == configs
+    for config in configs:
+        starts = [
+            index for index, event in enumerate(events) if event["event"] == "start" and event["config"] == config
+        ]
+        assert starts[0] < events.index(finished[config])
+    generators = finished[str(config_dir / "generators_api.yml")]
+    assert generators["status"] == "ok"
+    assert generators["modules"] == 2  # noqa: PLR2004
+    assert generators["source_bytes"] > 0
+    assert generators["output_bytes"] == (tmp_path / "generators_api.md").stat().st_size
+    assert generators["cache"] == "miss"
+    assert generators["seconds"] >= 0
+    assert events[-1]["event"] == "summary"
+    assert events[-1]["configs"] == len(configs)
+
+    # Both generators configs write generators_api.md, so one of them is rendered again, from the render cache
+    events = run()
+    assert {event["cache"] for event in events if event["event"] == "finish"} == {"hit"}
+    assert events[-1]["skipped"] == len(configs) - 1
+
+
+def test_serve():
+    process = subprocess.Popen(
+        ["haystack-pydoc", "serve", str(Path(__file__).parent / "test_files"), "--port", "0", "--jobs", "1"],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        url = re.search(r"http://\S+/", process.stdout.readline())[0]
+        with urllib.request.urlopen(url + "generators_api") as response:  # noqa: S310
+            page = response.read().decode()
+    finally:
+        process.terminate()
+        process.wait()
+    assert page == (Path(__file__).parent / "test_files" / "expected_generators_api.md").read_text()
+
+
+def test_profile(tmp_path):
+    profile_dir = tmp_path / "profile"
+    subprocess.run(
+        ["haystack-pydoc", TEST_CONFIG, str(tmp_path), "--profile", str(profile_dir), "--cprofile"], check=True
+    )
+    report = json.loads((profile_dir / "profile.json").read_text())
+    assert list(report["configs"]) == [TEST_CONFIG]
+    assert {"yaml", "read", "visit", "render", "write"} <= set(report["stages"])
+    assert report["cprofile"]
+
+
+HEAVY_MODULES = {"griffe", "griffe2md", "black", "jinja2", "mdformat", "yaml"}
+# Generous, CI machines are slow: without the heavy modules, importing the CLI takes a few tens of milliseconds
+IMPORT_BUDGET_US = 150_000
+
+
+def _imports(args: list[str]) -> dict[str, int]:
+    """Run the CLI with `python -X importtime` and return the cumulative import time of each module, in µs."""
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], capture_output=True, text=True, check=False)
+    imports = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            imports[name.strip()] = int(cumulative)
+    return imports
+
+
+def test_cli_import_budget():
+    imports = _imports(["-c", "import haystack_pydoc_tools.cli"])
+    assert not HEAVY_MODULES & imports.keys()
+    assert imports["haystack_pydoc_tools.cli"] < IMPORT_BUDGET_US
+
+
+def test_help_skips_heavy_imports():
+    imports = _imports(["-m", "haystack_pydoc_tools.cli", "--help"])
+    assert "haystack_pydoc_tools" in imports
+    assert not HEAVY_MODULES & imports.keys()
+
+
+def test_up_to_date_config_skips_heavy_imports(tmp_path):
+    args = ["-m", "haystack_pydoc_tools.cli", TEST_CONFIG, str(tmp_path), "--incremental"]
+    assert "griffe" in _imports(args)
+    # Only the config (yaml) and the manifest are needed to find out that the output is up to date
+    assert not (HEAVY_MODULES - {"yaml"}) & _imports(args).keys()
+
+
+def test_parse_then_render(tmp_path):
+    ir = tmp_path / "ir" / "api.ir.gz"
+    subprocess.run(["haystack-pydoc", "parse", TEST_CONFIG, str(ir), "--jobs", "0"], check=True)
+    subprocess.run(["haystack-pydoc", "render", TEST_CONFIG, str(ir), str(tmp_path / "out")], check=True)
+    content = (tmp_path / "out" / "generators_api.md").read_text()
+    assert content == (Path(__file__).parent / "test_files" / "expected_generators_api.md").read_text()
+
+
+def test_render_invalid_ir(tmp_path):
+    ir = tmp_path / "api.ir"
+    ir.write_text("not an IR\n")
+    result = subprocess.run(["haystack-pydoc", "render", TEST_CONFIG, str(ir)], capture_output=True, check=False)
+    assert result.returncode != 0
+    assert b"not a haystack-pydoc IR file" in result.stderr
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pytest
+
+from haystack_pydoc_tools.config import load_config, module_keys
+
+TEST_FILES = Path(__file__).parent / "test_files"
+
+
+def test_load_legacy_config():
+    config = load_config(str(TEST_FILES / "generators_api.yml"))
+    assert len(config.loaders) == 1
+    assert config.loaders[0].search_paths == [str((TEST_FILES / "components" / "generators").resolve())]
+    assert config.loaders[0].modules == ["chat/azure", "chat/openai"]
+    assert config.filename == "generators_api.md"
+    assert config.doc_id == "generators-api"
+    assert config.show_if_no_docstring is False
+    assert config.skip_empty_modules is True
+
+
+def test_load_config_with_output_dir(tmp_path):
+    config = load_config(str(TEST_FILES / "simpler_generators_api.yml"), str(tmp_path))
+    assert config.filename == str(tmp_path / "generators_api.md")
+
+
+def test_signature_formatter_option(tmp_path):
+    config_path = tmp_path / "config.yml"
+    config_path.write_text(
+        (TEST_FILES / "simpler_generators_api.yml")
+        .read_text()
+        .replace("renderer:", "renderer:\n  signature_formatter: fast")
+    )
+    assert load_config(str(config_path)).signature_formatter == "fast"
+    assert load_config(str(TEST_FILES / "simpler_generators_api.yml")).signature_formatter == "black"
+
+
+def test_replace_processors(tmp_path):
+    config_path = tmp_path / "config.yml"
+    config_path.write_text(
+        "loaders:\n  - search_path: [src]\n    modules: [a]\n"
+        "processors:\n"
+        "  - type: filter\n    documented_only: true\n"
+        "  - type: replace\n    pattern: '^:::note$'\n    replacement: ':::info'\n"
+        "  - type: replace\n    pattern: 'TODO'\n    trigger: 'TODO'\n"
+        "renderer:\n  title: T\n  id: t\n  description: D\n  filename: t.md\n"
+    )
+    config = load_config(str(config_path))
+    assert config.postprocess_rules == [
+        {"pattern": "^:::note$", "replacement": ":::info"},
+        {"pattern": "TODO", "replacement": "", "trigger": "TODO"},
+    ]
+    assert config.renderer_settings()["postprocess_rules"] == config.postprocess_rules
+
+
+def test_invalid_replace_pattern(tmp_path):
+    config_path = tmp_path / "config.yml"
+    config_path.write_text(
+        "loaders:\n  - search_path: [src]\n    modules: [a]\n"
+        "processors:\n  - type: replace\n    pattern: '(unclosed'\n"
+        "renderer:\n  title: T\n  id: t\n  description: D\n  filename: t.md\n"
+    )
+    with pytest.raises(ValueError, match="Invalid post-processing pattern"):
+        load_config(str(config_path))
+
+
+def test_multiple_loaders_and_search_paths(tmp_path):
+    for path in ["core/shared.py", "core/b.py", "extra/a.py", "extra/shared.py"]:
+        (tmp_path / path).parent.mkdir(exist_ok=True)
+        (tmp_path / path).write_text('"""Docstring."""\n')
+    config_path = tmp_path / "config.yml"
+    config_path.write_text(
+        "loaders:\n"
+        "  - search_path: [core, extra]\n    modules: [shared, a]\n"
+        "  - search_path: [extra]\n    modules: [b, a]\n"
+        "  - search_path: [core]\n    modules: [shared]\n"
+        "renderer:\n  title: T\n  id: t\n  description: D\n  filename: out.md\n"
+    )
+    config = load_config(str(config_path))
+    core, extra = str((tmp_path / "core").resolve()), str((tmp_path / "extra").resolve())
+    assert [loader.search_paths for loader in config.loaders] == [[core, extra], [extra], [core]]
+    # Each loader's modules in order, looked up in its search paths in order, listed once
+    assert module_keys(config) == [(extra, "a"), (core, "shared"), (extra, "b")]
@@ -0,0 +1,129 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from haystack_pydoc_tools.config import load_config, module_keys
+from haystack_pydoc_tools.discovery import discover_modules, find_root, module_filepath, module_index
+
+
+def _touch(path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('"""Docstring."""\n')
+    return path
+
+
+def test_module_index(tmp_path):
+    module = _touch(tmp_path / "pkg" / "module.py")
+    package = _touch(tmp_path / "pkg" / "sub" / "__init__.py")
+    _touch(tmp_path / "pkg" / "sub.py")
+    _touch(tmp_path / ".venv" / "hidden.py")
+    _touch(tmp_path / "pkg" / "__pycache__" / "cached.py")
+    (tmp_path / "pkg" / "loop").symlink_to(tmp_path)
+
+    index = module_index(tmp_path)
+    assert index["pkg/module"] == module
+    # Packages take precedence over modules of the same name
+    assert index["pkg/sub"] == package
+    assert not any(name.startswith(".venv") or "__pycache__" in name for name in index)
+    assert "pkg/loop/pkg/module" not in index
+
+
+def test_module_filepath(tmp_path):
+    module = _touch(tmp_path / "pkg" / "module.py")
+    module_index.cache_clear()
+    assert module_filepath(tmp_path, "pkg.module") == module
+    assert module_filepath(tmp_path, "pkg/module") == module
+    assert module_filepath(tmp_path, "pkg/missing") == tmp_path / "pkg" / "missing.py"
+
+
+def test_find_root(tmp_path):
+    first, second = tmp_path / "first", tmp_path / "second"
+    _touch(first / "a.py")
+    _touch(second / "a.py")
+    _touch(second / "b.py")
+    search_paths = [str(first), str(second)]
+    assert find_root(search_paths, "a") == str(first)
+    assert find_root(search_paths, "b") == str(second)
+    assert find_root(search_paths, "missing") == str(first)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for name in [
+        "haystack/__init__.py",
+        "haystack/components/__init__.py",
+        "haystack/components/builders/prompt.py",
+        "haystack/components/generators/__init__.py",
+        "haystack/components/generators/openai.py",
+        "haystack/components/generators/tests/test_openai.py",
+        "haystack/document_stores/in_memory.py",
+    ]:
+        _touch(tmp_path / name)
+    return tmp_path
+
+
+def test_discover_recursive(tree):
+    assert discover_modules([str(tree)], "haystack.components.**") == [
+        "haystack.components",
+        "haystack.components.builders.prompt",
+        "haystack.components.generators",
+        "haystack.components.generators.openai",
+        "haystack.components.generators.tests.test_openai",
+    ]
+
+
+def test_discover_glob(tree):
+    assert discover_modules([str(tree)], "haystack/*/*") == [
+        "haystack/components/generators",
+        "haystack/document_stores/in_memory",
+    ]
+    assert discover_modules([str(tree)], "haystack.**.open?i") == ["haystack.components.generators.openai"]
+    assert discover_modules([str(tree)], "haystack.missing.**") == []
+
+
+def test_discover_ignore(tree):
+    ignore = ["__init__", "tests"]
+    assert discover_modules([str(tree)], "haystack.**", ignore) == [
+        "haystack.components.builders.prompt",
+        "haystack.components.generators.openai",
+        "haystack.document_stores.in_memory",
+    ]
+
+
+def test_module_index_rescans_changed_directories_only(tree, monkeypatch):
+    # Directories modified in the last second are always listed again
+    for directory, _, _ in os.walk(tree):
+        os.utime(directory, ns=(0, 0))
+    module_index.cache_clear()
+    module_index(tree)
+    _touch(tree / "haystack" / "components" / "builders" / "answer.py")
+    module_index.cache_clear()
+
+    scanned = []
+    scandir = os.scandir
+
+    def counting_scandir(path):
+        scanned.append(Path(path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", counting_scandir)
+    assert "haystack/components/builders/answer" in module_index(tree)
+    assert scanned == [tree / "haystack" / "components" / "builders"]
+
+
+def test_config_patterns(tree):
+    config_path = tree / "config.yml"
+    config_path.write_text(
+        "loaders:\n"
+        "  - search_path: [.]\n"
+        "    modules: [haystack.components.**, haystack.document_stores.in_memory]\n"
+        "    ignore_when_discovered: [__init__, tests]\n"
+        "renderer:\n  title: T\n  id: t\n  description: D\n  filename: out.md\n"
+    )
+    root = str(tree.resolve())
+    assert module_keys(load_config(str(config_path))) == [
+        (root, "haystack.components.builders.prompt"),
+        (root, "haystack.components.generators.openai"),
+        (root, "haystack.document_stores.in_memory"),
+    ]
@@ -0,0 +1,100 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from haystack_pydoc_tools import ir
+from haystack_pydoc_tools.ir import IR, parse_to_ir, render_from_ir
+from haystack_pydoc_tools.scheduler import SerialExecutor
+
+TEST_FILES = Path(__file__).parent / "test_files"
+EXPECTED = (TEST_FILES / "expected_generators_api.md").read_text()
+
+CONFIG = """
+loaders:
+  - search_path: [components/generators]
+    modules: {modules}
+renderer:
+  title: {title}
+  id: generators-api
+  description: Enables text generation using LLMs.
+  filename: generators_api.md
+"""
+
+
+def _render(config, ir_path, output_dir):
+    output_dir.mkdir(exist_ok=True)
+    return render_from_ir([config], ir_path, str(output_dir), report=lambda _: None)
+
+
+@pytest.mark.parametrize("name", ["api.ir", "api.ir.gz"])
+def test_round_trip(project, tmp_path, name):
+    config = project / "generators_api.yml"
+    assert parse_to_ir([config], project / name, executor=SerialExecutor()) == 2  # noqa: PLR2004
+    results = _render(config, project / name, tmp_path / "out")
+    assert [result.status for result in results] == ["ok"]
+    assert (tmp_path / "out" / "generators_api.md").read_text() == EXPECTED
+
+
+def test_unchanged_sources_give_identical_ir(project):
+    config = project / "generators_api.yml"
+    parse_to_ir([config], project / "api.ir.gz", executor=SerialExecutor())
+    first = (project / "api.ir.gz").read_bytes()
+    (project / "api.ir.gz").unlink()
+    parse_to_ir([config], project / "api.ir.gz", executor=SerialExecutor())
+    assert (project / "api.ir.gz").read_bytes() == first
+
+
+def test_render_another_checkout_without_sources(project, tmp_path):
+    (project / "build").mkdir()
+    parse_to_ir([project / "generators_api.yml"], project / "build" / "api.ir", executor=SerialExecutor())
+    checkout = tmp_path / "checkout"
+    shutil.copytree(project, checkout)
+    shutil.rmtree(checkout / "components")
+
+    results = _render(checkout / "generators_api.yml", checkout / "build" / "api.ir", tmp_path / "out")
+    assert [result.status for result in results] == ["ok"]
+    assert (tmp_path / "out" / "generators_api.md").read_text() == EXPECTED
+
+
+def test_render_after_config_change(project, tmp_path):
+    config = project / "generators_api.yml"
+    parse_to_ir([config], project / "api.ir", executor=SerialExecutor())
+
+    # Fewer modules, selected with a pattern, and a different title
+    config.write_text(CONFIG.format(modules="[chat/az*]", title="Azure"))
+    _render(config, project / "api.ir", tmp_path / "out")
+    content = (tmp_path / "out" / "generators_api.md").read_text()
+    assert 'title: "Azure"' in content
+    assert "## chat/azure" in content
+    assert "## chat/openai" not in content
+
+
+def test_module_missing_from_ir(project, tmp_path):
+    config = project / "generators_api.yml"
+    parse_to_ir([config], project / "api.ir", executor=SerialExecutor())
+    config.write_text(CONFIG.format(modules="[chat/azure, chat/hugging_face_api]", title="Generators"))
+
+    results = _render(config, project / "api.ir", tmp_path / "out")
+    assert results[0].status == "failed"
+    assert "chat/hugging_face_api" in str(results[0].error)
+
+
+def test_incompatible_ir(project, monkeypatch):
+    ir_path = project / "api.ir"
+    parse_to_ir([project / "generators_api.yml"], ir_path, executor=SerialExecutor())
+    lines = ir_path.read_text().splitlines(keepends=True)
+
+    ir_path.write_text(json.dumps({"format": "haystack-pydoc-ir", "version": 0}) + "\n" + "".join(lines[1:]))
+    with pytest.raises(ValueError, match="IR version 0"):
+        IR(ir_path)
+
+    ir_path.write_text("".join(lines))
+    monkeypatch.setattr(ir, "package_version", lambda _: "0.0.0")
+    with pytest.raises(ValueError, match="parsed with griffe"):
+        IR(ir_path)
+
+    ir_path.write_text("not an IR\n")
+    with pytest.raises(ValueError, match="not a haystack-pydoc IR file"):
+        IR(ir_path)
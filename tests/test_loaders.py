@@ -1,8 +1,19 @@
 from pathlib import Path
 
 import griffe
+import pytest
+from griffe2md import render_object_docs
 
-from haystack_pydoc_tools.loaders import load_modules
+from haystack_pydoc_tools import loaders
+from haystack_pydoc_tools.cache import dump_module
+from haystack_pydoc_tools.loaders import (
+    DataclassesVisitorExtension,
+    can_render,
+    load_module_keys,
+    load_modules,
+    prune_members,
+)
+from haystack_pydoc_tools.renderers import GRIFFE2MD_DEFAULT_CONFIG
 
 TEST_FILES = Path(__file__).parent / "test_files"
 TEST_COMPONENTS = str(TEST_FILES / "components" / "generators")
@@ -53,3 +64,284 @@ def test_dataclass_init_synthesized():
     init = cls.members["__init__"]
     param_names = [p.name for p in init.parameters]
     assert param_names == ["self", "data", "meta", "mime_type"]
+
+
+DATACLASS_SHAPES = """
+import dataclasses
+from dataclasses import KW_ONLY, InitVar, field
+from dataclasses import dataclass as dc
+from functools import total_ordering
+
+
+@dc
+class Base:
+    name: str
+    seed: InitVar[int]
+    tags: list[str] = field(default_factory=list)
+
+
+@dc(kw_only=True)
+class Child(Base):
+    score: float = 0.0
+    hidden: int = field(init=False, default=0)
+
+    @dataclasses.dataclass
+    class Nested:
+        value: int
+
+
+class Grandchild(Child):
+    extra: int = 1
+
+
+@dc(init=False)
+class NoInit:
+    value: int
+
+
+@dc
+class WithKwOnly:
+    first: int
+    _: KW_ONLY
+    second: int = 2
+
+
+@total_ordering
+class Ordered:
+    value: int
+
+
+class Plain:
+    value: int
+
+    def method(self) -> None:
+        pass
+
+
+@dc
+class Redefined:
+    old: int
+
+
+@dc
+class Redefined:
+    new: int
+"""
+
+
+class _FullWalk(griffe.Extension):
+    def on_module_members(self, *, mod, **kwargs):  # noqa: ARG002
+        griffe.DataclassesExtension().on_package(pkg=mod)
+
+
+@pytest.mark.parametrize(
+    "code",
+    [DATACLASS_SHAPES, (Path(TEST_DATACLASSES) / "dataclasses" / "byte_stream.py").read_text()],
+    ids=["shapes", "byte_stream"],
+)
+def test_dataclass_candidates_match_full_walk(code):
+    # Guards the per-class helpers imported from griffe's internals: the installed griffe must provide them,
+    # and they must synthesize the same __init__ as griffe's public extension
+    assert loaders._set_dataclass_init is not None
+
+    def load(extension):
+        module = griffe.visit("shapes", filepath=Path("shapes.py"), code=code, extensions=griffe.Extensions(extension))
+        return dump_module(module)
+
+    assert load(DataclassesVisitorExtension()) == load(_FullWalk())
+
+
+def test_dataclass_extension_forgets_visited_modules():
+    extension = DataclassesVisitorExtension()
+    griffe.visit("shapes", filepath=Path("shapes.py"), code=DATACLASS_SHAPES, extensions=griffe.Extensions(extension))
+    assert extension._classes == []
+
+    module = griffe.visit(
+        "other", filepath=Path("other.py"), code=DATACLASS_SHAPES, extensions=griffe.Extensions(extension)
+    )
+    assert [p.name for p in module["Base.__init__"].parameters] == ["self", "name", "seed", "tags"]
+    assert extension._classes == []
+
+
+def test_dataclass_candidates_synthesize_init():
+    module = griffe.visit(
+        "shapes",
+        filepath=Path("shapes.py"),
+        code=DATACLASS_SHAPES,
+        extensions=griffe.Extensions(DataclassesVisitorExtension()),
+    )
+    assert [p.name for p in module["Base.__init__"].parameters] == ["self", "name", "seed", "tags"]
+    assert "seed" not in module["Base"].members
+    assert [p.name for p in module["Child.Nested.__init__"].parameters] == ["self", "value"]
+    assert [p.kind.value for p in module["WithKwOnly.__init__"].parameters][1:] == [
+        "positional or keyword",
+        "keyword-only",
+    ]
+    assert [p.name for p in module["Redefined.__init__"].parameters] == ["self", "new"]
+
+
+def test_parallel_load_matches_sequential():
+    names = ["chat/openai", "chat/azure"]
+    sequential = load_modules(TEST_COMPONENTS, names)
+    parallel = load_modules(TEST_COMPONENTS, names, workers=2)
+    assert [m.name for m in parallel] == [m.name for m in sequential]
+    for left, right in zip(parallel, sequential):
+        assert render_object_docs(left, GRIFFE2MD_DEFAULT_CONFIG) == render_object_docs(right, GRIFFE2MD_DEFAULT_CONFIG)
+
+
+def test_parallel_load_synthesizes_dataclass_init():
+    modules = load_modules(
+        TEST_DATACLASSES, ["dataclasses.byte_stream", "components.generators.chat.openai"], workers=2
+    )
+    init = modules[1].members["ByteStream"].members["__init__"]
+    assert [p.name for p in init.parameters] == ["self", "data", "meta", "mime_type"]
+
+
+def test_load_module_keys_from_several_roots():
+    keys = [
+        (str(Path(TEST_COMPONENTS).resolve()), "chat/openai"),
+        (str(TEST_FILES.resolve()), "dataclasses.byte_stream"),
+    ]
+    modules = load_module_keys(keys)
+    # In the order of the keys, each with the parent of its own root
+    assert [module.name for module in modules] == ["chat/openai", "dataclasses.byte_stream"]
+    init = modules[1].members["ByteStream"].members["__init__"]
+    assert [p.name for p in init.parameters] == ["self", "data", "meta", "mime_type"]
+
+
+PRUNED_SOURCE = '''
+"""Module docstring."""
+
+
+def _private():
+    """Documented, but private."""
+
+
+def undocumented():
+    pass
+
+
+class _Hidden:
+    """Private class."""
+
+
+class Documented:
+    """A class."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def _helper(self):
+        """Private method."""
+
+    def run(self):
+        """Public method."""
+
+    def other(self):
+        pass
+
+
+class OnlyMembersDocumented:
+    def run(self):
+        """Public method."""
+
+
+class OnlyPrivateDocumented:
+    def _run(self):
+        """Private method, making the class documented."""
+'''
+
+
+@pytest.mark.parametrize("show_if_no_docstring", [False, True])
+def test_prune_members_keeps_rendered_markdown(show_if_no_docstring):
+    def visit():
+        return griffe.visit("pruned", filepath=Path("pruned.py"), code=PRUNED_SOURCE)
+
+    config = {**GRIFFE2MD_DEFAULT_CONFIG, "show_if_no_docstring": show_if_no_docstring}
+    module = visit()
+    assert prune_members(module, documented_only=not show_if_no_docstring) > 0
+    assert render_object_docs(module, config) == render_object_docs(visit(), config)
+
+    assert module.members["_private"].is_alias
+    assert module.members["_private"].target_path == "pruned._private"
+    assert module["Documented"].members["_helper"].is_alias
+    # Keeps the signature of the class
+    assert not module["Documented"].members["__init__"].is_alias
+    assert module.members["undocumented"].is_alias is not show_if_no_docstring
+    assert module["Documented"].members["other"].is_alias is not show_if_no_docstring
+    # Decided on the class before its members are pruned, and still documented through its private method
+    assert not module.members["OnlyPrivateDocumented"].is_alias
+    assert not module["OnlyPrivateDocumented"].members["_run"].is_alias
+
+
+VARIABLES_SOURCE = '''
+"""Module docstring."""
+
+
+class Base:
+    """
+    A base class.
+
+    :ivar inherited: Defined by the base class.
+    """
+
+    def __init__(self):
+        self.inherited = 0
+
+
+class Holder(Base):
+    """
+    Holds things.
+
+    :ivar extra_info: Undocumented, but named in a field.
+    :ivar _store: Private, but named in a field.
+    """
+
+    def __init__(self):
+        self.extra_info: dict = {}
+        self._store: list = []
+'''
+
+
+@pytest.mark.parametrize("show_if_no_docstring", [False, True])
+def test_prune_members_keeps_documented_variables(show_if_no_docstring):
+    def visit():
+        return griffe.visit(
+            "variables", filepath=Path("variables.py"), code=VARIABLES_SOURCE, docstring_parser="sphinx"
+        )
+
+    config = {**GRIFFE2MD_DEFAULT_CONFIG, "show_if_no_docstring": show_if_no_docstring}
+    module = visit()
+    prune_members(module, documented_only=not show_if_no_docstring)
+    # Parsing the docstring reads the annotation of each variable field from the member of that name
+    assert render_object_docs(module, config) == render_object_docs(visit(), config)
+    assert "(#variables.Holder.extra_info) (<code>[dict](#dict)</code>)" in render_object_docs(module, config)
+
+    assert not module["Holder"].members["extra_info"].is_alias
+    assert not module["Holder"].members["_store"].is_alias
+    assert not module["Base"].members["inherited"].is_alias
+
+
+def test_load_modules_prunes_filtered_members():
+    code = (Path(TEST_COMPONENTS) / "chat" / "openai.py").read_text()
+    unpruned = griffe.visit("chat/openai", filepath=Path("openai.py"), code=code, docstring_parser="sphinx")
+    [module] = load_modules(TEST_COMPONENTS, ["chat/openai"])
+    [documented] = load_modules(TEST_COMPONENTS, ["chat/openai"], documented_only=True)
+
+    private = [name for name in unpruned["OpenAIChatGenerator"].members if name.startswith("_") and name != "__init__"]
+    assert private
+    assert all(module["OpenAIChatGenerator"].members[name].is_alias for name in private)
+    assert render_object_docs(documented, GRIFFE2MD_DEFAULT_CONFIG) == render_object_docs(
+        module, GRIFFE2MD_DEFAULT_CONFIG
+    )
+    assert can_render(module, documented_only=False)
+    assert can_render(documented, documented_only=True)
+    assert not can_render(documented, documented_only=False)
+
+
+def test_load_modules_releases_dataclass_parameters():
+    from griffe._internal.extensions.dataclasses import _dataclass_parameters
+
+    load_modules(TEST_DATACLASSES, ["dataclasses.byte_stream"])
+    # Memoized by griffe per class: kept, it would hold every module loaded by the process
+    assert _dataclass_parameters.cache_info().currsize == 0
@@ -0,0 +1,66 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from haystack_pydoc_tools import manifest as manifest_module
+from haystack_pydoc_tools.config import load_config
+from haystack_pydoc_tools.manifest import build_manifest, is_up_to_date, manifest_path, write_manifest
+
+TEST_FILES = Path(__file__).parent / "test_files"
+
+
+@pytest.fixture
+def config_copy(tmp_path):
+    shutil.copytree(TEST_FILES / "components", tmp_path / "components")
+    shutil.copy(TEST_FILES / "simpler_generators_api.yml", tmp_path / "config.yml")
+    return load_config(str(tmp_path / "config.yml"), str(tmp_path / "out"))
+
+
+def _write_output(config):
+    Path(config.filename).parent.mkdir(exist_ok=True)
+    Path(config.filename).write_text("# docs")
+    write_manifest(config.filename, build_manifest(config))
+
+
+def test_manifest_records_inputs(config_copy):
+    manifest = build_manifest(config_copy)
+    assert set(manifest) >= {"tool", "griffe2md", "black", "mdformat", "config", "sources", "renderer"}
+    assert len(manifest["sources"]) == 2  # noqa: PLR2004
+    assert manifest["renderer"]["doc_id"] == "generators-api"
+
+
+def test_up_to_date_after_write(config_copy):
+    assert not is_up_to_date(config_copy.filename, build_manifest(config_copy))
+    _write_output(config_copy)
+    assert manifest_path(config_copy.filename).is_file()
+    assert is_up_to_date(config_copy.filename, build_manifest(config_copy))
+
+
+def test_source_change_invalidates(config_copy):
+    _write_output(config_copy)
+    source = Path(config_copy.loaders[0].search_paths[0]) / "chat" / "azure.py"
+    source.write_text(source.read_text() + "\n# changed\n")
+    assert not is_up_to_date(config_copy.filename, build_manifest(config_copy))
+
+
+def test_config_change_invalidates(config_copy):
+    _write_output(config_copy)
+    Path(config_copy.path).write_text(Path(config_copy.path).read_text() + "\n")
+    assert not is_up_to_date(config_copy.filename, build_manifest(config_copy))
+
+
+@pytest.mark.parametrize("package", ["black", "mdformat"])
+def test_formatter_upgrade_invalidates(config_copy, monkeypatch, package):
+    _write_output(config_copy)
+    package_version = manifest_module.package_version
+    monkeypatch.setattr(
+        manifest_module, "package_version", lambda name: "99.0" if name == package else package_version(name)
+    )
+    assert not is_up_to_date(config_copy.filename, build_manifest(config_copy))
+
+
+def test_edited_output_invalidates(config_copy):
+    _write_output(config_copy)
+    Path(config_copy.filename).write_text("# edited")
+    assert not is_up_to_date(config_copy.filename, build_manifest(config_copy))
@@ -0,0 +1,36 @@
+import sys
+
+import pytest
+
+from haystack_pydoc_tools.memory import measured, parse_size, peak_rss, reset_peak_rss
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("1024", 1024), ("512M", 512 * 1024**2), ("1.5G", 1536 * 1024**2), ("4GB", 4 * 1024**3), ("64kib", 64 * 1024)],
+)
+def test_parse_size(value, expected):
+    assert parse_size(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "G", "-1G", "1X", "one gigabyte"])
+def test_parse_invalid_size(value):
+    with pytest.raises(ValueError, match="Invalid size"):
+        parse_size(value)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="RSS is not measured on Windows")
+def test_peak_rss_grows_with_allocations():
+    data = b"x" * 64 * 1024**2
+    assert peak_rss() >= len(data)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="the peak can only be reset on Linux")
+def test_measured_resets_the_peak():
+    data = b"x" * 128 * 1024**2
+    peak = peak_rss()
+    del data
+    result, rss = measured(len, "abc")
+    assert result == 3  # noqa: PLR2004
+    assert rss < peak - 64 * 1024**2
+    assert reset_peak_rss()
@@ -0,0 +1,178 @@
+import gc
+import pickle
+import sys
+import weakref
+from pathlib import Path
+
+import griffe
+import pytest
+
+from haystack_pydoc_tools.cache import dump_module
+from haystack_pydoc_tools.loaders import load_modules
+from haystack_pydoc_tools.model import DocAlias, DocClass, DocFunction, DocModule, DocObject, DocTypeAlias, compact
+from haystack_pydoc_tools.renderers import GRIFFE2MD_DEFAULT_CONFIG, render_module
+
+TEST_FILES = Path(__file__).parent / "test_files"
+TEST_COMPONENTS = str(TEST_FILES / "components" / "generators")
+
+ALIASED_SOURCE = '''
+"""Module docstring."""
+
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+from collections import OrderedDict as Ordered
+
+T = TypeVar("T")
+
+
+@dataclass
+class Point:
+    """A point."""
+
+    x: int
+    y: int = 0
+
+
+class Box(Generic[T]):
+    """A box."""
+
+    def __init__(self, item: T, history: Ordered[str, Point] | None = None, *args, flag: bool = False, **kwargs):
+        """
+        Create a box.
+
+        :param item: The item.
+        :param history: Where the box went.
+        """
+
+    def get(self) -> T:
+        """
+        Return the item.
+
+        :returns: The item.
+        """
+'''
+
+
+UNDOCUMENTED_SOURCE = '''
+"""Module docstring."""
+
+
+def undocumented(value: int = 1) -> int:
+    return value
+
+
+class Documented:
+    """A class."""
+
+    def run(self, *items: str):
+        pass
+
+    def _helper(self):
+        """Private method."""
+'''
+
+
+@pytest.mark.parametrize(
+    ("root", "name"), [(TEST_COMPONENTS, "chat/openai"), (str(TEST_FILES), "dataclasses.byte_stream")]
+)
+def test_compact_module_renders_the_same(root, name):
+    [module] = load_modules(root, [name], documented_only=True)
+    expected = render_module(module, GRIFFE2MD_DEFAULT_CONFIG)
+
+    doc_module = pickle.loads(pickle.dumps(compact(module)))  # noqa: S301
+    assert isinstance(doc_module, DocModule)
+    assert render_module(doc_module, GRIFFE2MD_DEFAULT_CONFIG) == expected
+
+
+def test_compact_module_renders_undocumented_objects(tmp_path):
+    (tmp_path / "undocumented.py").write_text(UNDOCUMENTED_SOURCE)
+    config = {**GRIFFE2MD_DEFAULT_CONFIG, "show_if_no_docstring": True}
+    [module] = load_modules(str(tmp_path), ["undocumented"])
+    expected = render_module(module, config)
+    assert "undocumented" in expected
+
+    assert render_module(compact(module), config) == expected
+
+
+def test_compact_module_keeps_signatures(tmp_path):
+    (tmp_path / "aliased.py").write_text(ALIASED_SOURCE)
+    [module] = load_modules(str(tmp_path), ["aliased"])
+    expected = render_module(module, GRIFFE2MD_DEFAULT_CONFIG)
+    doc_module = compact(module)
+    del module
+
+    members = {member.name: member for member in doc_module.members}
+    assert isinstance(members["Ordered"], DocAlias)
+    assert members["Ordered"].target_path == "collections.OrderedDict"
+    box = members["Box"]
+    assert isinstance(box, DocClass)
+    assert [str(base) for base in box.bases] == ["Generic[T]"]
+    init = next(member for member in box.members if member.name == "__init__")
+    assert isinstance(init, DocFunction)
+    assert [parameter.name for parameter in init.parameters] == ["self", "item", "history", "args", "flag", "kwargs"]
+    # Names keep the path they resolve to, even when imported under another name
+    assert init.parameters[2].annotation.left.left.canonical_path == "collections.OrderedDict"
+    point_init = next(member for member in members["Point"].members if member.name == "__init__")
+    assert [parameter.name for parameter in point_init.parameters] == ["self", "x", "y"]
+
+    assert render_module(doc_module, GRIFFE2MD_DEFAULT_CONFIG) == expected
+
+
+def test_compact_module_releases_griffe_objects():
+    [module] = load_modules(TEST_COMPONENTS, ["chat/openai"])
+    ref = weakref.ref(module["OpenAIChatGenerator"])
+    doc_module = compact(module)
+    del module
+    gc.collect()
+    assert ref() is None
+    assert doc_module.name == "chat/openai"
+
+
+def test_dump_compact_module():
+    [module] = load_modules(TEST_COMPONENTS, ["chat/azure"])
+    expected = dump_module(module)
+    assert dump_module(compact(module)) == expected
+    assert isinstance(griffe.Object.from_json(expected), griffe.Module)
+
+
+def test_compact_module_keeps_type_aliases():
+    # Built by hand: griffe only visits `type` statements on Python 3.12 and later
+    module = griffe.Module("aliases", filepath=Path("aliases.py"))
+    module.set_member(
+        "Pairs",
+        griffe.TypeAlias(
+            "Pairs",
+            value="list[tuple[T, T]]",
+            type_parameters=griffe.TypeParameters(griffe.TypeParameter("T", kind=griffe.TypeParameterKind.type_var)),
+            lineno=1,
+            endlineno=1,
+            docstring=griffe.Docstring("Pairs of items.", lineno=2, endlineno=2),
+        ),
+    )
+    expected = dump_module(module)
+
+    doc_module = compact(module)
+    [pairs] = doc_module.members
+    assert isinstance(pairs, DocTypeAlias)
+    assert pairs.value == "list[tuple[T, T]]"
+    assert [parameter.name for parameter in pairs.type_parameters] == ["T"]
+    assert dump_module(doc_module) == expected
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="`type` statements need Python 3.12")
+def test_compact_module_with_type_statement(tmp_path):
+    (tmp_path / "aliases.py").write_text('"""Module docstring."""\n\ntype Pairs[T] = list[tuple[T, T]]\n')
+    [module] = load_modules(str(tmp_path), ["aliases"])
+    expected = render_module(module, GRIFFE2MD_DEFAULT_CONFIG)
+
+    doc_module = compact(module)
+    assert isinstance(doc_module.members[0], DocTypeAlias)
+    assert render_module(doc_module, GRIFFE2MD_DEFAULT_CONFIG) == expected
+
+
+def test_doc_object_kinds_must_create_their_griffe_object():
+    class DocIncomplete(DocObject):
+        __slots__ = ()
+
+    with pytest.raises(TypeError, match="_create"):
+        DocIncomplete(griffe.Function("incomplete"))
@@ -0,0 +1,33 @@
+import pytest
+
+from haystack_pydoc_tools.postprocessing import DEFAULT_RULES, Pipeline, Rule
+
+
+def test_default_rules():
+    pipeline = Pipeline()
+    assert pipeline.rules == DEFAULT_RULES
+    assert pipeline("## `chat.azure`\nSee [Foo](#foo) and [Bar](https://bar).\n") == (
+        "## chat.azure\nSee Foo and [Bar](https://bar).\n"
+    )
+
+
+def test_extra_rules_run_after_default_rules():
+    pipeline = Pipeline([Rule(r"^## (.+)$", r"## API: \1"), {"pattern": "Foo", "replacement": "Baz"}])
+    assert pipeline("## `chat.azure`\nSee [Foo](#foo).\n") == "## API: chat.azure\nSee Baz.\n"
+
+
+def test_rule_skipped_without_trigger(monkeypatch):
+    rule = Rule(r"\[([^\]]+)\]\(#[^)]+\)", r"\1", trigger="](#")
+    assert rule.apply("[Foo](#foo)") == "Foo"
+
+    class FailingRegex:
+        def sub(self, *args):
+            raise AssertionError("the regex should not run without the trigger")
+
+    object.__setattr__(rule, "regex", FailingRegex())
+    assert rule.apply("no links here") == "no links here"
+
+
+def test_invalid_pattern():
+    with pytest.raises(ValueError, match="Invalid post-processing pattern"):
+        Rule("(unclosed", "")
@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from haystack_pydoc_tools import profiling
+from haystack_pydoc_tools.loaders import load_modules
+from haystack_pydoc_tools.renderers import render_docusaurus
+
+TEST_COMPONENTS = str(Path(__file__).parent / "test_files" / "components" / "generators")
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    # Restore the disabled state after the test
+    monkeypatch.setattr(profiling, "_directory", None)
+    monkeypatch.setattr(profiling, "_profiler", None)
+    directory = tmp_path / "profile"
+    profiling.start(directory)
+    return directory
+
+
+def test_disabled_records_nothing(tmp_path):
+    with profiling.timed("read", module="mod"):
+        pass
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_records_stages_per_config_and_module(tmp_path, profile_dir):
+    with profiling.labels(config="api.yml"):
+        modules = load_modules(TEST_COMPONENTS, ["chat/azure", "chat/openai"])
+        render_docusaurus(modules, title="API", doc_id="api", description="API.", filename=str(tmp_path / "api.md"))
+
+    report = json.loads(profiling.write_report(profile_dir, 1.0).read_text())
+    assert report["wall_seconds"] == 1.0
+    assert list(report["stages"]) == ["read", "visit", "dataclasses", "prune", "render", "postprocess", "write"]
+    assert set(report["configs"]) == {"api.yml"}
+    assert set(report["configs"]["api.yml"]) == {*report["stages"], "total"}
+    assert set(report["modules"]) == {"chat/azure", "chat/openai"}
+    assert set(report["modules"]["chat/azure"]) == {"read", "visit", "dataclasses", "prune", "render", "total"}
+
+    totals = [entry["total"] for entry in report["modules"].values()]
+    assert totals == sorted(totals, reverse=True)
+
+
+def test_start_removes_previous_records(profile_dir):
+    with profiling.timed("yaml", config="old.yml"):
+        pass
+    profiling.start(profile_dir)
+    report = json.loads(profiling.write_report(profile_dir, 0.0).read_text())
+    assert report["configs"] == {}
+
+
+def test_profiled_dumps_stats(profile_dir):
+    profiling.start(profile_dir, cprofile=True)
+    modules = profiling.profiled(load_modules)(TEST_COMPONENTS, ["chat/openai"])
+    assert modules[0].name == "chat/openai"
+    assert len(list(profile_dir.glob("worker-*.prof"))) == 1
@@ -1,10 +1,12 @@
+import os
 import re
 from pathlib import Path
 
 import pytest
+from griffe2md import render_object_docs
 
 from haystack_pydoc_tools.loaders import load_modules
-from haystack_pydoc_tools.renderers import render_docusaurus
+from haystack_pydoc_tools.renderers import GRIFFE2MD_DEFAULT_CONFIG, render_docusaurus, render_module
 
 TEST_COMPONENTS = str(Path(__file__).parent / "test_files" / "components" / "generators")
 
@@ -51,3 +53,71 @@ def test_anchor_links_removed(tmp_path, modules):
     content = out.read_text()
     # There should be no markdown links pointing to anchors
     assert not re.search(r"\[([^\]]+)\]\(#[^)]+\)", content)
+
+
+def test_fast_signature_formatter_matches_black(tmp_path, modules):
+    black_out = tmp_path / "black.md"
+    fast_out = tmp_path / "fast.md"
+    render_docusaurus(modules, title="T", doc_id="t", description="D", filename=str(black_out))
+    render_docusaurus(
+        modules, title="T", doc_id="t", description="D", filename=str(fast_out), signature_formatter="fast"
+    )
+    assert fast_out.read_text() == black_out.read_text()
+
+
+def test_unknown_signature_formatter(tmp_path, modules):
+    with pytest.raises(ValueError, match="Unknown signature_formatter"):
+        render_docusaurus(
+            modules, title="T", doc_id="t", description="D", filename=str(tmp_path / "o.md"), signature_formatter="x"
+        )
+
+
+def test_renders_modules_from_a_generator(tmp_path, modules):
+    expected = tmp_path / "expected.md"
+    render_docusaurus(modules, title="T", doc_id="t", description="D", filename=str(expected))
+    out = tmp_path / "out.md"
+    render_docusaurus((m for m in modules), title="T", doc_id="t", description="D", filename=str(out))
+    assert out.read_text() == expected.read_text()
+
+
+def test_failed_render_keeps_previous_output(tmp_path, modules):
+    out = tmp_path / "out.md"
+    out.write_text("previous")
+
+    def broken_modules():
+        yield modules[0]
+        raise RuntimeError("broken")
+
+    with pytest.raises(RuntimeError):
+        render_docusaurus(broken_modules(), title="T", doc_id="t", description="D", filename=str(out))
+    assert out.read_text() == "previous"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.md"]
+
+
+def test_extra_postprocess_rules(tmp_path, modules):
+    out = tmp_path / "out.md"
+    rules = [{"pattern": r"^\*\*Parameters:\*\*$", "replacement": "**Arguments:**"}]
+    render_docusaurus(modules, title="T", doc_id="t", description="D", filename=str(out), postprocess_rules=rules)
+    content = out.read_text()
+    assert "**Arguments:**" in content
+    assert "**Parameters:**" not in content
+
+
+def test_unchanged_output_is_not_rewritten(tmp_path, modules):
+    out = tmp_path / "out.md"
+    assert render_docusaurus(modules, title="T", doc_id="t", description="D", filename=str(out))
+    os.utime(out, ns=(0, 0))
+
+    assert not render_docusaurus(modules, title="T", doc_id="t", description="D", filename=str(out))
+    assert out.stat().st_mtime_ns == 0
+    assert [p.name for p in tmp_path.iterdir()] == ["out.md"]
+
+    assert render_docusaurus(modules, title="Changed", doc_id="t", description="D", filename=str(out))
+    assert 'title: "Changed"' in out.read_text()
+
+
+@pytest.mark.parametrize("signature_formatter", ["black", "fast"])
+def test_render_module_matches_griffe2md(modules, signature_formatter):
+    config = {**GRIFFE2MD_DEFAULT_CONFIG, "show_if_no_docstring": False}
+    for module in modules:
+        assert render_module(module, config, signature_formatter) == render_object_docs(module, config, format_md=True)
@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+
+from haystack_pydoc_tools.config import load_config
+from haystack_pydoc_tools.scheduler import (
+    MODULE_OVERHEAD,
+    WORKER_MEMORY,
+    Scheduler,
+    SerialExecutor,
+    estimate_cost,
+    estimate_memory,
+    source_size,
+)
+
+TEST_FILES = Path(__file__).parent / "test_files"
+
+
+def test_runs_highest_cost_first():
+    scheduler = Scheduler(SerialExecutor(), slots=1)
+    for cost in [1, 3, 2]:
+        scheduler.submit(cost, cost, lambda value: value * 10, cost)
+    assert [(tag, future.result()) for tag, future in scheduler.completed()] == [(3, 30), (2, 20), (1, 10)]
+
+
+def test_tasks_queued_while_iterating_run_by_cost():
+    scheduler = Scheduler(SerialExecutor(), slots=1)
+    scheduler.submit(5, "first", str)
+    scheduler.submit(1, "cheap", str)
+    order = []
+    for tag, _ in scheduler.completed():
+        order.append(tag)
+        if tag == "first":
+            scheduler.submit(2, "expensive", str)
+    assert order == ["first", "expensive", "cheap"]
+
+
+def test_limits_running_tasks():
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def task():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        scheduler = Scheduler(executor, slots=2)
+        for index in range(6):
+            scheduler.submit(index, index, task)
+        assert len(list(scheduler.completed())) == 6  # noqa: PLR2004
+    assert peak[0] == 2  # noqa: PLR2004
+
+
+def test_serial_executor_captures_errors():
+    future = SerialExecutor().submit(int, "not a number")
+    with pytest.raises(ValueError):
+        future.result()
+
+
+def test_broken_executor_fails_remaining_tasks():
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        scheduler = Scheduler(executor, slots=1)
+        # A worker exiting abruptly, as when it is killed for using too much memory
+        scheduler.submit(2, "killed", os._exit, 1)
+        scheduler.submit(1, "queued", abs, -1)
+        completed = {tag: future.exception() for tag, future in scheduler.completed()}
+    assert list(completed) == ["killed", "queued"]
+    assert all(isinstance(error, BrokenProcessPool) for error in completed.values())
+
+
+def test_estimate_cost():
+    config = load_config(str(TEST_FILES / "generators_api.yml"))
+    search_path = config.loaders[0].search_paths[0]
+    sizes = [source_size(search_path, name) for name in config.loaders[0].modules]
+    assert all(sizes)
+    assert estimate_cost(config) == sum(sizes) + MODULE_OVERHEAD * len(sizes)
+    assert source_size(search_path, "missing") == 0
+
+
+def test_memory_budget_limits_running_tasks():
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def task():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        scheduler = Scheduler(executor, slots=4, memory_budget=100)
+        for index in range(6):
+            scheduler.submit(index, index, task, memory=40)
+        assert len(list(scheduler.completed())) == 6  # noqa: PLR2004
+    assert peak[0] == 2  # noqa: PLR2004
+
+
+def test_task_above_memory_budget_runs_alone():
+    scheduler = Scheduler(SerialExecutor(), slots=4, memory_budget=100)
+    scheduler.submit(2, "big", str, memory=500)
+    scheduler.submit(1, "small", str, memory=10)
+    assert [tag for tag, _ in scheduler.completed()] == ["big", "small"]
+
+
+def test_estimate_memory():
+    assert estimate_memory(0) == WORKER_MEMORY
+    assert estimate_memory(1000) > estimate_memory(10)
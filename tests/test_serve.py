@@ -0,0 +1,135 @@
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures import BrokenExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from haystack_pydoc_tools import serve
+from haystack_pydoc_tools.scheduler import SerialExecutor
+from haystack_pydoc_tools.serve import DocsServer
+
+TEST_FILES = Path(__file__).parent / "test_files"
+
+
+async def _get(port, target):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    response = await reader.read()
+    writer.close()
+    head, body = response.split(b"\r\n\r\n", 1)
+    return int(head.split()[1]), body.decode()
+
+
+def _with_server(target, requests):
+    async def run():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            server = DocsServer(target, executor=executor)
+            started = asyncio.Event()
+            ports = []
+
+            def ready(_host, port):
+                ports.append(port)
+                started.set()
+
+            task = asyncio.create_task(serve.serve(server, port=0, ready=ready))
+            await started.wait()
+            try:
+                return await requests(server, ports[0])
+            finally:
+                task.cancel()
+
+    return asyncio.run(run())
+
+
+def test_serves_pages(project):
+    async def requests(_server, port):
+        return await asyncio.gather(_get(port, "/"), _get(port, "/generators_api"), _get(port, "/missing"))
+
+    index, page, missing = _with_server(project, requests)
+    assert index[0] == 200  # noqa: PLR2004
+    assert json.loads(index[1]) == {"pages": {"generators_api": "/generators_api"}}
+    assert page == (200, (TEST_FILES / "expected_generators_api.md").read_text())
+    assert missing[0] == 404  # noqa: PLR2004
+
+
+def test_renders_again_only_changed_modules(project, parse_calls):
+    azure = project / "components" / "generators" / "chat" / "azure.py"
+
+    async def requests(server, port):
+        pages = await asyncio.gather(*(_get(port, "/generators_api") for _ in range(3)))
+        assert len(set(pages)) == 1
+        assert sorted(parse_calls) == ["chat/azure", "chat/openai"]
+
+        assert await _get(port, "/generators_api") == pages[0]
+        assert len(parse_calls) == 2  # noqa: PLR2004
+
+        azure.write_text(azure.read_text() + "\n\ndef added():\n    '''Added function.'''\n")
+        stat = azure.stat()
+        os.utime(azure, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        status, body = await _get(port, "/generators_api")
+        assert status == 200  # noqa: PLR2004
+        assert "Added function." in body
+        assert parse_calls[2:] == ["chat/azure"]
+        assert len(server.module_cache) == 2  # noqa: PLR2004
+
+    _with_server(project, requests)
+
+
+def test_reports_render_errors(project):
+    (project / "broken.yml").write_text("""
+loaders:
+  - search_path: [components/generators]
+    modules: [chat/missing]
+renderer:
+  title: Broken
+  id: broken
+  description: Broken.
+  filename: broken.md
+""")
+
+    async def requests(_server, port):
+        return await _get(port, "/broken")
+
+    status, body = _with_server(project, requests)
+    assert status == 500  # noqa: PLR2004
+    assert body.startswith("Failed to render broken")
+
+
+def test_replaces_broken_executor(project):
+    def fail():
+        raise RuntimeError
+
+    async def run():
+        # Breaks on its first task, like a process pool whose worker was killed
+        broken = ThreadPoolExecutor(1, initializer=fail)
+        with ThreadPoolExecutor(1) as executor:
+            server = DocsServer(project, executor=broken, new_executor=lambda: executor)
+            with pytest.raises(BrokenExecutor):
+                await server.page("generators_api")
+            assert server.executor is executor
+            return await server.page("generators_api")
+
+    assert asyncio.run(run()) == (TEST_FILES / "expected_generators_api.md").read_text()
+
+
+def test_serial_executor_renders_off_the_event_loop(project, monkeypatch):
+    threads = []
+    render_markdown = serve.render_markdown
+
+    def recording_render_markdown(*args):
+        threads.append(threading.get_ident())
+        return render_markdown(*args)
+
+    monkeypatch.setattr(serve, "render_markdown", recording_render_markdown)
+
+    async def run():
+        server = DocsServer(project, executor=SerialExecutor())
+        assert await server.page("generators_api") == (TEST_FILES / "expected_generators_api.md").read_text()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+    assert len(threads) == 1
+    assert threads[0] != loop_thread
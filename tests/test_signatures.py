@@ -0,0 +1,58 @@
+import pytest
+
+from haystack_pydoc_tools import signatures
+from haystack_pydoc_tools.signatures import _format_signature_black, format_signature
+
+SIGNATURES = [
+    ("run", "(self, messages: list[ChatMessage]) -> dict[str, list[ChatMessage]]"),
+    ("run", "(self, a: int, b: str = 'x', *args, c: float = 0.5, **kwargs) -> None"),
+    ("run", "(self, a: int, b: str = 'x', /, c: float = 0.5) -> None"),
+    ("run", "(self, *, streaming_callback: StreamingCallbackT | None = None, tools: ToolsType | None = None)"),
+    ("from_dict", "(cls, data: dict[str, Any]) -> 'OpenAIChatGenerator'"),
+    ("__init__", "(self, api_key: Secret = Secret.from_env_var('OPENAI_API_KEY'), timeout = 30)"),
+    ("ByteStream.from_string", "(text: str, encoding: str = 'utf-8', mime_type: str | None = None)"),
+    ("a_very_long_function_name_that_barely_fits", "(first_argument: dict[str, Any] | None = None) -> None"),
+    ("a_very_long_function_name_that_barely_fits", "(first_argument: tuple[int, ...] = (1, 2)) -> None"),
+]
+
+
+@pytest.fixture
+def no_black(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("black should not be called")
+
+    monkeypatch.setattr(signatures, "do_format_code", fail)
+    format_signature.cache_clear()
+    yield
+    format_signature.cache_clear()
+
+
+@pytest.mark.parametrize("line_length", [40, 60, 80, 100])
+@pytest.mark.parametrize(("name", "signature"), SIGNATURES)
+def test_matches_black(name, signature, line_length):
+    expected = (
+        name + signature
+        if len(name + signature) < line_length
+        else _format_signature_black(name, signature, line_length)
+    )
+    assert format_signature(name, signature, line_length) == expected
+
+
+@pytest.mark.parametrize(("name", "signature"), SIGNATURES)
+def test_common_signatures_skip_black(no_black, name, signature):
+    format_signature(name, signature, 80)
+
+
+def test_unsupported_constructs_fall_back_to_black(monkeypatch):
+    calls = []
+    monkeypatch.setattr(signatures, "do_format_code", lambda code, line_length: calls.append(code) or code)
+    format_signature.cache_clear()
+    format_signature("run", "(self, size: int = 2 ** 10, mask: int = 0xFF, callback = lambda x: x) -> None", 40)
+    format_signature.cache_clear()
+    assert len(calls) == 1
+
+
+def test_memoized(no_black):
+    format_signature("run", SIGNATURES[0][1], 40)
+    format_signature("run", SIGNATURES[0][1], 40)
+    assert format_signature.cache_info().hits == 1
@@ -0,0 +1,21 @@
+import os
+
+from haystack_pydoc_tools.utils import write_text_if_changed
+
+
+def test_write_text_if_changed(tmp_path):
+    path = tmp_path / "out.md"
+    assert write_text_if_changed(path, "content")
+    os.utime(path, ns=(0, 0))
+
+    assert not write_text_if_changed(path, "content")
+    assert path.stat().st_mtime_ns == 0
+
+    # Same size, different content
+    assert write_text_if_changed(path, "CONTENT")
+    assert path.read_text() == "CONTENT"
+    assert path.stat().st_mtime_ns != 0
+
+    assert write_text_if_changed(path, "longer content")
+    assert path.read_text() == "longer content"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.md"]
@@ -0,0 +1,98 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from haystack_pydoc_tools.watch import Watcher
+
+
+@pytest.fixture
+def project(project):
+    # Watched configs in their own directory, next to the components and the output directory
+    configs = project / "configs"
+    configs.mkdir()
+    (project / "out").mkdir()
+    for name in ["generators_api.yml", "azure_api.yml"]:
+        modules = "[chat/azure, chat/openai]" if name == "generators_api.yml" else "[chat/azure]"
+        (configs / name).write_text(f"""
+loaders:
+  - search_path: [../components/generators]
+    modules: {modules}
+renderer:
+  title: {name}
+  id: {name[:-4]}
+  description: API.
+  filename: {name[:-4]}.md
+""")
+    return project
+
+
+def touch(path: Path, text: str) -> None:
+    path.write_text(path.read_text() + text)
+    # Make sure the change is visible even on filesystems with coarse mtimes
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def statuses(results):
+    return {Path(result.config).name: result.status for result in results}
+
+
+def test_first_poll_builds_everything(project, parse_calls):
+    watcher = Watcher(project / "configs", str(project / "out"))
+    assert statuses(watcher.poll()) == {"azure_api.yml": "ok", "generators_api.yml": "ok"}
+    assert sorted(parse_calls) == ["chat/azure", "chat/openai"]
+    assert watcher.poll() == []
+
+
+def test_source_change_rebuilds_affected_configs_only(project, parse_calls):
+    watcher = Watcher(project / "configs", str(project / "out"))
+    watcher.poll()
+    parse_calls.clear()
+
+    touch(project / "components" / "generators" / "chat" / "openai.py", '\n\ndef added_function():\n    """Added."""\n')
+    assert statuses(watcher.poll()) == {"generators_api.yml": "ok"}
+    assert parse_calls == ["chat/openai"]
+    assert "added_function" in (project / "out" / "generators_api.md").read_text()
+
+
+def test_config_change_rebuilds_config(project, parse_calls):
+    watcher = Watcher(project / "configs", str(project / "out"))
+    watcher.poll()
+    parse_calls.clear()
+
+    config = project / "configs" / "azure_api.yml"
+    config.write_text(config.read_text().replace("title: azure_api.yml", "title: Azure"))
+    touch(config, "")
+    assert statuses(watcher.poll()) == {"azure_api.yml": "ok"}
+    assert parse_calls == []
+    assert 'title: "Azure"' in (project / "out" / "azure_api.md").read_text()
+
+
+def test_broken_source_fails_until_fixed(project):
+    watcher = Watcher(project / "configs", str(project / "out"))
+    watcher.poll()
+
+    source = project / "components" / "generators" / "chat" / "azure.py"
+    original = source.read_text()
+    touch(source, "\ndef broken(:\n")
+    assert statuses(watcher.poll()) == {"azure_api.yml": "failed", "generators_api.yml": "failed"}
+    assert watcher.poll() == []
+
+    source.write_text(original)
+    touch(source, "")
+    assert statuses(watcher.poll()) == {"azure_api.yml": "ok", "generators_api.yml": "ok"}
+
+
+def test_module_added_to_pattern_rebuilds_config(project, parse_calls):
+    config = project / "configs" / "generators_api.yml"
+    config.write_text(config.read_text().replace("[chat/azure, chat/openai]", "[chat/*]"))
+    watcher = Watcher(project / "configs", str(project / "out"))
+    watcher.poll()
+    parse_calls.clear()
+
+    added = project / "components" / "generators" / "chat" / "added.py"
+    added.write_text('"""Added module."""\n\n\ndef added_function():\n    """Added."""\n')
+    assert statuses(watcher.poll()) == {"generators_api.yml": "ok"}
+    assert parse_calls == ["chat/added"]
+    assert "added_function" in (project / "out" / "generators_api.md").read_text()
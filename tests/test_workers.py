@@ -0,0 +1,40 @@
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from haystack_pydoc_tools import profiling
+from haystack_pydoc_tools.renderers import _env
+from haystack_pydoc_tools.workers import create_executor, init_worker, mp_context
+
+
+def _loaded(names: list[str]) -> list[str]:
+    return [name for name in names if name in sys.modules]
+
+
+def test_workers_start_warm():
+    names = ["black", "griffe", "griffe2md", "jinja2"]
+    with ProcessPoolExecutor(max_workers=1, mp_context=mp_context(), initializer=init_worker) as pool:
+        assert pool.submit(_loaded, names).result() == names
+
+
+def test_init_worker_compiles_templates():
+    init_worker()
+    env = _env("black")
+    assert env.cache
+    assert len(env.cache) == len(env.list_templates(extensions=["jinja"]))
+
+
+def test_init_worker_enables_profiling(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "_directory", None)
+    monkeypatch.setattr(profiling, "_profiler", None)
+    init_worker(str(tmp_path), cprofile=True)
+    assert profiling._directory == tmp_path
+    assert profiling._profiler is not None
+
+
+def test_max_tasks_per_child_warns_before_python_3_11(monkeypatch):
+    monkeypatch.setattr(sys, "version_info", (3, 10, 13))
+    with pytest.warns(UserWarning, match="max_tasks_per_child requires Python 3.11"):
+        executor = create_executor(1, max_tasks_per_child=2)
+    executor.shutdown()